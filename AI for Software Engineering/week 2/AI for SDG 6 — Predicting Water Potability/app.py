@@ -1,43 +1,46 @@
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify
 import numpy as np
 import pandas as pd  # <-- use DataFrame for model input
-import joblib
-import re
+import os
+
+import features
+from microbatch import MicroBatcher
+from model_store import ModelStore, ModelNotReady
+from prediction_cache import PredictionCache, parse_quantization
+from schema import NUMERIC_FEATURES, CATEGORICAL_FEATURES, SPECS, validate_frame, validate_record
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
+app.config["MAX_CONTENT_LENGTH"] = 64 * 1024 * 1024  # batch uploads (~100k+ CSV rows)
 
 MODEL_PATH = "models/pm25_model.pkl"
-model = joblib.load(MODEL_PATH)
-
-# Must match the names used in train_model.py's ColumnTransformer
-NUMERIC_FEATURES = [
-    "TEMP",      # °C
-    "DEWP",      # °C
-    "PRES",      # hPa
-    "Iws",       # wind speed index
-    "Is",        # snow indicator
-    "Ir",        # rain indicator
-    "hour",      # 0-23
-    "month"      # 1-12
-]
-CATEGORICAL_FEATURES = ["cbwd"]  # wind direction bucket
-
-def parse_number(text: str):
-    if text is None:
-        raise ValueError("empty")
-    s = text.strip()
-    if s == "":
-        raise ValueError("empty")
-    s = s.replace("−", "-")           # unicode minus → ascii
-    if "," in s and "." not in s:     # decimal comma → dot
-        s = s.replace(",", ".")
-    # keep digits, dot, sign, exponent
-    if not re.fullmatch(r"[+-]?\d*([.]\d+)?([eE][+-]?\d+)?", s):
-        cleaned = re.sub(r"[^0-9eE+.\-]", "", s)
-        if cleaned == "" or not re.fullmatch(r"[+-]?\d*([.]\d+)?([eE][+-]?\d+)?", cleaned):
-            raise ValueError(f"not a number: {text!r}")
-        s = cleaned
-    return float(s)
+COMPILED_PATH = "models/pm25_compiled"
+METADATA_PATH = "models/pm25_model.json"
+
+# Whichever engine train_model.py registered (rf/hgb/linear, see pm25_model.json)
+# is loaded in the background (GET /healthz answers immediately) and
+# hot-reloaded when the files under models/ change; PM25_RELOAD_INTERVAL=0
+# disables polling.
+store = ModelStore(
+    MODEL_PATH,
+    COMPILED_PATH,
+    metadata_path=METADATA_PATH,
+    reload_interval_s=float(os.environ.get("PM25_RELOAD_INTERVAL", "5")),
+)
+
+# Batch endpoint limits
+MAX_BATCH_ROWS = 200_000
+MAX_REPORTED_ERRORS = 50
+
+# Upper bounds (µg/m³) of each AQI category, in order
+PM25_BREAKPOINTS = [12, 35.4, 55.4, 150.4, 250.4]
+PM25_CATEGORIES = np.array([
+    "Good 😊",
+    "Moderate 😐",
+    "Unhealthy for Sensitive Groups 😷",
+    "Unhealthy 🚫",
+    "Very Unhealthy 🛑",
+    "Hazardous ☠️",
+], dtype=object)
 
 def pm25_to_category(pm25):
     x = pm25
@@ -48,6 +51,147 @@ def pm25_to_category(pm25):
     if x <= 250.4: return "Very Unhealthy 🛑"
     return "Hazardous ☠️"
 
+def pm25_to_categories(pm25):
+    """Vectorized pm25_to_category for an array of predictions."""
+    idx = np.searchsorted(PM25_BREAKPOINTS, np.asarray(pm25, dtype=float), side="left")
+    return PM25_CATEGORIES[idx]
+
+# --- Batch input helpers ---
+def model_numeric(m):
+    """Numeric input columns of a loaded model (time-feature models add lag/rolling columns)."""
+    return m.metadata.get("numeric_features", NUMERIC_FEATURES)
+
+def read_batch_payload(req, numeric=NUMERIC_FEATURES) -> pd.DataFrame:
+    """
+    Accepts either:
+    - a CSV upload (multipart field "file"), or
+    - a JSON array of row objects: [{"TEMP": 1.0, ..., "cbwd": "NW"}, ...], or
+    - a JSON object of columns:   {"TEMP": [...], ..., "cbwd": [...]}
+    Only the model columns are kept; everything else is dropped at read time.
+    Time-feature models expect their lag/rolling columns in every row (see
+    features.add_time_features).
+    """
+    cols = list(numeric) + CATEGORICAL_FEATURES
+    upload = req.files.get("file")
+    if upload is not None:
+        try:
+            df = pd.read_csv(
+                upload.stream,
+                usecols=lambda c: c in cols,
+                dtype={"cbwd": "string"},
+                nrows=MAX_BATCH_ROWS + 1,
+            )
+        except Exception as e:
+            raise ValueError(f"Could not read CSV: {e}")
+    else:
+        payload = req.get_json(silent=True)
+        if isinstance(payload, list):
+            if len(payload) > MAX_BATCH_ROWS:
+                raise ValueError(f"Too many rows (max {MAX_BATCH_ROWS:,}).")
+            if not all(isinstance(r, dict) for r in payload):
+                raise ValueError("JSON array items must be objects.")
+            df = pd.DataFrame.from_records(payload, columns=cols)
+        elif isinstance(payload, dict):
+            try:
+                df = pd.DataFrame({c: payload[c] for c in cols if c in payload})
+            except ValueError as e:
+                raise ValueError(f"Bad column payload: {e}")
+        else:
+            raise ValueError("Send a JSON array/object or a CSV file in the 'file' field.")
+        del payload
+
+    if len(df) == 0:
+        raise ValueError("No rows to score.")
+    if len(df) > MAX_BATCH_ROWS:
+        raise ValueError(f"Too many rows (max {MAX_BATCH_ROWS:,}).")
+    return df.reset_index(drop=True)
+
+def score_rows(rows):
+    """Score a list of (values, cbwd) pairs with one vectorized predict."""
+    m = store.get()
+    if m.compiled is not None:
+        numeric = np.array([[v[k] for k in m.compiled.num_features] for v, _ in rows], dtype=float)
+        return m.compiled.predict(numeric, [c for _, c in rows])
+    cols = model_numeric(m) + CATEGORICAL_FEATURES
+    df_in = pd.DataFrame([{**v, "cbwd": c} for v, c in rows], columns=cols)
+    return m.pipeline.predict(df_in)
+
+def score_frame(X: pd.DataFrame):
+    m = store.get()
+    if m.compiled is not None:
+        return m.compiled.predict_frame(X)
+    return m.pipeline.predict(X)
+
+# Optional request coalescing (PM25_MICROBATCH=1): concurrent /predict calls
+# are queued for up to PM25_BATCH_WAIT_MS or PM25_BATCH_MAX_ROWS rows and
+# scored together.
+batcher = None
+if os.environ.get("PM25_MICROBATCH", "0") == "1":
+    batcher = MicroBatcher(
+        score_rows,
+        max_wait_ms=float(os.environ.get("PM25_BATCH_WAIT_MS", "5")),
+        max_batch_rows=int(os.environ.get("PM25_BATCH_MAX_ROWS", "64")),
+    )
+
+# Prediction cache (PM25_CACHE_SIZE=0 disables). Keys are the parsed values
+# snapped to PM25_CACHE_QUANT steps, e.g. "TEMP=0.1,PRES=0.5".
+cache = None
+if int(os.environ.get("PM25_CACHE_SIZE", "4096")) > 0:
+    cache = PredictionCache(
+        NUMERIC_FEATURES,
+        maxsize=int(os.environ.get("PM25_CACHE_SIZE", "4096")),
+        ttl_s=float(os.environ.get("PM25_CACHE_TTL", "3600")),
+        quantization=parse_quantization(os.environ.get("PM25_CACHE_QUANT", "")),
+    )
+    # Cached predictions belong to the model generation that produced them
+    store.on_swap.append(lambda _: cache.clear())
+
+# Hourly history for time-feature models (train_model.py --time-features):
+# POST /observe feeds readings in time order, /predict reads lag/rolling
+# features from it in O(1). Rebuilt when a model with other lags/windows loads.
+# The history is per process: behind several workers, each would see only the
+# readings it was sent, so serve time-feature models with a single process.
+history = {"config": None, "state": features.RollingState()}
+
+def time_config(m):
+    return m.metadata.get("time_features")
+
+def time_state(config):
+    if config is not None and history["config"] != config:
+        history["state"] = features.RollingState(config["lags"], config["windows"], config["columns"])
+        history["config"] = config
+    return history["state"]
+
+store.on_swap.append(lambda m: time_state(time_config(m)))
+
+store.start()
+
+def predict_one(values, cbwd) -> float:
+    m = store.get()
+    config = time_config(m)
+    if config is not None:
+        # The cache key only covers the current inputs, not the history, so bypass it
+        return _score_one({**values, **time_state(config).features(values)}, cbwd)
+    if cache is not None:
+        return cache.get_or_compute(values, cbwd, _score_one)
+    return _score_one(values, cbwd)
+
+def _score_one(values, cbwd) -> float:
+    if batcher is not None:
+        return batcher.submit(values, cbwd)
+
+    m = store.get()
+    if m.compiled is not None:
+        # Fast path: raw float vector straight into the flattened forest
+        return m.compiled.predict_one([values[k] for k in m.compiled.num_features], cbwd)
+
+    # >>> Build a ONE-ROW DataFrame with the exact training column names <<<
+    numeric = model_numeric(m)
+    cols = numeric + CATEGORICAL_FEATURES
+    row_dict = {**{k: values[k] for k in numeric}, "cbwd": cbwd}
+    df_in = pd.DataFrame([row_dict], columns=cols)
+    return float(m.pipeline.predict(df_in)[0])
+
 @app.route("/", methods=["GET"])
 def index():
     return render_template("index.html")
@@ -55,40 +199,17 @@ def index():
 @app.route("/predict", methods=["POST"])
 def predict():
     try:
-        # Parse numeric fields
-        values = {}
-        for f in NUMERIC_FEATURES:
-            raw = request.form.get(f, None)
-            if raw is None:
-                return render_template("index.html", error=f"Missing field: {f}")
-            try:
-                val = parse_number(raw)
-            except ValueError as ve:
-                return render_template("index.html", error=f"Invalid number for '{f}': {ve}")
-            values[f] = val
-
-        # Range checks
-        hour = int(round(values["hour"]))
-        month = int(round(values["month"]))
-        if not (0 <= hour <= 23):
-            return render_template("index.html", error="Hour must be between 0 and 23.")
-        if not (1 <= month <= 12):
-            return render_template("index.html", error="Month must be between 1 and 12.")
-        values["hour"] = hour
-        values["month"] = month
-
-        # Categorical
-        cbwd = request.form.get("cbwd", "").strip()
-        if cbwd == "":
-            return render_template("index.html", error="Please select a wind direction (cbwd).")
-
-        # >>> Build a ONE-ROW DataFrame with the exact training column names <<<
-        cols = NUMERIC_FEATURES + CATEGORICAL_FEATURES
-        row_dict = {**{k: values[k] for k in NUMERIC_FEATURES}, "cbwd": cbwd}
-        df_in = pd.DataFrame([row_dict], columns=cols)
+        # Parse + range-check every field in one pass (see schema.py)
+        values, categories, errors = validate_record(request.form)
+        if errors:
+            return render_template("index.html", error=errors[0].error)
+        cbwd = categories["cbwd"]
 
         # Predict
-        y_hat = float(model.predict(df_in)[0])
+        try:
+            y_hat = predict_one(values, cbwd)
+        except (ModelNotReady, ValueError) as e:
+            return render_template("index.html", error=str(e))
         category = pm25_to_category(y_hat)
 
         tips = []
@@ -100,17 +221,7 @@ def predict():
         else:
             tips.append("Air quality looks relatively good. Maintain greener travel choices.")
 
-        pretty_inputs = {
-            "TEMP (°C)": values["TEMP"],
-            "DEWP (°C)": values["DEWP"],
-            "PRES (hPa)": values["PRES"],
-            "Iws (wind index)": values["Iws"],
-            "Is (snow)": values["Is"],
-            "Ir (rain)": values["Ir"],
-            "Hour": values["hour"],
-            "Month": values["month"],
-            "Wind Dir (cbwd)": cbwd
-        }
+        pretty_inputs = {SPECS[k].display: v for k, v in {**values, **categories}.items()}
 
         return render_template(
             "result.html",
@@ -123,5 +234,83 @@ def predict():
     except Exception as e:
         return render_template("index.html", error=f"Unexpected error: {e}")
 
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    try:
+        m = store.get()
+    except ModelNotReady as e:
+        return jsonify(error=str(e)), 503
+    try:
+        df_in = read_batch_payload(request, model_numeric(m))
+    except ValueError as ve:
+        return jsonify(error=str(ve)), 400
+
+    X, errors, error_count = validate_frame(df_in, model_numeric(m), max_reported=MAX_REPORTED_ERRORS)
+    del df_in
+    if error_count:
+        errors.sort(key=lambda e: -1 if e.row is None else e.row)
+        return jsonify(
+            error="Validation failed",
+            error_count=error_count,
+            errors=[e._asdict() for e in errors[:MAX_REPORTED_ERRORS]],
+        ), 400
+
+    # One vectorized predict for the whole batch
+    try:
+        y_hat = score_frame(X)
+    except ModelNotReady as e:
+        return jsonify(error=str(e)), 503
+    return jsonify(
+        count=int(len(y_hat)),
+        predictions=np.round(y_hat, 1).tolist(),
+        categories=pm25_to_categories(y_hat).tolist(),
+    )
+
+@app.route("/observe", methods=["POST"])
+def observe():
+    """
+    Feed hourly readings (one object or a list, oldest first) into the history:
+    {"year": 2014, "month": 12, "day": 31, "hour": 22,
+     "TEMP": -2, "DEWP": -20, "PRES": 1034, "Iws": 240, "Is": 0, "Ir": 0, "pm2.5": 12}
+    "time": "2014-12-31T22:00" may replace year/month/day/hour.
+    Each reading must be one hour after the previous one; after a gap, send
+    /observe?restart=1 to drop the old history first.
+    """
+    payload = request.get_json(silent=True)
+    readings = payload if isinstance(payload, list) else [payload]
+    state = history["state"]
+    if request.args.get("restart") == "1":
+        state.reset()
+    for i, r in enumerate(readings):
+        if not isinstance(r, dict):
+            return jsonify(error="Send a JSON object or an array of objects.", row=i), 400
+        try:
+            if "time" in r:
+                when = pd.Timestamp(r["time"])
+            else:
+                when = pd.Timestamp(year=int(r["year"]), month=int(r["month"]),
+                                    day=int(r["day"]), hour=int(r["hour"]))
+            reading = {c: float(r[c]) for c in state.columns}
+            if r.get(features.TARGET) is not None:
+                reading[features.TARGET] = float(r[features.TARGET])
+            state.observe(when, reading)
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify(error=f"Bad reading: {e}", row=i, history=state.snapshot()), 400
+    return jsonify(state.snapshot())
+
+@app.route("/healthz", methods=["GET"])
+def healthz():
+    health = store.health()
+    return jsonify(health), (200 if health["status"] == "ready" else 503)
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify(
+        model=store.health(),
+        microbatch=batcher.metrics() if batcher is not None else None,
+        cache=cache.stats() if cache is not None else None,
+        history=history["state"].snapshot(),
+    )
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,73 @@
+"""
+Dataset load benchmark: CSV + normalize_columns vs the .npy dataset cache.
+
+Reports wall time and frame memory (deep) for:
+- csv:        pd.read_csv + normalize_columns (the old path, default dtypes)
+- cache-cold: same, plus typing and writing the bundle
+- cache-warm: reading the bundle back
+
+Usage:
+    python bench_dataset_cache.py [--repeat 5] [--scale 1]
+    (--scale N concatenates the CSV N times into a temp file to mimic bigger datasets)
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from dataset_cache import cached_frame
+from train_model import DATA_PATH, normalize_columns
+
+
+def timed(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--scale", type=int, default=1)
+    args = ap.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="pm25-cache-bench-"))
+    try:
+        src = DATA_PATH
+        if args.scale > 1:
+            src = work / "scaled.csv"
+            lines = DATA_PATH.read_text().splitlines(keepends=True)
+            with open(src, "w") as f:
+                f.write(lines[0])
+                for _ in range(args.scale):
+                    f.writelines(lines[1:])
+        cache_dir = work / "cache"
+        build = lambda: normalize_columns(pd.read_csv(src))
+
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return cached_frame(src, build, cache_dir)
+
+        results = [
+            ("csv", *timed(build, args.repeat)),
+            ("cache-cold", *timed(cold, 1)),
+            ("cache-warm", *timed(lambda: cached_frame(src, build, cache_dir), args.repeat)),
+        ]
+        print(f"source: {src} ({src.stat().st_size / 1e6:.1f} MB)")
+        print(f"{'path':<12}{'rows':>10}{'seconds':>10}{'frame MB':>10}")
+        for name, secs, df in results:
+            mb = df.memory_usage(deep=True).sum() / 1e6
+            print(f"{name:<12}{len(df):>10,}{secs:>10.3f}{mb:>10.1f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Single-row inference benchmark: current pandas + Pipeline path vs compiled path.
+
+- Parity: compiled predictions must match pipe.predict on sampled dataset rows,
+  within --atol; the script exits non-zero otherwise.
+- Latency: p50/p99 per request for both paths (one row at a time, as /predict does).
+
+Usage:
+    python train_model.py          # writes models/pm25_model.pkl + models/pm25_compiled/
+    python bench_inference.py [--rows 500]
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compiled_model import CompiledForest, check_parity
+from train_model import DATA_PATH, MODEL_PATH, COMPILED_PATH, NUMERIC_FEATURES, CATEGORICAL_FEATURES, normalize_columns
+
+
+def percentiles(samples_s):
+    ms = np.asarray(samples_s) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 99)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500, help="rows to time per path")
+    ap.add_argument("--atol", type=float, default=1e-6, help="max |compiled - pipeline| allowed")
+    args = ap.parse_args()
+
+    pipe = joblib.load(MODEL_PATH)
+    compiled = CompiledForest.load(COMPILED_PATH)
+
+    cols = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+    df = normalize_columns(pd.read_csv(DATA_PATH)).dropna(subset=cols)
+    sample = df[cols].sample(n=min(args.rows, len(df)), random_state=0).reset_index(drop=True)
+
+    try:
+        diff = check_parity(compiled, pipe, sample, atol=args.atol)
+    except AssertionError as e:
+        raise SystemExit(f"FAIL: {e}")
+    print(f"OK: parity on {len(sample)} rows, max |compiled - pipeline| = {diff:.3g}")
+
+    records = sample.to_dict("records")
+
+    pipeline_t = []
+    for row in records:
+        t0 = time.perf_counter()
+        pipe.predict(pd.DataFrame([row], columns=cols))
+        pipeline_t.append(time.perf_counter() - t0)
+
+    compiled_t = []
+    for row in records:
+        t0 = time.perf_counter()
+        compiled.predict_one([row[f] for f in NUMERIC_FEATURES], row["cbwd"])
+        compiled_t.append(time.perf_counter() - t0)
+
+    p50_a, p99_a = percentiles(pipeline_t)
+    p50_b, p99_b = percentiles(compiled_t)
+    print(f"{'path':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    print(f"{'DataFrame + Pipeline':<22}{p50_a:>10.2f}{p99_a:>10.2f}")
+    print(f"{'compiled':<22}{p50_b:>10.2f}{p99_b:>10.2f}")
+    print(f"Speed-up at p50: {p50_a / p50_b:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Startup time and per-worker memory: pickled pipeline vs memory-mapped compiled model.
+
+For each format a parent process loads the model, then forks N workers that
+each score the same rows (like pre-forked web workers). Reported per format:
+- load time in the parent
+- worker RSS, USS (private pages) and PSS (proportional share of shared pages),
+  read from /proc/self/smaps_rollup, so Linux only
+
+Usage:
+    python bench_startup.py [--workers 4] [--rows 200]
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pandas as pd
+
+from train_model import DATA_PATH, MODEL_PATH, COMPILED_PATH, NUMERIC_FEATURES, CATEGORICAL_FEATURES, normalize_columns
+
+COLS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+def memory_mb() -> dict:
+    out = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                out[key] = int(rest.split()[0]) / 1024
+    return {"rss": out["Rss"], "pss": out["Pss"], "uss": out["Private_Clean"] + out["Private_Dirty"]}
+
+
+def load(fmt):
+    if fmt == "pickle":
+        import joblib
+        pipe = joblib.load(MODEL_PATH)
+        return lambda df: pipe.predict(df)
+    from compiled_model import CompiledForest
+    compiled = CompiledForest.load(COMPILED_PATH, mmap_mode="r")
+    return compiled.predict_frame
+
+
+def worker(score, rows, conn):
+    score(rows)
+    conn.send(memory_mb())
+    conn.recv()  # hold the pages until every sibling has been measured
+    conn.close()
+
+
+def run(fmt, rows, n_workers, out):
+    t0 = time.perf_counter()
+    score = load(fmt)
+    load_s = time.perf_counter() - t0
+
+    ctx = mp.get_context("fork")
+    pipes, procs = [], []
+    for _ in range(n_workers):
+        parent, child = ctx.Pipe()
+        p = ctx.Process(target=worker, args=(score, rows, child))
+        p.start()
+        pipes.append(parent)
+        procs.append(p)
+    mems = [c.recv() for c in pipes]
+    for c in pipes:
+        c.send("done")
+    for p in procs:
+        p.join()
+    out.put((fmt, load_s, mems))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--rows", type=int, default=200)
+    args = ap.parse_args()
+
+    df = normalize_columns(pd.read_csv(DATA_PATH)).dropna(subset=COLS)
+    rows = df[COLS].sample(n=args.rows, random_state=0).reset_index(drop=True)
+
+    print(f"{'format':<16}{'load s':>8}{'RSS MB':>10}{'USS MB':>10}{'PSS MB':>10}   (per worker, mean of {args.workers})")
+    for fmt in ["pickle", "compiled-mmap"]:
+        # Fresh interpreter per format so one doesn't inherit the other's pages
+        ctx = mp.get_context("spawn")
+        q = ctx.Queue()
+        p = ctx.Process(target=run, args=(fmt, rows, args.workers, q))
+        p.start()
+        name, load_s, mems = q.get()
+        p.join()
+        mean = {k: np.mean([m[k] for m in mems]) for k in mems[0]}
+        print(f"{name:<16}{load_s:>8.2f}{mean['rss']:>10.0f}{mean['uss']:>10.0f}{mean['pss']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
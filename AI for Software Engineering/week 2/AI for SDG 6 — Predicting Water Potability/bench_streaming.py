@@ -0,0 +1,135 @@
+"""
+Peak-memory check for --stream ingestion on a synthetic large CSV.
+
+Writes a synthetic sensor file N times the size of the bundled PRSA CSV
+(default 50x, rows jittered so values are not exact repeats), then measures
+the peak RSS of ingestion in a fresh process for:
+- in-memory: read_csv -> normalize_columns -> dropna().copy() -> X/y (old main())
+- stream:    streaming_ingest.stream_xy
+and checks the stream path against the bound documented in streaming_ingest.py.
+Both paths must also give the same X and y: row count, per-column sums, the
+target sum and the category counts. Either check failing exits non-zero.
+
+Usage:
+    python bench_streaming.py [--scale 50] [--chunksize 200000] [--keep]
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from streaming_ingest import count_data_rows, stream_xy
+from train_model import DATA_PATH, NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET, normalize_columns
+
+# Terms of the bound documented in streaming_ingest.py
+CHUNK_BYTES_PER_ROW = 450
+FIXED_OVERHEAD_MB = 16
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def write_synthetic(path, scale, seed=0):
+    base = pd.read_csv(DATA_PATH)
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        for i in range(scale):
+            part = base.copy()
+            for c in ["TEMP", "DEWP", "PRES", "Iws"]:
+                part[c] = part[c] + rng.normal(0, 0.5, len(part)).round(2)
+            part["year"] = part["year"] + 5 * i
+            part.to_csv(f, index=False, header=(i == 0))
+
+
+def summary(X, y) -> dict:
+    """Order-independent fingerprint of (X, y), small enough to send back from a child."""
+    return {
+        "rows": len(X),
+        "sums": X[NUMERIC_FEATURES].sum().to_numpy(dtype=np.float64),
+        "target": float(y.astype(np.float64).sum()),
+        "categories": {c: X[c].astype(str).value_counts().sort_index().to_dict() for c in CATEGORICAL_FEATURES},
+    }
+
+
+def same_xy(a, b) -> list:
+    problems = []
+    if a["rows"] != b["rows"]:
+        problems.append(f"rows {a['rows']:,} vs {b['rows']:,}")
+    if not np.allclose(a["sums"], b["sums"], rtol=1e-9):
+        problems.append(f"feature sums {a['sums']} vs {b['sums']}")
+    if not np.isclose(a["target"], b["target"], rtol=1e-6):   # y is float32 on the stream path
+        problems.append(f"target sum {a['target']} vs {b['target']}")
+    if a["categories"] != b["categories"]:
+        problems.append("category counts differ")
+    return problems
+
+
+def ingest(mode, path, chunksize, out):
+    base = peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode == "stream":
+        X, y = stream_xy(path, normalize_columns, NUMERIC_FEATURES, CATEGORICAL_FEATURES,
+                         TARGET, chunksize=chunksize)
+    else:
+        df = normalize_columns(pd.read_csv(path))
+        df = df.dropna(subset=NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET]).copy()
+        X = df[NUMERIC_FEATURES + CATEGORICAL_FEATURES]
+        y = df[TARGET]
+    secs, peak = time.perf_counter() - t0, peak_rss_mb()
+    out.put((mode, len(X), secs, base, peak, summary(X, y)))   # fingerprint after the peak is read
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scale", type=int, default=50)
+    ap.add_argument("--chunksize", type=int, default=200_000)
+    ap.add_argument("--keep", action="store_true", help="keep the synthetic CSV")
+    args = ap.parse_args()
+
+    path = Path(tempfile.gettempdir()) / f"prsa_synthetic_x{args.scale}.csv"
+    if not path.exists():
+        print(f"Writing {path} ...")
+        write_synthetic(path, args.scale)
+    print(f"Synthetic file: {path.stat().st_size / 1e6:.0f} MB")
+
+    ctx = mp.get_context("spawn")
+    results = {}
+    for mode in ["in-memory", "stream"]:
+        q = ctx.Queue()
+        p = ctx.Process(target=ingest, args=(mode, path, args.chunksize, q))
+        p.start()
+        results[mode] = q.get()
+        p.join()
+
+    print(f"{'mode':<11}{'rows':>12}{'seconds':>9}{'peak RSS MB':>13}{'over baseline':>15}")
+    for mode, rows, secs, base, peak, _ in results.values():
+        print(f"{mode:<11}{rows:>12,}{secs:>9.1f}{peak:>13.0f}{peak - base:>15.0f}")
+
+    problems = same_xy(results["in-memory"][5], results["stream"][5])
+    if problems:
+        raise SystemExit("FAIL: stream and in-memory ingestion disagree: " + "; ".join(problems))
+    print("OK: stream and in-memory ingestion give the same X and y")
+
+    _, _, _, base, peak, _ = results["stream"]
+    lines = count_data_rows(path)
+    per_line = 8 * len(NUMERIC_FEATURES) + len(CATEGORICAL_FEATURES) + 4
+    bound_mb = (lines * per_line + args.chunksize * CHUNK_BYTES_PER_ROW) / 2**20 + FIXED_OVERHEAD_MB
+    print(f"Documented stream bound: {bound_mb:.0f} MB over baseline "
+          f"({per_line} B/line + {CHUNK_BYTES_PER_ROW} B x chunksize + {FIXED_OVERHEAD_MB} MB)")
+    if peak - base > bound_mb:
+        raise SystemExit("FAIL: streaming ingestion exceeded its documented bound")
+    print("OK: streaming ingestion stayed within its bound")
+
+    if not args.keep:
+        path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Engine comparison report for every model in model_registry.REGISTRY.
+
+Each engine is trained on the same stratified split of the PRSA data, then
+measured for:
+- accuracy on the test split (MAE, RMSE, R²)
+- training time
+- single-row latency (one-row DataFrame -> pipe.predict, as /predict does; plus
+  the compiled path for engines that support it)
+- batch latency (one predict over --batch-rows rows)
+- artifact size (joblib pickle, and compiled arrays where applicable)
+
+Usage:
+    python compare_engines.py [--engines rf hgb linear] [--rows 200] [--batch-rows 10000]
+Writes models/engine_comparison.md.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import model_registry
+from compiled_model import export_compiled
+from train_model import (MODEL_DIR, NUMERIC_FEATURES, CATEGORICAL_FEATURES, evaluate,
+                         fetch_or_load_full_dataset, split_train_test)
+
+REPORT_PATH = MODEL_DIR / "engine_comparison.md"
+COLS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+def dir_size(path) -> int:
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def p50_ms(fn, items):
+    lat = []
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        lat.append(time.perf_counter() - t0)
+    return 1000 * float(np.median(lat))
+
+
+def measure(engine, X_train, y_train, X_test, y_test, rows, batch_rows, workdir):
+    pipe = model_registry.build(engine, NUMERIC_FEATURES, CATEGORICAL_FEATURES)
+    t0 = time.perf_counter()
+    pipe.fit(X_train, y_train)
+    fit_s = time.perf_counter() - t0
+    metrics = evaluate(pipe, X_test, y_test)
+
+    # Serving-style inputs: plain Python values, as parsed from the form
+    records = X_test[COLS].head(rows).astype({"cbwd": object}).to_dict("records")
+    single_ms = p50_ms(lambda r: pipe.predict(pd.DataFrame([r], columns=COLS)), records)
+
+    batch = X_test[COLS].sample(n=batch_rows, replace=len(X_test) < batch_rows, random_state=0)
+    t0 = time.perf_counter()
+    pipe.predict(batch)
+    batch_ms = 1000 * (time.perf_counter() - t0)
+
+    pkl = workdir / f"{engine}.pkl"
+    joblib.dump(pipe, pkl)
+    row = {
+        "engine": engine,
+        **metrics,
+        "fit_s": fit_s,
+        "single_row_p50_ms": single_ms,
+        "compiled_row_p50_ms": None,
+        f"batch_{batch_rows}_ms": batch_ms,
+        "pickle_mb": pkl.stat().st_size / 1e6,
+        "compiled_mb": None,
+    }
+
+    if model_registry.is_compilable(engine):
+        compiled = export_compiled(pipe)
+        compiled.save(workdir / f"{engine}_compiled")
+        row["compiled_row_p50_ms"] = p50_ms(
+            lambda r: compiled.predict_one([r[f] for f in NUMERIC_FEATURES], r["cbwd"]), records)
+        row["compiled_mb"] = dir_size(workdir / f"{engine}_compiled") / 1e6
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--engines", nargs="+", default=sorted(model_registry.REGISTRY),
+                    choices=sorted(model_registry.REGISTRY))
+    ap.add_argument("--rows", type=int, default=200, help="single-row predictions timed per engine")
+    ap.add_argument("--batch-rows", type=int, default=10_000)
+    args = ap.parse_args()
+
+    df = fetch_or_load_full_dataset()
+    df = df.dropna(subset=COLS + ["pm2.5"])
+    X, y = df[COLS], df["pm2.5"].astype(float)
+    X_train, X_test, y_train, y_test = split_train_test(X, y)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in args.engines:
+            print(f"Training {engine} ...")
+            rows.append(measure(engine, X_train, y_train, X_test, y_test,
+                                args.rows, args.batch_rows, Path(tmp)))
+
+    table = pd.DataFrame(rows).set_index("engine")
+    text = table.to_markdown(floatfmt=".3g") if _has_tabulate() else table.to_string(float_format=lambda v: f"{v:.3g}")
+    REPORT_PATH.write_text(
+        "# PM2.5 engine comparison\n\n"
+        f"PRSA dataset, {len(X_train):,} train / {len(X_test):,} test rows. "
+        "Latencies are p50 per request; batch is one predict call.\n\n"
+        f"{text}\n"
+    )
+    print(text)
+    print(f"Saved report to {REPORT_PATH}")
+
+
+def _has_tabulate():
+    try:
+        import tabulate  # noqa: F401  (optional, used by DataFrame.to_markdown)
+        return True
+    except ImportError:
+        return False
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Compiled (pandas-free) inference for the PM2.5 model.
+
+export_compiled() flattens the fitted Pipeline built by train_model.py
+( ColumnTransformer[StandardScaler, OneHotEncoder] -> RandomForestRegressor )
+into plain NumPy arrays:
+- StandardScaler mean/scale constants for the numeric columns
+- a one-hot index for each cbwd category
+- every tree's nodes concatenated into contiguous arrays
+  (feature, threshold, left, right, value) plus each tree's root offset
+
+CompiledForest then scores a raw float vector directly: all trees are walked
+together, one vectorized NumPy step per tree level, with no DataFrame,
+ColumnTransformer or joblib dispatch on the hot path.
+
+Artifact layout (a directory, one .npy per array so it can be memory-mapped):
+    models/pm25_compiled/meta.json
+    models/pm25_compiled/{mean,scale,feature,threshold,left,right,value,roots}.npy
+"""
+
+from pathlib import Path
+import json
+import os
+import shutil
+
+import numpy as np
+
+ARRAYS = ["mean", "scale", "feature", "threshold", "left", "right", "value", "roots"]
+FORMAT_VERSION = 1
+
+# Rows per traversal block in predict(); bounds the (rows x trees) index matrix
+PREDICT_BLOCK_ROWS = 256
+
+
+def model_fingerprint(model_path) -> dict:
+    """Size + mtime of the pickled pipeline, used to detect a stale compiled artifact."""
+    st = os.stat(model_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _split_pipeline(pipe):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    pre, forest = pipe.steps[0][1], pipe.steps[-1][1]
+    if not isinstance(pre, ColumnTransformer) or not isinstance(forest, RandomForestRegressor):
+        raise ValueError("Only Pipeline(ColumnTransformer -> RandomForestRegressor) can be compiled.")
+
+    num = cat = None
+    offset = 0
+    for name, trans, cols in pre.transformers_:
+        if trans == "drop" or name == "remainder":
+            continue
+        if isinstance(trans, StandardScaler):
+            num = (list(cols), trans, offset)
+            offset += len(cols)
+        elif isinstance(trans, OneHotEncoder) and len(cols) == 1:
+            cat = (cols[0], trans, offset)
+            offset += len(trans.categories_[0])
+        else:
+            raise ValueError(f"Unsupported transformer for compilation: {name}={trans!r}")
+    if num is None or cat is None:
+        raise ValueError("Expected one StandardScaler block and one single-column OneHotEncoder block.")
+    if offset != forest.n_features_in_:
+        raise ValueError("Transformed width does not match the forest's input width.")
+    return num, cat, forest, offset
+
+
+class CompiledForest:
+    def __init__(self, meta: dict, arrays: dict):
+        self.meta = meta
+        self.num_features = meta["num_features"]
+        self.cat_feature = meta["cat_feature"]
+        self.categories = meta["categories"]
+        self.cat_index = {c: i for i, c in enumerate(self.categories)}
+        self.num_offset = meta["num_offset"]
+        self.cat_offset = meta["cat_offset"]
+        self.n_features_out = meta["n_features_out"]
+        self.max_depth = meta["max_depth"]
+        for k in ARRAYS:
+            setattr(self, k, arrays[k])
+        self.n_trees = len(self.roots)
+        self._n_num = len(self.num_features)
+
+    # --- Input transform (StandardScaler + OneHotEncoder equivalents) ---
+    def transform_row(self, numeric, cbwd) -> np.ndarray:
+        """numeric: floats in num_features order; cbwd: category string."""
+        x = np.zeros(self.n_features_out, dtype=np.float64)
+        x[self.num_offset:self.num_offset + self._n_num] = (
+            (np.asarray(numeric, dtype=np.float64) - self.mean) / self.scale
+        )
+        j = self.cat_index.get(cbwd)
+        if j is not None:  # unknown category -> all zeros (handle_unknown="ignore")
+            x[self.cat_offset + j] = 1.0
+        # sklearn trees compare float32 inputs against float64 thresholds
+        return x.astype(np.float32)
+
+    def transform(self, numeric: np.ndarray, cbwd) -> np.ndarray:
+        """Vectorized transform: numeric (n, n_num) array, cbwd sequence of strings."""
+        numeric = np.asarray(numeric, dtype=np.float64)
+        n = len(numeric)
+        X = np.zeros((n, self.n_features_out), dtype=np.float64)
+        X[:, self.num_offset:self.num_offset + self._n_num] = (numeric - self.mean) / self.scale
+        codes = np.fromiter((self.cat_index.get(c, -1) for c in cbwd), dtype=np.int64, count=n)
+        known = codes >= 0
+        X[np.flatnonzero(known), self.cat_offset + codes[known]] = 1.0
+        return X.astype(np.float32)
+
+    # --- Forest traversal ---
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """X: (rows, n_features_out) float32 -> leaf node ids (rows, n_trees)."""
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        rows = np.arange(len(X))[:, None]
+        feature, threshold, left, right = self.feature, self.threshold, self.left, self.right
+        # Leaves point to themselves, so max_depth steps always land every tree on a leaf
+        for _ in range(self.max_depth):
+            go_left = X[rows, feature[node]] <= threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return node
+
+    def predict_transformed(self, X: np.ndarray) -> np.ndarray:
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), PREDICT_BLOCK_ROWS):
+            block = X[start:start + PREDICT_BLOCK_ROWS]
+            out[start:start + len(block)] = self.value[self._leaves(block)].mean(axis=1)
+        return out
+
+    def predict_one(self, numeric, cbwd) -> float:
+        x = self.transform_row(numeric, cbwd)
+        node = self.roots.copy()
+        feature, threshold, left, right = self.feature, self.threshold, self.left, self.right
+        for _ in range(self.max_depth):
+            node = np.where(x[feature[node]] <= threshold[node], left[node], right[node])
+        return float(self.value[node].mean())
+
+    def predict(self, numeric: np.ndarray, cbwd) -> np.ndarray:
+        return self.predict_transformed(self.transform(numeric, cbwd))
+
+    def predict_frame(self, df) -> np.ndarray:
+        """Convenience wrapper taking the same DataFrame the pipeline takes."""
+        return self.predict(df[self.num_features].to_numpy(dtype=np.float64),
+                            df[self.cat_feature].tolist())
+
+    # --- Persistence ---
+    def save(self, path):
+        """Write to a sibling temp dir, then swap it in so readers never see a partial artifact."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        old = path.with_name(path.name + ".old")
+        for d in (tmp, old):
+            if d.exists():
+                shutil.rmtree(d)
+        tmp.mkdir(parents=True)
+        for k in ARRAYS:
+            np.save(tmp / f"{k}.npy", np.ascontiguousarray(getattr(self, k)))
+        (tmp / "meta.json").write_text(json.dumps(self.meta, indent=2))
+        if path.exists():
+            os.replace(path, old)  # processes that mmap'ed the old arrays keep valid mappings
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {meta.get('format_version')}")
+        arrays = {k: np.load(path / f"{k}.npy", mmap_mode=mmap_mode) for k in ARRAYS}
+        return cls(meta, arrays)
+
+
+def export_compiled(pipe, source_model_path=None) -> CompiledForest:
+    """Flatten a fitted pipeline into a CompiledForest."""
+    (num_cols, scaler, num_offset), (cat_col, ohe, cat_offset), forest, width = _split_pipeline(pipe)
+
+    trees = [est.tree_ for est in forest.estimators_]
+    sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    total = int(sizes.sum())
+    if total >= np.iinfo(np.int32).max:
+        raise ValueError("Forest too large for int32 node indices.")
+
+    feature = np.empty(total, dtype=np.int32)
+    threshold = np.empty(total, dtype=np.float64)
+    left = np.empty(total, dtype=np.int32)
+    right = np.empty(total, dtype=np.int32)
+    value = np.empty(total, dtype=np.float64)
+    for t, off in zip(trees, roots):
+        sl = slice(off, off + t.node_count)
+        ids = np.arange(off, off + t.node_count, dtype=np.int32)
+        is_leaf = t.children_left == -1
+        feature[sl] = np.where(is_leaf, 0, t.feature)
+        threshold[sl] = np.where(is_leaf, np.inf, t.threshold)
+        left[sl] = np.where(is_leaf, ids, t.children_left + off)
+        right[sl] = np.where(is_leaf, ids, t.children_right + off)
+        value[sl] = t.value[:, 0, 0]
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "num_features": num_cols,
+        "cat_feature": cat_col,
+        "categories": [str(c) for c in ohe.categories_[0]],
+        "num_offset": num_offset,
+        "cat_offset": cat_offset,
+        "n_features_out": width,
+        "max_depth": int(max(t.max_depth for t in trees)),
+        "n_trees": len(trees),
+        "n_nodes": total,
+        "source_model": model_fingerprint(source_model_path) if source_model_path else None,
+    }
+    arrays = {
+        "mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scale": np.asarray(scaler.scale_, dtype=np.float64),
+        "feature": feature, "threshold": threshold,
+        "left": left, "right": right, "value": value,
+        "roots": roots.astype(np.int32),
+    }
+    return CompiledForest(meta, arrays)
+
+
+def check_parity(compiled: CompiledForest, pipe, X, atol=1e-6) -> float:
+    """Max |compiled - pipe.predict| over the rows of DataFrame X; raises if above atol."""
+    expected = pipe.predict(X)
+    got = compiled.predict_frame(X)
+    diff = float(np.max(np.abs(expected - got))) if len(X) else 0.0
+    if diff > atol:
+        raise AssertionError(f"Compiled model disagrees with pipeline: max |diff| = {diff:.3g}")
+    return diff
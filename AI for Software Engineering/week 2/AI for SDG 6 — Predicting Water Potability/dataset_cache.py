@@ -0,0 +1,139 @@
+"""
+Local binary cache for the normalized training frame.
+
+Parsing the PRSA CSV and re-running normalize_columns on every training run
+is wasted work once the file is on disk. The first run writes the normalized,
+typed frame as an .npy bundle (one file per column, explicit dtypes); later
+runs reuse it as long as the source file's SHA-256 is unchanged.
+
+    data/cache/<sha256 prefix>/meta.json
+    data/cache/<sha256 prefix>/<column index>.npy
+
+Dtypes: float32 for the weather/target columns, small ints for calendar
+columns, and cbwd as a pandas category (int8 codes + category list in meta).
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+
+COLUMN_DTYPES = {
+    "No": "int32",
+    "year": "int16",
+    "month": "int8",
+    "day": "int8",
+    "hour": "int8",
+    "pm2.5": "float32",
+    "DEWP": "float32",
+    "TEMP": "float32",
+    "PRES": "float32",
+    "Iws": "float32",
+    "Is": "float32",
+    "Ir": "float32",
+    "cbwd": "category",
+}
+
+
+def file_sha256(path, block_size=1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast known columns. Integer columns holding NaNs stay float32."""
+    out = {}
+    for c in df.columns:
+        dtype = COLUMN_DTYPES.get(c)
+        col = df[c]
+        if dtype is None:
+            out[c] = col
+        elif dtype.startswith("int") and col.isna().any():
+            out[c] = col.astype("float32")
+        else:
+            out[c] = col.astype(dtype)
+    return pd.DataFrame(out, index=df.index)
+
+
+def write_bundle(df: pd.DataFrame, path, source_sha256: str):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for i, c in enumerate(df.columns):
+        col = df[c]
+        entry = {"name": c, "file": f"{i}.npy"}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes = col.cat.codes.to_numpy()
+            entry["dtype"] = "category"
+            entry["categories"] = [str(x) for x in col.cat.categories]
+            np.save(tmp / entry["file"], codes)
+        else:
+            arr = col.to_numpy()
+            if arr.dtype == object:
+                arr = arr.astype(str)
+            entry["dtype"] = str(arr.dtype)
+            np.save(tmp / entry["file"], arr)
+        columns.append(entry)
+
+    meta = {
+        "cache_version": CACHE_VERSION,
+        "source_sha256": source_sha256,
+        "rows": len(df),
+        "columns": columns,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+    if path.exists():
+        shutil.rmtree(path)
+    os.replace(tmp, path)
+
+
+def read_bundle(path) -> pd.DataFrame:
+    path = Path(path)
+    meta = json.loads((path / "meta.json").read_text())
+    data = {}
+    for entry in meta["columns"]:
+        arr = np.load(path / entry["file"], allow_pickle=False)
+        if entry["dtype"] == "category":
+            data[entry["name"]] = pd.Categorical.from_codes(arr, categories=entry["categories"])
+        else:
+            data[entry["name"]] = arr
+    return pd.DataFrame(data)
+
+
+def cached_frame(source_path, build, cache_dir, use_cache=True) -> pd.DataFrame:
+    """
+    Return build() (typed via apply_dtypes), cached under cache_dir keyed on
+    the SHA-256 of source_path. build() is only called on a cache miss.
+    """
+    if not use_cache:
+        return apply_dtypes(build())
+
+    digest = file_sha256(source_path)
+    bundle = Path(cache_dir) / digest[:16]
+    meta_path = bundle / "meta.json"
+    if meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta.get("cache_version") == CACHE_VERSION and meta.get("source_sha256") == digest:
+                print(f"Using cached dataset: {bundle}")
+                return read_bundle(bundle)
+        except Exception as e:
+            print(f"Ignoring unreadable dataset cache ({e}); rebuilding.")
+
+    df = apply_dtypes(build())
+    write_bundle(df, bundle, digest)
+    print(f"Cached normalized dataset to {bundle}")
+    return df
@@ -0,0 +1,187 @@
+"""
+Time-aware features for the hourly PRSA series.
+
+Training (vectorized, pandas):
+    add_time_features(df, cfg) puts the rows on a complete hourly
+    DatetimeIndex built from year/month/day/hour (gaps become NaN rather than
+    silently joining non-adjacent hours), then adds
+    - pm2.5 lags:            pm2.5_lag{k}      = pm2.5 at t-k hours
+    - weather rolling stats: {col}_mean{w}, {col}_max{w} over hours t-w+1..t
+    time_ordered_split() holds out the most recent rows instead of a random split,
+    so lag features cannot leak future values into training.
+
+Serving (incremental, O(1) per hourly reading):
+    RollingState keeps, per window, a running sum and a monotonic deque over the
+    last w-1 observed hours, plus the last max(lags) pm2.5 values. For a new
+    request at hour t, mean/max over t-w+1..t combine that state with the
+    current inputs in constant time; observe() then slides every window by one.
+    Readings must come one hour apart: a gap or a repeated hour is rejected
+    rather than letting every lag slide onto the wrong hour.
+    The state lives in the process that observes; it is not shared between
+    server workers, so serve time-feature models from a single process.
+"""
+
+from collections import deque
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_LAGS = (1, 2, 3, 24)
+DEFAULT_WINDOWS = (3, 6, 24)
+ROLLING_COLUMNS = ("TEMP", "DEWP", "PRES", "Iws", "Is", "Ir")
+TARGET = "pm2.5"
+
+
+def parse_int_list(text: str):
+    return tuple(sorted({int(p) for p in text.split(",") if p.strip()}))
+
+
+def time_feature_names(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, columns=ROLLING_COLUMNS):
+    names = [f"{TARGET}_lag{k}" for k in lags]
+    for w in windows:
+        for c in columns:
+            names += [f"{c}_mean{w}", f"{c}_max{w}"]
+    return names
+
+
+def timestamps(df: pd.DataFrame) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(
+        pd.DataFrame({"year": df["year"], "month": df["month"], "day": df["day"], "hour": df["hour"]})
+    ))
+
+
+# --- Training: vectorized ---
+def add_time_features(df: pd.DataFrame, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS,
+                      columns=ROLLING_COLUMNS) -> pd.DataFrame:
+    """Returns df sorted by time with the time feature columns added (NaN where history is short)."""
+    ts = timestamps(df)
+    df = df.set_axis(ts).sort_index()
+    df = df[~df.index.duplicated(keep="last")]
+    hourly = df.asfreq("h")          # gaps -> NaN rows, so shifts/windows are in hours, not rows
+
+    feats = {}
+    target = hourly[TARGET].astype("float64")
+    for k in lags:
+        feats[f"{TARGET}_lag{k}"] = target.shift(k)
+    for w in windows:
+        roll = hourly[list(columns)].astype("float64").rolling(w, min_periods=w)
+        means, maxes = roll.mean(), roll.max()
+        for c in columns:
+            feats[f"{c}_mean{w}"] = means[c]
+            feats[f"{c}_max{w}"] = maxes[c]
+
+    feats = pd.DataFrame(feats, index=hourly.index).reindex(df.index)
+    return pd.concat([df, feats], axis=1).reset_index(drop=True)
+
+
+def time_ordered_split(X, y, test_size=0.25):
+    """X, y already sorted by time: oldest rows train, most recent rows test."""
+    cut = int(round(len(X) * (1 - test_size)))
+    return X.iloc[:cut], X.iloc[cut:], y.iloc[:cut], y.iloc[cut:]
+
+
+# --- Serving: incremental ---
+class _Window:
+    """Last `size` values with O(1) sum and amortized O(1) max (monotonic deque)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.maxq = deque()   # (index, value), values decreasing
+        self.n = 0            # index of the next pushed value
+
+    def push(self, v):
+        if self.size == 0:
+            return
+        self.values.append(v)
+        self.total += v
+        while self.maxq and self.maxq[-1][1] <= v:
+            self.maxq.pop()
+        self.maxq.append((self.n, v))
+        self.n += 1
+        if len(self.values) > self.size:
+            self.total -= self.values.popleft()
+        while self.maxq[0][0] < self.n - self.size:
+            self.maxq.popleft()
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def max(self):
+        return self.maxq[0][1] if self.maxq else -np.inf
+
+
+class RollingState:
+    """Serving-side history for one station, in this process only; observe() consecutive hourly readings."""
+
+    def __init__(self, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, columns=ROLLING_COLUMNS):
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        self.columns = tuple(columns)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.last_time = None
+        self.pm25 = deque(maxlen=max(self.lags, default=0))
+        self.pm25_missing = 0          # NaNs currently in pm25, so ready stays O(1)
+        # windows hold the w-1 hours *before* the one being predicted
+        self.win = {(c, w): _Window(w - 1) for w in self.windows for c in self.columns}
+        self.resets = getattr(self, "resets", -1) + 1
+
+    @property
+    def hours_needed(self) -> int:
+        return max(max(self.lags, default=0), max(self.windows, default=1) - 1)
+
+    @property
+    def ready(self) -> bool:
+        lag_ok = len(self.pm25) == self.pm25.maxlen and self.pm25_missing == 0
+        return lag_ok and all(w.full for w in self.win.values())
+
+    def observe(self, when: pd.Timestamp, reading: dict):
+        """Slide every window by one hour. The reading must be for the hour after the last one;
+        after a gap, reset() first (the history then has to be rebuilt)."""
+        when = pd.Timestamp(when).floor("h")
+        with self._lock:
+            if self.last_time is not None and when - self.last_time != pd.Timedelta(hours=1):
+                raise ValueError(f"Reading for {when} does not follow the last one ({self.last_time}) "
+                                 f"by one hour; send the missing hours or restart the history.")
+            for (c, _), win in self.win.items():
+                win.push(float(reading[c]))
+            pm25 = float(reading.get(TARGET, np.nan))
+            if self.pm25.maxlen:
+                if len(self.pm25) == self.pm25.maxlen:
+                    self.pm25_missing -= np.isnan(self.pm25[0])     # the value about to drop out
+                self.pm25_missing += np.isnan(pm25)
+                self.pm25.append(pm25)
+            self.last_time = when
+
+    def features(self, current: dict) -> dict:
+        """Time features for the hour after the last observation, given its weather inputs."""
+        with self._lock:
+            if not self.ready:
+                raise ValueError(f"Need {self.hours_needed} consecutive hourly observations "
+                                 f"(with pm2.5) before predicting; have {len(self.pm25)}.")
+            out = {}
+            for k in self.lags:
+                out[f"{TARGET}_lag{k}"] = self.pm25[-k]      # a deque indexes from the nearer end, no copy
+            for w in self.windows:
+                for c in self.columns:
+                    win = self.win[(c, w)]
+                    v = float(current[c])
+                    out[f"{c}_mean{w}"] = (win.total + v) / w
+                    out[f"{c}_max{w}"] = max(win.max(), v)
+            return out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "last_time": None if self.last_time is None else self.last_time.isoformat(),
+                "hours": len(self.pm25),
+                "hours_needed": self.hours_needed,
+                "ready": self.ready,
+                "resets": self.resets,
+            }
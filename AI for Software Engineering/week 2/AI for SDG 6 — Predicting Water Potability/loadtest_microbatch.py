@@ -0,0 +1,109 @@
+"""
+Load test: one-row-at-a-time predict vs the MicroBatcher coalescer.
+
+N client threads hammer the scorer for a fixed duration, the same way
+concurrent /predict requests hit a threaded Flask worker. Reports
+throughput (requests/s), latency p50/p99 and the batcher's metrics.
+
+Usage:
+    python loadtest_microbatch.py [--clients 32] [--duration 10]
+                                  [--engine pipeline|compiled]
+                                  [--wait-ms 5] [--max-rows 64]
+"""
+
+import argparse
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compiled_model import CompiledForest
+from microbatch import MicroBatcher
+from train_model import DATA_PATH, MODEL_PATH, COMPILED_PATH, NUMERIC_FEATURES, CATEGORICAL_FEATURES, normalize_columns
+
+COLS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+def make_scorers(engine):
+    if engine == "compiled":
+        compiled = CompiledForest.load(COMPILED_PATH)
+
+        def single(values, cbwd):
+            return compiled.predict_one([values[k] for k in NUMERIC_FEATURES], cbwd)
+
+        def batch(rows):
+            numeric = np.array([[v[k] for k in NUMERIC_FEATURES] for v, _ in rows], dtype=float)
+            return compiled.predict(numeric, [c for _, c in rows])
+    else:
+        pipe = joblib.load(MODEL_PATH)
+
+        def single(values, cbwd):
+            return float(pipe.predict(pd.DataFrame([{**values, "cbwd": cbwd}], columns=COLS))[0])
+
+        def batch(rows):
+            return pipe.predict(pd.DataFrame([{**v, "cbwd": c} for v, c in rows], columns=COLS))
+
+    return single, batch
+
+
+def run_load(call, requests, clients, duration):
+    latencies = [[] for _ in range(clients)]
+    stop = time.perf_counter() + duration
+
+    def client(i):
+        j = i
+        while time.perf_counter() < stop:
+            values, cbwd = requests[j % len(requests)]
+            t0 = time.perf_counter()
+            call(values, cbwd)
+            latencies[i].append(time.perf_counter() - t0)
+            j += clients
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    lat = np.concatenate([np.asarray(l) for l in latencies]) * 1000
+    return {
+        "requests": len(lat),
+        "rps": len(lat) / elapsed,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    ap.add_argument("--engine", choices=["pipeline", "compiled"], default="pipeline")
+    ap.add_argument("--wait-ms", type=float, default=5.0)
+    ap.add_argument("--max-rows", type=int, default=64)
+    args = ap.parse_args()
+
+    df = normalize_columns(pd.read_csv(DATA_PATH)).dropna(subset=COLS)
+    sample = df[COLS].sample(n=2000, random_state=0)
+    requests = [({k: float(r[k]) for k in NUMERIC_FEATURES}, r["cbwd"]) for r in sample.to_dict("records")]
+
+    single, batch = make_scorers(args.engine)
+    print(f"engine={args.engine} clients={args.clients} duration={args.duration}s")
+
+    base = run_load(single, requests, args.clients, args.duration)
+    batcher = MicroBatcher(batch, max_wait_ms=args.wait_ms, max_batch_rows=args.max_rows)
+    coalesced = run_load(batcher.submit, requests, args.clients, args.duration)
+
+    print(f"{'scenario':<18}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, r in [("one-row-at-a-time", base), ("micro-batched", coalesced)]:
+        print(f"{name:<18}{r['requests']:>10}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+    print(f"Throughput gain: {coalesced['rps'] / base['rps']:.1f}x")
+    print("Batcher metrics:", batcher.metrics())
+
+
+if __name__ == "__main__":
+    main()
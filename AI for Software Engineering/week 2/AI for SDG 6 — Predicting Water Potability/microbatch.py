@@ -0,0 +1,115 @@
+"""
+In-process request coalescing for /predict.
+
+Each Flask worker thread submits its single row and blocks on a Future.
+A background thread drains the queue: it waits for the first row, then keeps
+collecting until either `max_wait_ms` has passed or `max_batch_rows` rows are
+queued, scores the whole batch with ONE vectorized predict call and hands each
+caller its own result.
+
+    batcher = MicroBatcher(score_rows, max_wait_ms=5, max_batch_rows=64)
+    y = batcher.submit(values, cbwd)      # blocks until the batch is scored
+
+`score_rows(rows)` receives a list of (values_dict, cbwd) and must return one
+prediction per row, in order.
+"""
+
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+
+class MicroBatcher:
+    def __init__(self, score_rows, max_wait_ms=5.0, max_batch_rows=64, timeout_s=30.0):
+        if max_batch_rows < 1:
+            raise ValueError("max_batch_rows must be >= 1")
+        self.score_rows = score_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self.timeout_s = timeout_s
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._rows = 0
+        self._max_batch = 0
+        self._last_batch = 0
+        self._errors = 0
+        self._wait_s = 0.0          # total time rows spent queued
+        self._size_hist = {}        # batch-size bucket (power of two) -> count
+
+        self._thread = threading.Thread(target=self._run, name="pm25-microbatch", daemon=True)
+        self._thread.start()
+
+    def submit(self, values, cbwd) -> float:
+        fut = Future()
+        self._queue.put((values, cbwd, fut, time.perf_counter()))
+        return fut.result(timeout=self.timeout_s)
+
+    # --- Worker loop ---
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Anything already queued rides along for free (still capped)
+        while len(batch) < self.max_batch_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                preds = [float(y) for y in self.score_rows([(values, cbwd) for values, cbwd, _, _ in batch])]
+                if len(preds) != len(batch):
+                    # zip would leave the extra futures unresolved until their callers time out
+                    raise ValueError(f"score_rows returned {len(preds)} predictions for {len(batch)} rows")
+            except Exception as e:
+                for _, _, fut, _ in batch:
+                    fut.set_exception(e)
+                failed = True
+            else:
+                for (_, _, fut, _), y in zip(batch, preds):
+                    fut.set_result(y)
+                failed = False
+            self._record(batch, started, failed)
+
+    def _record(self, batch, started, failed):
+        n = len(batch)
+        bucket = 1 << (n - 1).bit_length()
+        with self._lock:
+            self._batches += 1
+            self._rows += n
+            self._last_batch = n
+            self._max_batch = max(self._max_batch, n)
+            self._errors += int(failed)
+            self._wait_s += sum(started - t for _, _, _, t in batch)
+            self._size_hist[bucket] = self._size_hist.get(bucket, 0) + 1
+
+    # --- Metrics ---
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "rows": self._rows,
+                "errors": self._errors,
+                "avg_batch_size": round(self._rows / self._batches, 2) if self._batches else 0.0,
+                "last_batch_size": self._last_batch,
+                "max_batch_size": self._max_batch,
+                "avg_queue_wait_ms": round(1000 * self._wait_s / self._rows, 3) if self._rows else 0.0,
+                "batch_size_histogram": {f"<={k}": v for k, v in sorted(self._size_hist.items())},
+                "config": {"max_wait_ms": self.max_wait * 1000, "max_batch_rows": self.max_batch_rows},
+            }
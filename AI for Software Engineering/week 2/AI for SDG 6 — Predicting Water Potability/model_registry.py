@@ -0,0 +1,93 @@
+"""
+Pluggable estimator registry for train_model.py (--model rf|hgb|linear).
+
+Each engine is a builder returning an unfitted sklearn Pipeline whose first
+step is the preprocessing ColumnTransformer. All engines take the same input
+frame (NUMERIC_FEATURES + cbwd), so app.py can serve any of them.
+
+- rf:     StandardScaler + OneHotEncoder -> RandomForestRegressor (the original model;
+          also exported to the compiled NumPy format)
+- hgb:    OrdinalEncoder(cbwd) + passthrough -> HistGradientBoostingRegressor with
+          native categorical splits on cbwd (no one-hot columns)
+- linear: StandardScaler + OneHotEncoder -> Ridge (tiny, fast baseline)
+
+To add an engine, decorate a builder with @register("name").
+"""
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+REGISTRY = {}
+
+
+def register(name, compilable=False):
+    """compilable: the fitted pipeline can be exported with compiled_model.export_compiled."""
+    def deco(builder):
+        REGISTRY[name] = {"build": builder, "compilable": compilable}
+        return builder
+    return deco
+
+
+def build(name, numeric, categorical) -> Pipeline:
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown model {name!r}; choose from {sorted(REGISTRY)}")
+    return REGISTRY[name]["build"](list(numeric), list(categorical))
+
+
+def is_compilable(name) -> bool:
+    return REGISTRY[name]["compilable"]
+
+
+def _scaled_onehot(numeric, categorical):
+    return ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), numeric),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical),
+        ]
+    )
+
+
+@register("rf", compilable=True)
+def build_rf(numeric, categorical):
+    model = RandomForestRegressor(
+        n_estimators=500,
+        random_state=42,
+        n_jobs=-1,
+        max_depth=None,
+        min_samples_leaf=2
+    )
+    return Pipeline([("pre", _scaled_onehot(numeric, categorical)), ("rf", model)])
+
+
+@register("hgb")
+def build_hgb(numeric, categorical):
+    # Categorical columns go first so their output indices are 0..k-1.
+    # Unknown categories become NaN, which HGB treats as missing.
+    pre = ColumnTransformer(
+        transformers=[
+            ("cat", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=np.nan), categorical),
+            ("num", "passthrough", numeric),
+        ]
+    )
+    model = HistGradientBoostingRegressor(
+        categorical_features=list(range(len(categorical))),
+        max_iter=500,
+        learning_rate=0.1,
+        max_leaf_nodes=63,
+        min_samples_leaf=20,
+        l2_regularization=1.0,
+        early_stopping=True,
+        validation_fraction=0.1,
+        n_iter_no_change=20,
+        random_state=42,
+    )
+    return Pipeline([("pre", pre), ("hgb", model)])
+
+
+@register("linear")
+def build_linear(numeric, categorical):
+    return Pipeline([("pre", _scaled_onehot(numeric, categorical)), ("linear", Ridge(alpha=1.0))])
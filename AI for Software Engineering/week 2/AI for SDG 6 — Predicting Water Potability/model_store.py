@@ -0,0 +1,209 @@
+"""
+Background model loading and hot reload for app.py.
+
+- Startup: ModelStore.start() returns immediately; the model is loaded in a
+  background thread so /healthz can answer while workers warm up.
+- Memory: the compiled artifact (models/pm25_compiled/, one .npy per array)
+  is opened with np.load(mmap_mode="r"). Pages come straight from the OS page
+  cache, so forked workers share them instead of each unpickling a private
+  copy of the forest. The sklearn pickle is only loaded (lazily) when there is
+  no up-to-date compiled artifact.
+- Metadata: models/pm25_model.json (written last by train_model.py) names the
+  engine (rf/hgb/linear) and whether a compiled artifact exists; it is
+  attached to the LoadedModel once it matches the pickle on disk.
+- Hot reload: a watcher thread polls the model files; when they change, the
+  new model is loaded off to the side and swapped in with a single reference
+  assignment. Each request grabs one LoadedModel and uses it throughout, so it
+  never sees a half-swapped model.
+"""
+
+import json
+from pathlib import Path
+import threading
+import time
+
+import joblib
+
+from compiled_model import CompiledForest, model_fingerprint
+
+# How long a changed pickle may wait for its matching compiled artifact
+# (train_model.py writes the pickle first) before we fall back to the pickle.
+COMPILED_GRACE_S = 120.0
+
+
+class ModelNotReady(RuntimeError):
+    pass
+
+
+class LoadedModel:
+    """One immutable model generation: compiled arrays and/or the sklearn pipeline."""
+
+    def __init__(self, model_path, fingerprint, compiled=None, pipeline=None, metadata=None):
+        self.model_path = model_path
+        self.fingerprint = fingerprint
+        self.compiled = compiled
+        self.metadata = metadata or {}
+        self._pipeline = pipeline
+        self._pipeline_lock = threading.Lock()
+        self.loaded_at = time.time()
+
+    @property
+    def engine(self) -> str:
+        return "compiled" if self.compiled is not None else "pipeline"
+
+    @property
+    def model_name(self) -> str:
+        return self.metadata.get("engine", "unknown")
+
+    @property
+    def pipeline(self):
+        """The sklearn Pipeline, unpickled on first use only."""
+        if self._pipeline is None:
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    self._pipeline = joblib.load(self.model_path, mmap_mode="r")
+        return self._pipeline
+
+
+def _compiled_source(compiled_path):
+    """Fingerprint of the pickle the compiled artifact was exported from (cheap: meta.json only)."""
+    try:
+        return json.loads((Path(compiled_path) / "meta.json").read_text()).get("source_model")
+    except (OSError, ValueError):
+        return None
+
+
+def _read_metadata(metadata_path, fingerprint):
+    """The metadata JSON if it describes this exact pickle, else None."""
+    if metadata_path is None:
+        return None
+    try:
+        meta = json.loads(Path(metadata_path).read_text())
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("model") == fingerprint else None
+
+
+def _read_compiled(compiled_path, fingerprint):
+    try:
+        compiled = CompiledForest.load(compiled_path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring compiled model: {e}")
+        return None
+    if compiled.meta.get("source_model") != fingerprint:
+        return None
+    return compiled
+
+
+class ModelStore:
+    def __init__(self, model_path, compiled_path, metadata_path=None, reload_interval_s=5.0, on_swap=None):
+        self.model_path = str(model_path)
+        self.compiled_path = str(compiled_path)
+        self.metadata_path = metadata_path
+        self.reload_interval_s = reload_interval_s
+        self.on_swap = on_swap or []
+
+        self._current = None
+        self._ready = threading.Event()
+        self._reload_lock = threading.Lock()
+        self.status = "loading"
+        self.error = None
+        self.load_seconds = None
+        self.reloads = 0
+        self._pending_since = None   # first time we saw a pickle without its compiled twin
+
+    # --- Public API ---
+    def start(self):
+        threading.Thread(target=self._initial_load, name="pm25-model-load", daemon=True).start()
+        if self.reload_interval_s > 0:
+            threading.Thread(target=self._watch, name="pm25-model-watch", daemon=True).start()
+        return self
+
+    def get(self, timeout=30.0) -> LoadedModel:
+        if not self._ready.wait(timeout):
+            raise ModelNotReady("Model is still loading, please retry shortly.")
+        if self._current is None:
+            raise ModelNotReady(f"Model failed to load: {self.error}")
+        return self._current
+
+    def health(self) -> dict:
+        cur = self._current
+        return {
+            "status": self.status,
+            "error": self.error,
+            "engine": cur.engine if cur else None,
+            "model_name": cur.model_name if cur else None,
+            "metrics": cur.metadata.get("metrics") if cur else None,
+            "model": cur.fingerprint if cur else None,
+            "loaded_at": cur.loaded_at if cur else None,
+            "load_seconds": self.load_seconds,
+            "reloads": self.reloads,
+        }
+
+    def reload(self, force_pipeline=False) -> bool:
+        """Load the model currently on disk and swap it in. Returns True if swapped."""
+        with self._reload_lock:
+            t0 = time.perf_counter()
+            fingerprint = model_fingerprint(self.model_path)
+            metadata = _read_metadata(self.metadata_path, fingerprint)
+            compiled = _read_compiled(self.compiled_path, fingerprint)
+            # Pipeline-only engines (hgb, linear) say so in their metadata
+            expects_compiled = metadata is None or metadata.get("compiled", True)
+            if compiled is None and expects_compiled and not force_pipeline:
+                # Training writes the pickle first; give the compiled export and metadata time to land
+                now = time.monotonic()
+                if self._pending_since is None:
+                    self._pending_since = now
+                if self._current is not None and now - self._pending_since < COMPILED_GRACE_S:
+                    return False
+            self._pending_since = None
+
+            new = LoadedModel(self.model_path, fingerprint, compiled=compiled, metadata=metadata)
+            if compiled is None:
+                new.pipeline  # no fast path: unpickle now, not on the first request
+            self._current = new          # atomic swap
+            self.load_seconds = round(time.perf_counter() - t0, 3)
+            self.status = "ready"
+            self.error = None
+            self._ready.set()
+            for cb in self.on_swap:
+                cb(new)
+            return True
+
+    # --- Background threads ---
+    def _initial_load(self):
+        try:
+            self.reload(force_pipeline=True)
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            self._ready.set()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval_s)
+            if self.status == "loading":
+                continue
+            cur = self._current
+            try:
+                fingerprint = model_fingerprint(self.model_path)
+            except FileNotFoundError:
+                continue
+            stale = cur is None or fingerprint != cur.fingerprint
+            upgradable = cur is not None and (
+                (cur.compiled is None and _compiled_source(self.compiled_path) == fingerprint)
+                or (not cur.metadata and _read_metadata(self.metadata_path, fingerprint) is not None)
+            )
+            if not (stale or upgradable):
+                continue
+            try:
+                if self.reload():
+                    self.reloads += 1
+                    cur = self._current
+                    print(f"Reloaded model {cur.model_name} ({cur.engine}) from {self.model_path}")
+            except Exception as e:
+                # Keep serving the previous generation
+                self.error = f"reload failed: {e}"
+
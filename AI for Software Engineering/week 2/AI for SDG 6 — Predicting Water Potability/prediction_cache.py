@@ -0,0 +1,144 @@
+"""
+Bounded LRU + TTL cache for single-row predictions.
+
+Dashboards resend the same (or nearly the same) conditions, so /predict
+results are cached under a key built from the parsed feature values after
+quantization: each numeric field is snapped to a grid (e.g. TEMP to 0.1 °C)
+and the cache key is the tuple of grid indices plus cbwd. The model is then
+evaluated on the snapped values, so every request that lands in the same
+cell gets the same answer no matter which one filled the cache.
+
+The cache is cleared automatically when the model file's size/mtime changes.
+"""
+
+from collections import OrderedDict
+import os
+import threading
+import time
+
+# Grid step per feature; None/0 = exact value
+DEFAULT_QUANTIZATION = {
+    "TEMP": 0.1, "DEWP": 0.1, "PRES": 0.1, "Iws": 0.01,
+    "Is": 1, "Ir": 1, "hour": 1, "month": 1,
+}
+
+
+def parse_quantization(spec: str) -> dict:
+    """'TEMP=0.5,PRES=1' -> {"TEMP": 0.5, "PRES": 1.0} (merged over the defaults by the caller)."""
+    out = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, step = part.partition("=")
+        out[name.strip()] = float(step)
+    return out
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class PredictionCache:
+    def __init__(self, features, maxsize=4096, ttl_s=3600.0, quantization=None,
+                 source_path=None, check_interval_s=1.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.features = list(features)
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.quantization = {**DEFAULT_QUANTIZATION, **(quantization or {})}
+        self.source_path = source_path
+        self.check_interval_s = check_interval_s
+
+        self._data = OrderedDict()      # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._generation = 0            # bumped by clear(); a value computed before that is dropped
+        self._source_sig = _file_signature(source_path) if source_path else None
+        self._next_check = time.monotonic() + check_interval_s
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    # --- Keys ---
+    def quantize(self, values: dict, cbwd: str):
+        """Returns (key, snapped_values)."""
+        key = []
+        snapped = {}
+        for f in self.features:
+            v = values[f]
+            step = self.quantization.get(f)
+            if step:
+                q = int(round(v / step))
+                key.append(q)
+                snapped[f] = q * step
+            else:
+                key.append(v)
+                snapped[f] = v
+        key.append(cbwd)
+        return tuple(key), snapped
+
+    # --- Lookup ---
+    def get_or_compute(self, values: dict, cbwd: str, compute) -> float:
+        """compute(values, cbwd) is called on the snapped values on a miss."""
+        self._check_source()
+        key, snapped = self.quantize(values, cbwd)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        value = compute(snapped, cbwd)   # outside the lock: concurrent misses may race, harmlessly
+
+        with self._lock:
+            if generation != self._generation:   # cleared meanwhile (e.g. model swap): may be the old model's
+                return value
+            self._data[key] = (now + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            if self._data:
+                self._data.clear()
+                self.invalidations += 1
+
+    def _check_source(self):
+        if self.source_path is None:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval_s
+        sig = _file_signature(self.source_path)
+        if sig != self._source_sig:
+            self._source_sig = sig
+            self.clear()
+
+    # --- Stats ---
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "quantization": {f: self.quantization.get(f) for f in self.features},
+            }
@@ -0,0 +1,214 @@
+"""
+Input schema for the PM2.5 model, shared by train_model.py and app.py.
+
+SCHEMA lists every model input once (name, kind, unit, range, display label);
+NUMERIC_FEATURES / CATEGORICAL_FEATURES are derived from it, so the training
+columns and the validated request fields cannot drift apart.
+
+Two validation paths with the same rules and the same messages:
+- validate_record(form): scalar path for /predict. One pass over the fields; the
+  common case ("12.5") is a single float() call, and only messy input reaches
+  the precompiled cleanup patterns.
+- validate_frame(df, numeric): vectorized path for /predict/batch, column at a time.
+Both return structured FieldError(row, field, error) entries instead of raising.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+# Compiled once at import; parse_number never goes through the re module cache
+_NUMBER = re.compile(r"[+-]?\d*([.]\d+)?([eE][+-]?\d+)?")
+_NOT_NUMBER_CHARS = re.compile(r"[^0-9eE+.\-]")
+_UNICODE_MINUS = "−"
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    name: str
+    kind: str                    # "float" | "int" | "category"
+    unit: str = ""
+    label: str = ""
+    min: Optional[float] = None
+    max: Optional[float] = None
+    message: str = ""            # range (numeric) or empty-value (category) error
+
+    @property
+    def display(self):
+        return self.label or self.name
+
+
+SCHEMA = [
+    FeatureSpec("TEMP", "float", "°C", "TEMP (°C)"),
+    FeatureSpec("DEWP", "float", "°C", "DEWP (°C)"),
+    FeatureSpec("PRES", "float", "hPa", "PRES (hPa)"),
+    FeatureSpec("Iws", "float", "wind speed index", "Iws (wind index)"),
+    FeatureSpec("Is", "float", "snow hours", "Is (snow)"),
+    FeatureSpec("Ir", "float", "rain hours", "Ir (rain)"),
+    FeatureSpec("hour", "int", "h", "Hour", 0, 23, "Hour must be between 0 and 23."),
+    FeatureSpec("month", "int", "", "Month", 1, 12, "Month must be between 1 and 12."),
+    FeatureSpec("cbwd", "category", "", "Wind Dir (cbwd)",
+                message="Please select a wind direction (cbwd)."),
+]
+SPECS = {s.name: s for s in SCHEMA}
+
+NUMERIC_FEATURES = [s.name for s in SCHEMA if s.kind != "category"]
+CATEGORICAL_FEATURES = [s.name for s in SCHEMA if s.kind == "category"]
+
+
+def spec_for(name) -> FeatureSpec:
+    """Schema entry, or an unbounded float for derived columns (e.g. time features)."""
+    return SPECS.get(name) or FeatureSpec(name, "float")
+
+
+@lru_cache(maxsize=8)
+def _plan(numeric: tuple):
+    """Field specs for one feature list, resolved once instead of per request."""
+    return tuple(spec_for(name) for name in numeric + tuple(CATEGORICAL_FEATURES))
+
+
+class FieldError(NamedTuple):
+    row: Optional[int]           # 0-based batch row; None for a whole missing column / the form
+    field: str
+    error: str
+
+
+# --- Scalar path ---
+def parse_number(text: str):
+    """
+    float(text) for the common case; messy input (unicode minus, decimal comma,
+    units like "12°C") goes through the same cleanup as before. Non-finite
+    values are rejected, as in the vectorized path.
+    """
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        value = _parse_messy(text)
+    if not math.isfinite(value):
+        raise ValueError(f"not a number: {text!r}")
+    return value
+
+
+def _parse_messy(text):
+    if text is None:
+        raise ValueError("empty")
+    s = text.strip()
+    if s == "":
+        raise ValueError("empty")
+    if _UNICODE_MINUS in s:
+        s = s.replace(_UNICODE_MINUS, "-")
+    if "," in s and "." not in s:     # decimal comma → dot
+        s = s.replace(",", ".")
+    if _NUMBER.fullmatch(s) is None:
+        cleaned = _NOT_NUMBER_CHARS.sub("", s)
+        if cleaned == "" or _NUMBER.fullmatch(cleaned) is None:
+            raise ValueError(f"not a number: {text!r}")
+        s = cleaned
+    return float(s)
+
+
+def validate_record(form, numeric=NUMERIC_FEATURES, first_error_only=True):
+    """
+    Returns (values, categories, errors) for one form/dict of raw strings.
+    int fields are rounded to int before the range check, floats must be finite.
+    With first_error_only, stops at the first problem (what /predict shows).
+    """
+    values, categories, errors = {}, {}, []
+    for spec in _plan(tuple(numeric)):
+        name = spec.name
+        raw = form.get(name)
+        if spec.kind == "category":
+            value = (raw or "").strip()
+            if value == "":
+                errors.append(FieldError(None, name, spec.message or f"Missing field: {name}"))
+            categories[name] = value
+        elif raw is None:
+            errors.append(FieldError(None, name, f"Missing field: {name}"))
+        else:
+            try:
+                value = parse_number(raw)
+            except ValueError as ve:
+                errors.append(FieldError(None, name, f"Invalid number for '{name}': {ve}"))
+            else:
+                if spec.kind == "int":
+                    value = int(round(value))
+                if ((spec.min is not None and value < spec.min)
+                        or (spec.max is not None and value > spec.max)):
+                    errors.append(FieldError(None, name, spec.message))
+                values[name] = value
+        if errors and first_error_only:
+            break
+    return values, categories, errors
+
+
+# --- Vectorized path ---
+def _parse_column(col: pd.Series) -> pd.Series:
+    """parse_number over a whole column; unparsable entries become NaN."""
+    if not (col.dtype == object or pd.api.types.is_string_dtype(col)):
+        return pd.to_numeric(col, errors="coerce").astype(float)
+    # Plain numbers parse in C; only the leftovers go through the string normalisation
+    out = pd.to_numeric(col, errors="coerce").astype(float)
+    retry = out.isna() & col.notna()
+    if retry.any():
+        out[retry] = _normalise_and_parse(col[retry])
+    return out
+
+
+def _normalise_and_parse(col: pd.Series) -> pd.Series:
+    col = col.astype("string").str.strip().str.replace(_UNICODE_MINUS, "-", regex=False)
+    comma = col.str.contains(",", regex=False) & ~col.str.contains(".", regex=False)
+    col = col.mask(comma.fillna(False), col.str.replace(",", ".", regex=False))
+    clean = col.str.fullmatch(_NUMBER).fillna(False)
+    if not clean.all():
+        col = col.mask(~clean, col.str.replace(_NOT_NUMBER_CHARS, "", regex=True))
+    return pd.to_numeric(col, errors="coerce").astype(float)
+
+
+def validate_frame(df: pd.DataFrame, numeric=NUMERIC_FEATURES, max_reported=50):
+    """
+    Column-wise validate_record for a batch. Returns (X, errors, error_count):
+    X the model-ready frame, errors FieldErrors (at most max_reported per check)
+    and error_count the total number of failed checks.
+    """
+    errors = []
+    error_count = 0
+
+    def report(field, mask, message):
+        nonlocal error_count
+        bad = np.flatnonzero(mask)
+        error_count += len(bad)
+        errors.extend(FieldError(int(i), field, message) for i in bad[:max_reported])
+
+    X = pd.DataFrame(index=df.index)
+    for name in numeric:
+        spec = spec_for(name)
+        if name not in df.columns:
+            error_count += 1
+            errors.append(FieldError(None, name, f"Missing field: {name}"))
+            continue
+        col = _parse_column(df[name])
+        report(name, ~np.isfinite(col.to_numpy()), f"Invalid number for '{name}'")
+        if spec.kind == "int":
+            col = col.round()
+        if spec.min is not None or spec.max is not None:
+            lo = -math.inf if spec.min is None else spec.min
+            hi = math.inf if spec.max is None else spec.max
+            report(name, col.notna() & ~col.between(lo, hi), spec.message)
+        X[name] = col
+
+    for name in CATEGORICAL_FEATURES:
+        spec = spec_for(name)
+        if name not in df.columns:
+            error_count += 1
+            errors.append(FieldError(None, name, f"Missing field: {name}"))
+            continue
+        col = df[name].astype("string").str.strip()
+        report(name, (col.isna() | (col == "")).to_numpy(), spec.message)
+        X[name] = col.astype(object)
+
+    return X, errors, error_count
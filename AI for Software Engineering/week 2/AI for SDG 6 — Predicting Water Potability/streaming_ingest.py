@@ -0,0 +1,107 @@
+"""
+Chunked, bounded-memory ingestion of PRSA-style sensor CSVs.
+
+The in-memory path (read_csv -> normalize_columns -> dropna().copy() -> X/y
+slices) holds several full copies of the dataset at once. stream_xy() instead:
+1. counts the data rows once (a raw byte scan, no parsing),
+2. preallocates the training matrices for that many rows: one float64
+   (rows, n_numeric) block that becomes the DataFrame's storage without a
+   copy, int8 category codes and a float32 target,
+3. reads the CSV in chunks with explicit compact dtypes (float32, string for
+   categories) and only the needed columns, runs normalize_columns +
+   required-column dropna on each chunk and copies the surviving rows into
+   the next free slots.
+
+The numeric block is float64 on purpose: sklearn would upcast to it anyway,
+and scaling in float64 at training time matches what app.py does at serving
+time (a float32 StandardScaler shifts values across split thresholds).
+
+Peak RSS bound (ingestion only; lines = data lines in the file):
+    baseline interpreter + libraries
+  + lines * (8 * n_numeric + 1 * n_categorical + 4)    # preallocated matrices
+  + chunksize * ~450 B                                 # parser buffers + one chunk's copies
+  + ~16 MB                                             # fixed pandas/NumPy overhead
+i.e. about 69 B/line for the 8-feature PRSA schema, independent of how many
+extra columns the source file carries or how large it is on disk.
+bench_streaming.py checks this on a synthetic 50x PRSA file.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Reading dtypes; integers are read as float32 because they may be missing
+NUMERIC_READ_DTYPE = "float32"
+BLOCK_SIZE = 1 << 20
+
+
+def count_data_rows(path) -> int:
+    """Number of lines after the header (upper bound on data rows)."""
+    n = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            n += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        n += 1          # final line without trailing newline
+    return max(n - 1, 0)
+
+
+def _read_plan(path, normalize, wanted):
+    """Map the file's raw header onto normalized names; keep only the wanted columns."""
+    header = list(pd.read_csv(path, nrows=0).columns)
+    usecols, dtypes = [], {}
+    for raw in header:
+        name = normalize(pd.DataFrame(columns=[raw])).columns
+        name = [c for c in name if c != "No" or raw.lower() == "no"]
+        if name and name[0] in wanted:
+            usecols.append(raw)
+            dtypes[raw] = "string" if wanted[name[0]] == "cat" else NUMERIC_READ_DTYPE
+    return usecols, dtypes
+
+
+def stream_xy(path, normalize, numeric, categorical, target, chunksize=200_000):
+    """
+    Returns (X, y): X a DataFrame with `numeric` float64 columns and
+    `categorical` pandas categoricals, y a float32 Series. Rows with any
+    missing required value are dropped, exactly like the in-memory path.
+    """
+    wanted = {**{c: "num" for c in numeric + [target]}, **{c: "cat" for c in categorical}}
+    usecols, dtypes = _read_plan(path, normalize, wanted)
+
+    capacity = count_data_rows(path)
+    num = np.empty((capacity, len(numeric)), dtype=np.float64)
+    codes = {c: np.empty(capacity, dtype=np.int8) for c in categorical}
+    code_maps = {c: {} for c in categorical}
+    y = np.empty(capacity, dtype=np.float32)
+    required = numeric + categorical + [target]
+
+    n = 0
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        chunk = normalize(chunk)
+        missing = [c for c in required if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns after normalization: {missing}")
+        chunk = chunk.dropna(subset=required)
+        k = len(chunk)
+        if k == 0:
+            continue
+        num[n:n + k] = chunk[numeric].to_numpy(dtype=np.float64)
+        for c in categorical:
+            values = chunk[c].to_numpy(dtype=object)
+            cmap = code_maps[c]
+            for v in pd.unique(values):
+                if v not in cmap:
+                    if len(cmap) >= np.iinfo(np.int8).max:
+                        raise ValueError(f"Too many categories in {c!r} for int8 codes.")
+                    cmap[v] = len(cmap)
+            codes[c][n:n + k] = pd.Series(values).map(cmap).to_numpy(dtype=np.int8)
+        y[n:n + k] = chunk[target].to_numpy(dtype=np.float32)
+        n += k
+        del chunk
+
+    X = pd.DataFrame(num[:n], columns=numeric, copy=False)
+    for c in categorical:
+        cats = sorted(code_maps[c], key=code_maps[c].get)
+        X[c] = pd.Categorical.from_codes(codes[c][:n], categories=cats)
+    return X, pd.Series(y[:n], name=target)
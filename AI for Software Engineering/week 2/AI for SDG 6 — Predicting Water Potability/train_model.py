@@ -8,39 +8,64 @@ The script is resilient to network issues:
 - Else tries direct CSV/ZIP mirrors with 'requests'.
 - Else prints clear manual-download steps and exits.
 
+The normalized frame is cached under data/cache/ (see dataset_cache.py) and
+reused while the CSV's SHA-256 is unchanged; pass --no-cache to re-parse.
+For CSVs too large to hold in memory use --stream [--data big.csv]
+(see streaming_ingest.py for the peak-memory bound).
+
+--time-features adds lagged pm2.5 and rolling weather mean/max (features.py),
+splits by time (most recent 25% held out) and records the lag/window config
+in the metadata so app.py can rebuild the same features incrementally.
+
 Features: TEMP, DEWP, PRES, Iws, Is, Ir, hour, month, cbwd
+          (+ pm2.5_lag{k}, {col}_mean{w}, {col}_max{w} with --time-features)
 Target: pm2.5
-Model: Pipeline( ColumnTransformer[StandardScaler, OneHotEncoder] -> RandomForestRegressor )
+Model: --model rf (default) | hgb | linear, see model_registry.py
+       rf = Pipeline( ColumnTransformer[StandardScaler, OneHotEncoder] -> RandomForestRegressor )
 Metrics: MAE, RMSE, R²
 Output: models/pm25_model.pkl
+        models/pm25_model.json (engine, metrics, features)
+        models/pm25_compiled/  (rf only: NumPy-only inference arrays, see compiled_model.py)
 """
 
 from pathlib import Path
+import argparse
 import io
+import json
+import os
+import shutil
+import time
 import zipfile
 import sys
 import pandas as pd
 import numpy as np
 import joblib
 
+import sklearn
 from sklearn.model_selection import train_test_split
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
+import model_registry
+from compiled_model import export_compiled, check_parity, model_fingerprint
+from dataset_cache import cached_frame
+import features
+from schema import NUMERIC_FEATURES, CATEGORICAL_FEATURES
+from streaming_ingest import stream_xy
+from tuning import successive_halving, report
+
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 CSV_NAME = "PRSA_data_2010.1.1-2014.12.31.csv"
 DATA_PATH = DATA_DIR / CSV_NAME
+CACHE_DIR = DATA_DIR / "cache"
 
 MODEL_DIR = Path("models")
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 MODEL_PATH = MODEL_DIR / "pm25_model.pkl"
+COMPILED_PATH = MODEL_DIR / "pm25_compiled"
+LEADERBOARD_PATH = MODEL_DIR / "tuning_leaderboard.csv"
+METADATA_PATH = MODEL_DIR / "pm25_model.json"
 
-NUMERIC_FEATURES = ["TEMP", "DEWP", "PRES", "Iws", "Is", "Ir", "hour", "month"]
-CATEGORICAL_FEATURES = ["cbwd"]
 TARGET = "pm2.5"
 
 # --- Column normalization helpers ---
@@ -164,11 +189,16 @@ def try_direct_downloads():
 
     return None
 
-def fetch_or_load_full_dataset() -> pd.DataFrame:
+def fetch_or_load_full_dataset(use_cache=True) -> pd.DataFrame:
     # 0) Local CSV present?
     if DATA_PATH.exists():
         print(f"Using existing local CSV: {DATA_PATH}")
-        return normalize_columns(pd.read_csv(DATA_PATH))
+        return cached_frame(
+            DATA_PATH,
+            lambda: normalize_columns(pd.read_csv(DATA_PATH)),
+            CACHE_DIR,
+            use_cache=use_cache,
+        )
 
     # 1) UCI via library
     df = try_ucimlrepo()
@@ -202,22 +232,71 @@ def fetch_or_load_full_dataset() -> pd.DataFrame:
     sys.exit(1)
 
 # --- Training ---
-def main():
-    df = fetch_or_load_full_dataset()
-
-    required = ["TEMP", "DEWP", "PRES", "Iws", "Is", "Ir", "hour", "month", "cbwd", "pm2.5"]
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Train the PM2.5 regressor.")
+    ap.add_argument("--model", choices=sorted(model_registry.REGISTRY), default="rf",
+                    help="estimator engine (see model_registry.py)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="re-parse the CSV instead of using the cached dataset under data/cache/")
+    ap.add_argument("--stream", action="store_true",
+                    help="ingest the CSV in chunks into preallocated compact arrays (bounded memory)")
+    ap.add_argument("--data", type=Path, default=DATA_PATH,
+                    help="CSV to ingest in --stream mode (default: the bundled PRSA file)")
+    ap.add_argument("--chunksize", type=int, default=200_000,
+                    help="rows per chunk in --stream mode")
+    ap.add_argument("--tune", action="store_true",
+                    help="successive-halving search over forest hyperparameters; writes a leaderboard, no model")
+    ap.add_argument("--tune-candidates", type=int, default=27)
+    ap.add_argument("--tune-workers", type=int, default=None, help="process pool size (default: all CPUs)")
+    ap.add_argument("--latency-budget-ms", type=float, default=None,
+                    help="single-row predict budget used to flag leaderboard entries")
+    ap.add_argument("--time-features", action="store_true",
+                    help="add lagged pm2.5 and rolling weather features; split by time instead of at random")
+    ap.add_argument("--lags", type=features.parse_int_list, default=features.DEFAULT_LAGS,
+                    help="pm2.5 lags in hours, comma-separated (default: %(default)s)")
+    ap.add_argument("--windows", type=features.parse_int_list, default=features.DEFAULT_WINDOWS,
+                    help="rolling window lengths in hours, comma-separated (default: %(default)s)")
+    args = ap.parse_args(argv)
+    if args.time_features and args.stream:
+        ap.error("--time-features needs the whole series in time order; it cannot be combined with --stream")
+    return args
+
+def numeric_features(args):
+    if not args.time_features:
+        return NUMERIC_FEATURES
+    return NUMERIC_FEATURES + features.time_feature_names(args.lags, args.windows)
+
+def load_xy(args):
+    if args.stream:
+        if args.data == DATA_PATH and not DATA_PATH.exists():
+            fetch_or_load_full_dataset(use_cache=False)  # downloads the CSV
+        print(f"Streaming {args.data} in chunks of {args.chunksize:,} rows")
+        return stream_xy(args.data, normalize_columns, NUMERIC_FEATURES,
+                         CATEGORICAL_FEATURES, TARGET, chunksize=args.chunksize)
+
+    df = fetch_or_load_full_dataset(use_cache=not args.no_cache)
+
+    required = NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET]
     missing = [c for c in required if c not in df.columns]
     if missing:
         raise ValueError(f"Missing required columns after normalization: {missing}")
 
+    if args.time_features:
+        # Computed before dropna so lags/windows see the real hourly neighbours;
+        # rows without a full history (warm-up, gaps) are then dropped with the rest
+        df = features.add_time_features(df, lags=args.lags, windows=args.windows)
+        required = required + features.time_feature_names(args.lags, args.windows)
+
     df = df.dropna(subset=required).copy()
     df["hour"] = df["hour"].astype(int)
     df["month"] = df["month"].astype(int)
     df["pm2.5"] = df["pm2.5"].astype(float)
 
-    X = df[["TEMP","DEWP","PRES","Iws","Is","Ir","hour","month","cbwd"]]
+    X = df[numeric_features(args) + CATEGORICAL_FEATURES]
     y = df["pm2.5"]
+    return X, y
 
+def split_train_test(X, y):
     # Stratified split via quantile bins (best-effort)
     try:
         y_bins = pd.qcut(y, q=20, labels=False, duplicates="drop")
@@ -225,40 +304,104 @@ def main():
     except Exception:
         strat = None
 
-    X_train, X_test, y_train, y_test = train_test_split(
+    return train_test_split(
         X, y, test_size=0.25, random_state=42, stratify=strat
     )
 
-    pre = ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), ["TEMP","DEWP","PRES","Iws","Is","Ir","hour","month"]),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), ["cbwd"]),
-        ]
-    )
+def evaluate(pipe, X_test, y_test) -> dict:
+    y_pred = pipe.predict(X_test)
+    return {
+        "mae": float(mean_absolute_error(y_test, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "r2": float(r2_score(y_test, y_pred)),
+    }
 
-    model = RandomForestRegressor(
-        n_estimators=500,
-        random_state=42,
-        n_jobs=-1,
-        max_depth=None,
-        min_samples_leaf=2
-    )
+def save_model(pipe, engine, X_test, info: dict, numeric=NUMERIC_FEATURES):
+    """Pickle + (if supported) compiled arrays + metadata JSON, in that order."""
+    # Write-then-rename so a running app.py never reloads a half-written pickle
+    tmp_path = MODEL_PATH.with_suffix(".pkl.tmp")
+    joblib.dump(pipe, tmp_path)
+    os.replace(tmp_path, MODEL_PATH)
+    print(f"Saved model to {MODEL_PATH}")
 
-    pipe = Pipeline([("pre", pre), ("rf", model)])
+    compiled_ok = False
+    if model_registry.is_compilable(engine):
+        # Compiled inference arrays for app.py's single-row fast path
+        compiled = export_compiled(pipe, source_model_path=MODEL_PATH)
+        diff = check_parity(compiled, pipe, X_test.head(2000))
+        compiled.save(COMPILED_PATH)
+        compiled_ok = True
+        print(f"Saved compiled model to {COMPILED_PATH} "
+              f"({compiled.meta['n_nodes']:,} nodes, max |diff| vs pipeline = {diff:.2g})")
+    elif COMPILED_PATH.exists():
+        shutil.rmtree(COMPILED_PATH)  # belongs to a previous rf model
+
+    # Written last: app.py treats a model as complete once this matches the pickle
+    meta = {
+        "engine": engine,
+        "model": model_fingerprint(MODEL_PATH),
+        "compiled": compiled_ok,
+        "numeric_features": list(numeric),
+        "categorical_features": CATEGORICAL_FEATURES,
+        "target": TARGET,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+        **info,
+    }
+    tmp_meta = METADATA_PATH.with_suffix(".json.tmp")
+    tmp_meta.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp_meta, METADATA_PATH)
+    print(f"Saved metadata to {METADATA_PATH}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    numeric = numeric_features(args)
+    X, y = load_xy(args)
+    if args.time_features:
+        X_train, X_test, y_train, y_test = features.time_ordered_split(X, y)
+    else:
+        X_train, X_test, y_train, y_test = split_train_test(X, y)
+
+    if args.tune:
+        if args.model != "rf":
+            raise SystemExit("--tune searches RandomForest hyperparameters; use it with --model rf")
+        pre = model_registry.build("rf", numeric, CATEGORICAL_FEATURES).steps[0][1]
+        # Tune on a validation split carved from the training rows; the test split stays untouched
+        if args.time_features:
+            X_fit, X_val, y_fit, y_val = features.time_ordered_split(X_train, y_train, test_size=0.2)
+        else:
+            X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42)
+        board = successive_halving(pre, X_fit, y_fit, X_val, y_val,
+                                   n_candidates=args.tune_candidates, workers=args.tune_workers)
+        report(board, LEADERBOARD_PATH, latency_budget_ms=args.latency_budget_ms)
+        return
+
+    pipe = model_registry.build(args.model, numeric, CATEGORICAL_FEATURES)
+    t0 = time.perf_counter()
     pipe.fit(X_train, y_train)
+    fit_s = time.perf_counter() - t0
 
-    y_pred = pipe.predict(X_test)
-    mae = mean_absolute_error(y_test, y_pred)
-    rmse = mean_squared_error(y_test, y_pred, squared=False)
-    r2 = r2_score(y_test, y_pred)
+    metrics = evaluate(pipe, X_test, y_test)
 
-    print(f"Samples used: {len(df):,}")
-    print(f"MAE:  {mae:.2f} µg/m³")
-    print(f"RMSE: {rmse:.2f} µg/m³")
-    print(f"R²:   {r2:.3f}")
+    print(f"Model: {args.model} (fit {fit_s:.1f}s)")
+    print(f"Samples used: {len(X):,}")
+    print(f"MAE:  {metrics['mae']:.2f} µg/m³")
+    print(f"RMSE: {metrics['rmse']:.2f} µg/m³")
+    print(f"R²:   {metrics['r2']:.3f}")
 
-    joblib.dump(pipe, MODEL_PATH)
-    print(f"Saved model to {MODEL_PATH}")
+    info = {
+        "metrics": metrics,
+        "fit_seconds": round(fit_s, 2),
+        "samples": len(X),
+        "split": "time" if args.time_features else "stratified",
+    }
+    if args.time_features:
+        info["time_features"] = {
+            "lags": list(args.lags),
+            "windows": list(args.windows),
+            "columns": list(features.ROLLING_COLUMNS),
+        }
+    save_model(pipe, args.model, X_test, info, numeric=numeric)
 
 if __name__ == "__main__":
     main()
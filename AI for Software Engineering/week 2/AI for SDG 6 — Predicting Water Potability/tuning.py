@@ -0,0 +1,170 @@
+"""
+Successive-halving hyperparameter search for the PM2.5 RandomForest.
+
+    python train_model.py --tune [--tune-candidates 27] [--tune-workers 4]
+                                 [--latency-budget-ms 5]
+
+How it works:
+- The ColumnTransformer is fitted once on the training split; the transformed
+  train/validation matrices are placed in multiprocessing.shared_memory so
+  pool workers attach to the same pages instead of receiving pickled copies.
+- Candidates (forest size, depth, leaf size, max_features) are sampled from
+  SEARCH_SPACE. Rung 0 fits every candidate on a small random subset of the
+  training rows; only the best 1/eta (by validation RMSE) advance to the next
+  rung, which gets eta times more rows, until the survivors train on all rows.
+  Poor configurations are stopped early, at a fraction of the full cost.
+- Every trial records MAE/RMSE/R², fit time, single-row predict latency and
+  pickled model size; the leaderboard goes to models/tuning_leaderboard.csv.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+import math
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+SEARCH_SPACE = {
+    "n_estimators": [50, 100, 200, 300, 500],
+    "max_depth": [None, 12, 18, 25],
+    "min_samples_leaf": [1, 2, 4, 8],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+LATENCY_SAMPLES = 30     # single-row predicts timed per trial
+
+# Worker-side views onto the shared arrays (filled by _attach)
+_shared = {}
+
+
+# --- Shared memory plumbing ---
+def _to_shared(arrays: dict):
+    blocks, specs = [], {}
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        specs[name] = (shm.name, arr.shape, arr.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs):
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+
+
+def _array(name):
+    return _shared[name][1]
+
+
+# --- One trial (runs in a worker) ---
+def _run_trial(trial_id, params, n_rows, seed):
+    X, y = _array("X_train")[:n_rows], _array("y_train")[:n_rows]
+    X_val, y_val = _array("X_val"), _array("y_val")
+
+    est = RandomForestRegressor(random_state=seed, n_jobs=1, **params)
+    t0 = time.perf_counter()
+    est.fit(X, y)
+    fit_s = time.perf_counter() - t0
+
+    y_pred = est.predict(X_val)
+    lat = []
+    for i in range(min(LATENCY_SAMPLES, len(X_val))):
+        t0 = time.perf_counter()
+        est.predict(X_val[i:i + 1])
+        lat.append(time.perf_counter() - t0)
+
+    return {
+        "trial": trial_id,
+        **{k: params[k] for k in SEARCH_SPACE},
+        "train_rows": n_rows,
+        "mae": mean_absolute_error(y_val, y_pred),
+        "rmse": math.sqrt(mean_squared_error(y_val, y_pred)),
+        "r2": r2_score(y_val, y_pred),
+        "fit_s": fit_s,
+        "predict_ms_p50": 1000 * float(np.median(lat)),
+        "size_mb": len(pickle.dumps(est, protocol=pickle.HIGHEST_PROTOCOL)) / 1e6,
+    }
+
+
+# --- Search driver ---
+def sample_candidates(n, seed=42):
+    rng = np.random.default_rng(seed)
+    grid = [dict(zip(SEARCH_SPACE, combo)) for combo in product(*SEARCH_SPACE.values())]
+    idx = rng.choice(len(grid), size=min(n, len(grid)), replace=False)
+    return [grid[i] for i in idx]
+
+
+def successive_halving(pre, X_train, y_train, X_val, y_val, n_candidates=27, eta=3,
+                       min_rows=2000, workers=None, seed=42):
+    """Returns the leaderboard DataFrame (all trials, every rung)."""
+    pre = clone(pre).fit(X_train)
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(X_train))   # prefix subsets are random subsets
+    arrays = {
+        "X_train": np.asarray(pre.transform(X_train), dtype=np.float32)[order],
+        "y_train": np.asarray(y_train, dtype=np.float64)[order],
+        "X_val": np.asarray(pre.transform(X_val), dtype=np.float32),
+        "y_val": np.asarray(y_val, dtype=np.float64),
+    }
+    n_total = len(arrays["X_train"])
+    candidates = sample_candidates(n_candidates, seed)
+    n_rungs = max(1, math.ceil(math.log(len(candidates), eta)) + 1)
+    workers = workers or os.cpu_count() or 1
+
+    blocks, specs = _to_shared(arrays)
+    del arrays
+    rows = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as pool:
+            survivors = list(enumerate(candidates))
+            for rung in range(n_rungs):
+                n_rows = n_total if rung == n_rungs - 1 else min(n_total, min_rows * eta ** rung)
+                print(f"Rung {rung}: {len(survivors)} candidates x {n_rows:,} rows")
+                futures = [pool.submit(_run_trial, tid, params, n_rows, seed) for tid, params in survivors]
+                results = [f.result() for f in futures]
+                for r in results:
+                    r["rung"] = rung
+                rows.extend(results)
+                if rung == n_rungs - 1:
+                    break
+                keep = max(1, len(results) // eta)
+                best = sorted(results, key=lambda r: r["rmse"])[:keep]
+                survivors = [(r["trial"], candidates[r["trial"]]) for r in best]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    board = pd.DataFrame(rows)
+    board["max_depth"] = board["max_depth"].astype(object).where(board["max_depth"].notna(), None)
+    return board.sort_values(["rung", "rmse"], ascending=[False, True]).reset_index(drop=True)
+
+
+def report(board: pd.DataFrame, path, latency_budget_ms=None):
+    if latency_budget_ms is not None:
+        board["within_budget"] = board["predict_ms_p50"] <= latency_budget_ms
+    board.to_csv(path, index=False, float_format="%.4g")
+    print(f"Saved leaderboard ({len(board)} trials) to {path}")
+
+    final = board[board["rung"] == board["rung"].max()]
+    cols = list(SEARCH_SPACE) + ["mae", "rmse", "r2", "fit_s", "predict_ms_p50", "size_mb"]
+    print(final[cols].head(10).to_string(index=False, float_format=lambda v: f"{v:.3g}"))
+
+    if latency_budget_ms is not None:
+        ok = board[board["within_budget"]].sort_values(["rung", "rmse"], ascending=[False, True])
+        if ok.empty:
+            print(f"No trial met the {latency_budget_ms} ms single-row budget.")
+        else:
+            best = ok.iloc[0]
+            params = {k: (best[k].item() if hasattr(best[k], "item") else best[k]) for k in SEARCH_SPACE}
+            print(f"Best within {latency_budget_ms} ms (rung {best['rung']}): {params} "
+                  f"RMSE {best['rmse']:.2f}, p50 {best['predict_ms_p50']:.2f} ms")
@@ -0,0 +1,178 @@
+"""
+Throughput and correctness of clinic_booking under many simultaneous bookings, on SQLite.
+
+A database of --patients patients (with clinic_indexes.sql and clinic_booking.sql)
+is built once. Each run then books into an empty window (--days days from
+2026-06-01) of a few --doctors, so most attempts compete for the same slots.
+Each attempt asks for a random slot; if it is taken, the patient takes the
+next free one (one more attempt, as a booking page would offer).
+
+- engine:  clinic_booking.BookingService, --processes x --threads workers; each
+           process has its own service and schedules, so only the version check
+           in the database keeps processes apart
+- naive:   the same workload as "check with a SELECT, then INSERT", the way the
+           schema alone allows
+
+Each run reports attempts/s, bookings, taken slots, version-check retries and the
+double bookings left in the database (a self-join over the window), then deletes
+the window's appointments for the next run.
+
+Usage:
+    python bench_clinic_booking.py [--attempts 5000] [--processes 1 4] [--threads 8 32] [--db /tmp/clinic_booking.sqlite]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import clinic_loadgen
+from clinic_booking import DAY, BookingRetriesExhausted, BookingService, SlotTaken, from_minute, to_minute
+from clinic_dal import Clinic
+
+WINDOW = "2026-06-01"
+
+OVERLAPS_SQL = """
+    SELECT COUNT(*) FROM appointments a
+    JOIN appointments b ON b.doctor_id = a.doctor_id AND b.id > a.id
+        AND a.appointment_date < datetime(b.appointment_date, '+' || b.duration_minutes || ' minutes')
+        AND b.appointment_date < datetime(a.appointment_date, '+' || a.duration_minutes || ' minutes')
+    WHERE a.appointment_date >= ? AND b.appointment_date >= ?"""
+
+
+def workload(seed, n, doctors, days, patients):
+    """n (doctor, patient, start) attempts on the 30-minute grid of the window."""
+    rng = np.random.default_rng(seed)
+    first = to_minute(WINDOW + " 00:00:00")
+    starts = (first + DAY * rng.integers(0, days, n) + 8 * 60 + 30 * rng.integers(0, 20, n)).tolist()
+    return list(zip(rng.integers(1, doctors + 1, n).tolist(), rng.integers(1, patients + 1, n).tolist(), starts))
+
+
+class Naive:
+    """Check-then-insert with no coordination between the two statements."""
+
+    def __init__(self, clinic):
+        self.pool = clinic.pool
+        self.retries = 0
+
+    def book(self, doctor_id, patient_id, start):
+        begin, end = to_minute(start), to_minute(start) + 30
+        with self.pool.connection() as conn:
+            busy = conn.execute(
+                "SELECT 1 FROM appointments WHERE doctor_id = ? AND appointment_date > ? AND appointment_date < ?",
+                (doctor_id, from_minute(begin - 30), from_minute(end))).fetchone()
+        if busy:
+            raise SlotTaken(start)
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO appointments (doctor_id, patient_id, appointment_date, duration_minutes) "
+                         "VALUES (?, ?, ?, 30)", (doctor_id, patient_id, start))
+
+    def free_slots(self, doctor_id, after, n=1):
+        t = to_minute(after) + 30
+        while (t % DAY) + 30 > 18 * 60 or (t % DAY) < 8 * 60:
+            t = (t // DAY + 1) * DAY + 8 * 60
+        return [from_minute(t)]
+
+
+def worker(db, mode, threads, attempts, go, results):
+    clinic = Clinic.sqlite(db, pool_size=threads)
+    service = BookingService(clinic) if mode == "engine" else Naive(clinic)
+    counts = {"booked": 0, "taken": 0, "gave_up": 0, "attempts": 0}
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def attempt(job):
+        doctor, patient, start = job
+        start = from_minute(start)
+        for _ in range(2):                               # the slot asked for, then the next free one
+            count("attempts")
+            try:
+                service.book(doctor, patient, start)
+                count("booked")
+                return
+            except BookingRetriesExhausted:
+                count("gave_up")
+                return
+            except SlotTaken:
+                count("taken")
+                slots = service.free_slots(doctor, start, n=1)
+                if not slots:
+                    return
+                start = slots[0]
+
+    go.wait()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(attempt, attempts))
+    results.put({**counts, "retries": service.retries, "seconds": time.perf_counter() - t0})
+    clinic.close()
+
+
+def run(db, mode, processes, threads, jobs):
+    ctx = mp.get_context("spawn")
+    go, results = ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(db, mode, threads, jobs[i::processes], go, results))
+             for i in range(processes)]
+    for p in procs:
+        p.start()
+    time.sleep(1.0)                                      # let every process import and connect
+    go.set()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    total = {k: sum(r[k] for r in out) for k in ("booked", "taken", "gave_up", "attempts", "retries")}
+    total["seconds"] = max(r["seconds"] for r in out)
+    clinic = Clinic.sqlite(db)
+    with clinic.pool.connection() as conn:
+        total["double_booked"] = conn.execute(OVERLAPS_SQL, (WINDOW, WINDOW)).fetchone()[0]
+        conn.execute("DELETE FROM appointments WHERE appointment_date >= ?", (WINDOW,))
+    clinic.close()
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--attempts", type=int, default=5_000, help="booking requests per run")
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 4])
+    ap.add_argument("--threads", type=int, nargs="+", default=[8, 32], help="threads per process")
+    ap.add_argument("--doctors", type=int, default=10)
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--patients", type=int, default=20_000)
+    ap.add_argument("--db", default="/tmp/clinic_booking.sqlite")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    clinic = Clinic.sqlite(args.db)
+    clinic.create_schema()
+    clinic_loadgen.grow(clinic, args.patients)
+    clinic.create_indexes()
+    clinic.add_booking_columns()
+    n_appointments = clinic.appointments.count()
+    clinic.close()
+    jobs = workload(args.seed, args.attempts, args.doctors, args.days, args.patients)
+    slots = args.doctors * args.days * 20
+
+    print(f"{n_appointments:,} appointments loaded; {args.attempts:,} requests for {slots:,} free slots "
+          f"({args.doctors} doctors x {args.days} days), {os.cpu_count()} CPU(s)")
+    print(f"\n{'mode':<7}{'procs':>6}{'threads':>8}{'attempts/s':>12}{'booked':>8}{'taken':>8}"
+          f"{'retries':>9}{'gave up':>9}{'double-booked':>15}")
+    for mode in ("engine", "naive"):
+        for processes in args.processes:
+            for threads in args.threads:
+                r = run(args.db, mode, processes, threads, jobs)
+                print(f"{mode:<7}{processes:>6}{threads:>8}{r['attempts'] / r['seconds']:>12,.0f}{r['booked']:>8,}"
+                      f"{r['taken']:>8,}{r['retries']:>9,}{r['gave_up']:>9,}{r['double_booked']:>15,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Insert throughput and query latency of clinic_dal on SQLite as the tables grow.
+
+For each --appointments target (cumulative), the load generator grows a fresh
+database to that size (about 3 appointments per patient) and reports:
+- bulk load:   rows/s of clinic_loadgen.grow (add_many, executemany in batches)
+- row inserts: rows/s of 2,000 appointments via add() (one transaction each)
+               vs the same rows via add_many()
+- queries:     p50 / p95 latency of the repository lookups, over up to 200 calls
+               (or --budget seconds per query)
+
+The schema is clinic_db_schema.sql as written: appointments has no index on
+doctor_id or patient_id, so those lookups scan the table.
+
+Usage:
+    python bench_clinic_dal.py [--appointments 100000 1000000 3000000] [--db /tmp/clinic_bench.sqlite]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import clinic_loadgen
+from clinic_dal import Appointment, Clinic
+
+
+def latency(fn, args, budget):
+    times = []
+    start = time.perf_counter()
+    for a in args:
+        t0 = time.perf_counter()
+        fn(*a)
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - start > budget:
+            break
+    ms = np.array(times) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 95), len(ms)
+
+
+def row_inserts(clinic, n, rng):
+    doctors, patients = clinic.doctors.max_id(), clinic.patients.max_id()
+    rows = [Appointment(None, int(d), int(p), "2026-01-05 09:00:00", "Follow-up")
+            for d, p in zip(rng.integers(1, doctors + 1, n), rng.integers(1, patients + 1, n))]
+    t0 = time.perf_counter()
+    for row in rows:
+        clinic.appointments.add(row)
+    single = n / (time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    clinic.appointments.add_many(rows)
+    bulk = n / (time.perf_counter() - t0)
+    return single, bulk
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--appointments", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    ap.add_argument("--db", default="/tmp/clinic_bench.sqlite")
+    ap.add_argument("--budget", type=float, default=3.0, help="max seconds per query type")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    clinic = Clinic.sqlite(args.db)
+    clinic.create_schema()
+    rng = np.random.default_rng(args.seed)
+    loads, inserts, queries = [], [], []
+
+    for target in args.appointments:
+        missing = target - clinic.appointments.count()
+        if missing > 0:
+            t0 = time.perf_counter()
+            added = clinic_loadgen.grow(clinic, missing // 3)
+            secs = time.perf_counter() - t0
+            loads.append((target, sum(added.values()), secs))
+        n_appointments = clinic.appointments.count()
+        inserts.append((n_appointments, *row_inserts(clinic, 2_000, rng)))
+
+        patients, doctors = clinic.patients.max_id(), clinic.doctors.max_id()
+        p_ids = rng.integers(1, patients + 1, 200).tolist()
+        days = clinic_loadgen.FIRST_DAY + rng.integers(0, clinic_loadgen.DAYS, 200).astype("timedelta64[D]")
+        day_windows = [(int(d), str(day), str(day + 1))
+                       for d, day in zip(rng.integers(1, doctors + 1, 200), days)]
+        rx_ids = rng.integers(1, clinic.prescriptions.max_id() + 1, 200).tolist()
+        emails = [clinic.patients.get(i).email for i in p_ids[:50]]
+        cases = [
+            ("patients.get", clinic.patients.get, [(i,) for i in p_ids]),
+            ("patients.by_email", clinic.patients.by_email, [(e,) for e in emails]),
+            ("appointments.for_patient", clinic.appointments.for_patient, [(i,) for i in p_ids]),
+            ("appointments.for_doctor (1 day)", clinic.appointments.for_doctor, day_windows),
+            ("medications_for(prescription)", clinic.prescription_medications.medications_for, [(i,) for i in rx_ids]),
+        ]
+        for name, fn, calls in cases:
+            queries.append((n_appointments, name, *latency(fn, calls, args.budget)))
+
+    print(f"\n{'appointments':>12}  {'rows loaded':>12}{'seconds':>9}{'rows/s':>10}")
+    for target, rows, secs in loads:
+        print(f"{target:>12,}  {rows:>12,}{secs:>9.1f}{rows / secs:>10,.0f}")
+    print(f"\n{'appointments':>12}  {'add() rows/s':>13}{'add_many() rows/s':>19}")
+    for n, single, bulk in inserts:
+        print(f"{n:>12,}  {single:>13,.0f}{bulk:>19,.0f}")
+    print(f"\n{'appointments':>12}  {'query':<34}{'p50 ms':>9}{'p95 ms':>9}{'calls':>7}")
+    for n, name, p50, p95, calls in queries:
+        print(f"{n:>12,}  {name:<34}{p50:>9.3f}{p95:>9.3f}{calls:>7}")
+    clinic.close()
+
+
+if __name__ == "__main__":
+    main()
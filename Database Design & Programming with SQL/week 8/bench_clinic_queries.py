@@ -0,0 +1,133 @@
+"""
+EXPLAIN plans and latency of the canonical clinic queries, before and after
+clinic_indexes.sql, on SQLite.
+
+For each --appointments size (cumulative), the database is grown with
+clinic_loadgen and then, for each query in clinic_queries:
+- before:   the plan and p50/p95 latency on the schema as written
+- index:    time to run clinic_indexes.sql on the data already loaded
+- after:    the plan and p50/p95 latency with the indexes
+- writes:   bulk load rows/s of 10,000 more patients (~60,000 rows) with the
+            indexes, then (after dropping them) without: the cost the indexes add
+            to every insert
+The next size is loaded without the indexes. Each query runs up to 100 times
+with random parameters, or for --budget seconds (at least once). Plans and numbers are also written to --out as JSON.
+
+Usage:
+    python bench_clinic_queries.py [--appointments 10000 1000000 10000000] [--db /tmp/clinic_queries.sqlite]
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import clinic_loadgen
+import clinic_queries
+from clinic_dal import INDEXES_SQL, Clinic
+
+
+def index_names():
+    return re.findall(r"CREATE INDEX (\w+)", INDEXES_SQL.read_text())
+
+
+def drop_indexes(clinic):
+    with clinic.pool.connection() as conn:
+        for name in index_names():
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def query_params(clinic, rng, n=100):
+    doctors, patients = clinic.doctors.max_id(), clinic.patients.max_id()
+    first = date(2020, 1, 1)
+    days = [first + timedelta(days=int(d)) for d in rng.integers(0, clinic_loadgen.DAYS, n)]
+    months = [date(2020 + int(m) // 12, int(m) % 12 + 1, 1) for m in rng.integers(0, 72, n)]
+    return {
+        "daily_schedule": [clinic_queries.schedule_params(int(d), day)
+                           for d, day in zip(rng.integers(1, doctors + 1, n), days)],
+        "patient_history": [(int(p),) for p in rng.integers(1, patients + 1, n)],
+        "busiest_doctors": [(m, (m + timedelta(days=31)).replace(day=1), 3) for m in months],
+    }
+
+
+def measure(clinic, params, budget):
+    out = {}
+    for name, calls in params.items():
+        times, start = [], time.perf_counter()
+        for p in calls:
+            t0 = time.perf_counter()
+            clinic_queries.run(clinic, name, p)
+            times.append(time.perf_counter() - t0)
+            if time.perf_counter() - start > budget:
+                break
+        ms = np.array(times) * 1000
+        out[name] = {"p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+                     "calls": len(ms), "plan": clinic_queries.explain(clinic, name, calls[0])}
+    return out
+
+
+def load_rate(clinic, patients=10_000):
+    t0 = time.perf_counter()
+    rows = sum(clinic_loadgen.grow(clinic, patients).values())
+    return rows / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--appointments", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    ap.add_argument("--db", default="/tmp/clinic_queries.sqlite")
+    ap.add_argument("--budget", type=float, default=5.0, help="max seconds per query and phase")
+    ap.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "clinic_query_bench.json"))
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    clinic = Clinic.sqlite(args.db)
+    clinic.create_schema()
+    rng = np.random.default_rng(args.seed)
+    results = []
+
+    for target in args.appointments:
+        missing = target - clinic.appointments.count()
+        if missing > 0:
+            clinic_loadgen.grow(clinic, max(missing // 3, 1))
+        n = clinic.appointments.count()
+        params = query_params(clinic, rng)
+        before = measure(clinic, params, args.budget)
+        t0 = time.perf_counter()
+        clinic.create_indexes()
+        index_secs = time.perf_counter() - t0
+        after = measure(clinic, params, args.budget)
+        rate_with = load_rate(clinic)   # after the queries, which see the same rows in both phases
+        drop_indexes(clinic)
+        rate_without = load_rate(clinic)
+        results.append({"appointments": n, "index_seconds": index_secs, "load_rows_per_s":
+                        {"without_indexes": rate_without, "with_indexes": rate_with},
+                        "before": before, "after": after})
+
+        print(f"\n=== {n:,} appointments: indexes built in {index_secs:.1f} s; "
+              f"bulk load {rate_without:,.0f} rows/s without, {rate_with:,.0f} with ===")
+        print(f"{'query':<18}{'before p50':>12}{'p95':>10}{'after p50':>12}{'p95':>10}{'speedup':>9}")
+        for name in params:
+            b, a = before[name], after[name]
+            print(f"{name:<18}{b['p50_ms']:>10.2f}ms{b['p95_ms']:>8.2f}ms{a['p50_ms']:>10.3f}ms"
+                  f"{a['p95_ms']:>8.3f}ms{b['p50_ms'] / a['p50_ms']:>8.0f}x")
+        for name in params:
+            print(f"\n{name}, before:\n    " + "\n    ".join(before[name]["plan"]))
+            print(f"{name}, after:\n    " + "\n    ".join(after[name]["plan"]))
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nPlans and timings written to {args.out}")
+    clinic.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Booking engine: no double-booked doctors
+
+BookingService keeps, for each doctor it has seen, a DoctorSchedule: the busy
+time as two sorted lists (block starts and ends, in minutes). Overlapping
+appointments already in the database are merged into one block, so the blocks
+never overlap and the ends are sorted as well. Both questions a booking asks are
+a bisect:
+- conflicts(start, end): only the block just before start and the block just
+  after it can overlap, O(log n).
+- free_slots(after, n): bisect to after, then step over the blocks in the way.
+  That is O(log n) per slot returned, within opening hours on the slot grid.
+
+The schedule in memory may be stale: another process, or another service
+object, may have booked since it was loaded. So the database decides, with an
+optimistic check (clinic_booking.sql adds the columns):
+  1. check the slot against the in-memory schedule and note its version
+  2. in one transaction: UPDATE doctors SET schedule_version = version + 1
+     WHERE id = ? AND schedule_version = <noted version>, then INSERT the
+     appointment
+  3. if the UPDATE matched no row, someone else booked this doctor first:
+     reload the doctor's schedule from the database and start again
+No database locks are held between the check and the write. Two bookings can
+only both commit if they read different versions, so one of them saw the
+other's appointment. Within one process, bookings for the same doctor also
+take turns on a lock, so only other processes ever cause a retry.
+
+The guarantee covers every insert that bumps the version: bookings, and
+clinic_dal's AppointmentRepository.add/add_many once the columns exist.
+Appointments written with plain SQL (or moved by an UPDATE) do not bump it, so
+a service that already loaded that doctor will not see them. conflicts() and
+free_slots() answer from the loaded schedule and can be stale in the same way;
+book() is the one that checks against the database.
+
+    service = BookingService(clinic)
+    service.free_slots(doctor_id, "2026-06-01 08:00", n=5)
+    appointment_id = service.book(doctor_id, patient_id, "2026-06-01 09:30")   # or SlotTaken
+"""
+
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from clinic_dal import sql_value
+
+EPOCH = datetime(1970, 1, 1)
+SLOT_MINUTES = 30
+OPEN_MINUTE, CLOSE_MINUTE = 8 * 60, 18 * 60          # 08:00 to 18:00
+DAY = 24 * 60
+
+
+class SlotTaken(Exception):
+    pass
+
+
+class BookingRetriesExhausted(Exception):
+    pass
+
+
+def to_minute(value) -> int:
+    """Minutes since 1970-01-01 of a datetime or an ISO string ('2026-06-01 09:30:00')."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - EPOCH) // timedelta(minutes=1)
+
+
+def from_minute(minute) -> str:
+    return sql_value(EPOCH + timedelta(minutes=minute))
+
+
+class DoctorSchedule:
+    """Busy blocks of one doctor as sorted, non-overlapping [start, end) minutes."""
+    __slots__ = ("starts", "ends", "version", "lock", "booking")
+
+    def __init__(self, version=0):
+        self.starts = []
+        self.ends = []
+        self.version = version
+        self.lock = threading.Lock()          # guards the lists; held only in memory
+        self.booking = threading.Lock()       # one booking at a time per doctor in this process
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_intervals(cls, intervals, version=0):
+        """intervals sorted by start; overlapping ones (double bookings in old data) are merged."""
+        schedule = cls(version)
+        for start, end in intervals:
+            if schedule.ends and start <= schedule.ends[-1]:
+                schedule.ends[-1] = max(schedule.ends[-1], end)
+            else:
+                schedule.starts.append(start)
+                schedule.ends.append(end)
+        return schedule
+
+    def conflicts(self, start, end) -> bool:
+        i = bisect_right(self.starts, start)
+        return (i > 0 and self.ends[i - 1] > start) or (i < len(self.starts) and self.starts[i] < end)
+
+    def add(self, start, end):
+        """Marks [start, end) busy, merging with the blocks it touches."""
+        i = bisect_right(self.starts, start)
+        j = i
+        if i > 0 and self.ends[i - 1] >= start:
+            i -= 1
+            start = self.starts[i]
+        while j < len(self.starts) and self.starts[j] <= end:
+            j += 1
+        if j > i:
+            end = max(end, self.ends[j - 1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+    def free_slots(self, after, duration, n, step=SLOT_MINUTES, open_minute=OPEN_MINUTE,
+                   close_minute=CLOSE_MINUTE, horizon_days=366) -> list:
+        """Start minutes of the next n free starts for `duration`, on the `step` grid, within opening hours.
+        A duration longer than the step gives overlapping candidates (09:00, 09:30, ...) to pick one from."""
+        slots = []
+        t = -(-after // step) * step                    # round up to the grid
+        limit = after + horizon_days * DAY
+        while len(slots) < n and t < limit:
+            day, minute = divmod(t, DAY)
+            if minute < open_minute:
+                t = day * DAY + open_minute
+                continue
+            if minute + duration > close_minute:
+                t = (day + 1) * DAY + open_minute
+                continue
+            i = bisect_right(self.starts, t)
+            if i > 0 and self.ends[i - 1] > t:             # t is inside a busy block
+                t = -(-self.ends[i - 1] // step) * step
+            elif i < len(self.starts) and self.starts[i] < t + duration:   # the next block starts too soon
+                t = -(-self.ends[i] // step) * step
+            else:
+                slots.append(t)
+                t += step                                  # every grid start is a candidate
+        return slots
+
+
+class BookingService:
+    def __init__(self, clinic, slot_minutes=SLOT_MINUTES, open_minute=OPEN_MINUTE,
+                 close_minute=CLOSE_MINUTE, max_retries=10):
+        self.clinic = clinic
+        self.pool = clinic.pool
+        self.backend = clinic.pool.backend
+        self.slot_minutes = slot_minutes
+        self.open_minute, self.close_minute = open_minute, close_minute
+        self.max_retries = max_retries
+        self.retries = 0                                 # optimistic checks that lost, for monitoring
+        self._schedules = {}
+        self._lock = threading.Lock()
+        if not clinic.has_booking_columns():
+            clinic.add_booking_columns()
+        sql = self.backend.sql
+        self._select_busy = sql("SELECT appointment_date, duration_minutes FROM appointments "
+                                "WHERE doctor_id = ? ORDER BY appointment_date")
+        self._select_version = sql("SELECT schedule_version FROM doctors WHERE id = ?")
+        self._bump_version = sql("UPDATE doctors SET schedule_version = schedule_version + 1 "
+                                 "WHERE id = ? AND schedule_version = ?")
+        self._insert = sql("INSERT INTO appointments (doctor_id, patient_id, appointment_date, reason, "
+                           "duration_minutes) VALUES (?, ?, ?, ?, ?)")
+
+    # --- Schedules ---
+    def _load(self, doctor_id) -> DoctorSchedule:
+        # The version is read before the rows. sqlite3 runs the two SELECTs as separate
+        # snapshots, so a booking may commit in between. Its row may then be loaded with
+        # the older version, and the next book() fails the version check and reloads.
+        # Reading the rows first could pair a newer version with rows missing a booking.
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn, prepared=True)
+            cur.execute(self._select_version, (doctor_id,))
+            row = cur.fetchone()
+            if row is None:
+                raise KeyError(f"No doctor with id {doctor_id}")
+            cur.execute(self._select_busy, (doctor_id,))
+            rows = cur.fetchall()
+        intervals = ((start, start + duration) for start, duration in
+                     ((to_minute(sql_value(d)), duration) for d, duration in rows))
+        return DoctorSchedule.from_intervals(intervals, row[0])
+
+    def schedule(self, doctor_id, reload=False) -> DoctorSchedule:
+        """The doctor's schedule, loaded once per service; reload=True re-reads it in place."""
+        with self._lock:
+            schedule = self._schedules.get(doctor_id)
+            if schedule is None:
+                schedule = self._schedules[doctor_id] = self._load(doctor_id)
+                return schedule
+        if reload:
+            fresh = self._load(doctor_id)
+            with schedule.lock:
+                schedule.starts, schedule.ends, schedule.version = fresh.starts, fresh.ends, fresh.version
+        return schedule
+
+    def _duration(self, duration) -> int:
+        if duration is None:
+            return self.slot_minutes
+        if duration <= 0:
+            raise ValueError(f"Duration must be a positive number of minutes, not {duration}")
+        return duration
+
+    def _interval(self, start, duration):
+        start = to_minute(start)
+        duration = self._duration(duration)
+        minute = start % DAY
+        if minute < self.open_minute or minute + duration > self.close_minute:
+            raise ValueError(f"{from_minute(start)} + {duration} min is outside opening hours")
+        return start, start + duration
+
+    # --- Queries ---
+    def conflicts(self, doctor_id, start, duration=None) -> bool:
+        start, end = self._interval(start, duration)
+        schedule = self.schedule(doctor_id)
+        with schedule.lock:
+            return schedule.conflicts(start, end)
+
+    def free_slots(self, doctor_id, after, n=5, duration=None) -> list:
+        schedule = self.schedule(doctor_id)
+        with schedule.lock:
+            slots = schedule.free_slots(to_minute(after), self._duration(duration), n,
+                                        self.slot_minutes, self.open_minute, self.close_minute)
+        return [from_minute(s) for s in slots]
+
+    # --- Booking ---
+    def book(self, doctor_id, patient_id, start, duration=None, reason=None) -> int:
+        """Books the slot and returns the appointment id; raises SlotTaken if it overlaps a booking."""
+        start, end = self._interval(start, duration)
+        schedule = self.schedule(doctor_id)
+        for _ in range(self.max_retries):
+            # Threads of this process take turns per doctor, so they never fail each
+            # other's version check; the check only catches other processes
+            with schedule.booking:
+                with schedule.lock:
+                    if schedule.conflicts(start, end):
+                        raise SlotTaken(f"Doctor {doctor_id} is busy at {from_minute(start)}")
+                    version = schedule.version
+                with self.pool.connection() as conn:
+                    cur = self.backend.cursor(conn, prepared=True)
+                    cur.execute(self._bump_version, (doctor_id, version))
+                    if cur.rowcount == 1:
+                        cur.execute(self._insert, (doctor_id, patient_id, from_minute(start), reason, end - start))
+                        appointment_id = cur.lastrowid
+                    else:
+                        appointment_id = None
+                if appointment_id is not None:
+                    with schedule.lock:
+                        schedule.add(start, end)
+                        schedule.version = max(schedule.version, version + 1)
+                    return appointment_id
+                self.schedule(doctor_id, reload=True)     # someone else booked this doctor: re-read
+            with self._lock:
+                self.retries += 1
+        raise BookingRetriesExhausted(f"Doctor {doctor_id}: schedule kept changing, {self.max_retries} attempts")
@@ -0,0 +1,12 @@
+-- Clinic Booking System: appointment durations and booking versions (migration 2)
+-- Run after clinic_db_schema.sql and clinic_indexes.sql:
+--   mysql -u youruser -p clinicB_db < clinic_booking.sql
+-- (clinic_booking.BookingService runs it itself when the columns are missing.)
+
+-- How long each appointment lasts; existing rows get the standard 30-minute slot
+ALTER TABLE appointments ADD COLUMN duration_minutes INT NOT NULL DEFAULT 30;
+
+-- Bumped by every booking for the doctor. A booking only commits if the version
+-- it read is still current (compare-and-swap), so two clients cannot both book
+-- against the same view of a doctor's schedule.
+ALTER TABLE doctors ADD COLUMN schedule_version INT NOT NULL DEFAULT 0;
@@ -0,0 +1,457 @@
+"""
+Data-access layer for the clinic schema (clinic_db_schema.sql)
+
+- Backends: MySQLBackend runs the schema as written (needs mysql-connector-python).
+  SQLiteBackend is the local stand-in: it translates the same schema file
+  (AUTO_INCREMENT ids become INTEGER PRIMARY KEY) and needs nothing beyond the
+  standard library. Repositories write SQL once with ? placeholders, and the
+  backend adapts them.
+- ConnectionPool hands out a fixed number of reusable connections. Each
+  `with pool.connection() as conn` block is one transaction: it commits on
+  success and rolls back on an exception.
+- Every statement is parameterized and its text is built once per repository.
+  SQLite caches the compiled statements. On MySQL, single-row statements use
+  prepared cursors.
+- add_many() loads rows with executemany in batches. A batch is one transaction,
+  not one commit per row.
+
+    clinic = Clinic(ConnectionPool(SQLiteBackend("clinic.sqlite")))
+    clinic.create_schema()
+    clinic.load_mock_data()
+    clinic.appointments.for_doctor(1, "2025-08-20", "2025-08-23")
+"""
+
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+HERE = Path(__file__).resolve().parent
+SCHEMA_SQL = HERE / "clinic_db_schema.sql"
+MOCK_DATA_SQL = HERE / "clinic_db_schema-mock_data.sql"
+INDEXES_SQL = HERE / "clinic_indexes.sql"
+BOOKING_SQL = HERE / "clinic_booking.sql"
+
+
+# --- Rows ---
+class Specialization(NamedTuple):
+    id: Optional[int]
+    name: str
+
+
+class Doctor(NamedTuple):
+    id: Optional[int]
+    first_name: str
+    last_name: str
+    email: str
+    specialization_id: Optional[int]
+
+
+class Patient(NamedTuple):
+    id: Optional[int]
+    first_name: str
+    last_name: str
+    date_of_birth: str
+    phone: Optional[str]
+    email: Optional[str]
+
+
+class Appointment(NamedTuple):
+    id: Optional[int]
+    doctor_id: int
+    patient_id: int
+    appointment_date: str
+    reason: Optional[str]
+
+
+class Prescription(NamedTuple):
+    id: Optional[int]
+    appointment_id: int
+    notes: Optional[str]
+
+
+class Medication(NamedTuple):
+    id: Optional[int]
+    name: str
+    dosage: Optional[str]
+
+
+class PrescriptionMedication(NamedTuple):
+    prescription_id: int
+    medication_id: int
+
+
+def sql_value(value):
+    """Dates as the strings both backends compare correctly ('2025-08-20 10:30:00')."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def split_statements(script):
+    """Statements of a SQL script, without comments (the schema files have no ';' in strings)."""
+    script = re.sub(r"/\*.*?\*/", "", script, flags=re.S)
+    script = re.sub(r"--[^\n]*", "", script)
+    return [s.strip() for s in script.split(";") if s.strip()]
+
+
+# --- Backends ---
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path="clinic.sqlite"):
+        if str(path) == ":memory:":
+            raise ValueError("Each pooled connection would get its own :memory: database; use a file")
+        self.path = str(path)
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def sql(self, statement):
+        return statement
+
+    def cursor(self, conn, prepared=False):
+        return conn.cursor()   # sqlite3 caches compiled statements per connection
+
+    def translate_ddl(self, statement):
+        """The MySQL schema statement in SQLite's dialect, or None if it has no equivalent."""
+        if re.match(r"(CREATE DATABASE|USE)\b", statement, re.I):
+            return None
+        return re.sub(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", "INTEGER PRIMARY KEY", statement, flags=re.I)
+
+    def table_names(self, cur):
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {r[0] for r in cur.fetchall()}
+
+    def column_names(self, cur, table):
+        cur.execute(f"PRAGMA table_info({table})")
+        return {r[1] for r in cur.fetchall()}
+
+    explain = "EXPLAIN QUERY PLAN "
+
+    def plan_lines(self, rows):
+        """EXPLAIN QUERY PLAN rows (id, parent, _, detail) as an indented tree."""
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return lines
+
+
+class MySQLBackend:
+    name = "mysql"
+
+    def __init__(self, **connect_kwargs):
+        try:
+            import mysql.connector
+        except ImportError as e:
+            raise ImportError("MySQLBackend needs mysql-connector-python: pip install mysql-connector-python") from e
+        self._connector = mysql.connector
+        self.connect_kwargs = connect_kwargs
+
+    def connect(self):
+        return self._connector.connect(autocommit=False, **self.connect_kwargs)
+
+    def sql(self, statement):
+        return statement.replace("?", "%s")
+
+    def cursor(self, conn, prepared=False):
+        # executemany on a plain cursor is rewritten into multi-row INSERTs, so only
+        # single-row statements use server-side prepared statements
+        return conn.cursor(prepared=prepared)
+
+    def translate_ddl(self, statement):
+        return statement
+
+    def table_names(self, cur):
+        cur.execute("SHOW TABLES")
+        return {r[0] for r in cur.fetchall()}
+
+    def column_names(self, cur, table):
+        cur.execute(f"SHOW COLUMNS FROM {table}")
+        return {r[0] for r in cur.fetchall()}
+
+    explain = "EXPLAIN "
+
+    def plan_lines(self, rows):
+        return [" | ".join("" if v is None else str(v) for v in row) for row in rows]
+
+
+# --- Connection pool ---
+class ConnectionPool:
+    def __init__(self, backend, size=4, timeout=30):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self.backend.connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free connection in the pool of {self.size} after {self.timeout} s") from None
+
+    @contextmanager
+    def connection(self):
+        """A pooled connection for one transaction: committed on success, rolled back on error."""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
+
+# --- Repositories ---
+class Repository:
+    table = None
+    row = None
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self.backend = pool.backend
+        fields = self.row._fields
+        auto = [f for f in fields if f != "id"]
+        self._insert = self._sql(f"INSERT INTO {self.table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})")
+        self._insert_auto = self._sql(f"INSERT INTO {self.table} ({', '.join(auto)}) VALUES ({', '.join('?' * len(auto))})")
+        self._select = f"SELECT {', '.join(fields)} FROM {self.table}"
+
+    def _sql(self, statement):
+        return self.backend.sql(statement)
+
+    def _query(self, where="", params=()) -> list:
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn, prepared=True)
+            cur.execute(self._sql(f"{self._select} {where}"), [sql_value(p) for p in params])
+            rows = cur.fetchall()
+        return [self.row(*r) for r in rows]
+
+    def _values(self, row, with_id):
+        values = [sql_value(v) for v in row]
+        return values if with_id else values[1:]
+
+    def add(self, row) -> Optional[int]:
+        """Inserts one row; returns its id (generated when row.id is None)."""
+        with_id = "id" not in self.row._fields or row.id is not None
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn, prepared=True)
+            cur.execute(self._insert if with_id else self._insert_auto, self._values(row, with_id))
+            row_id = cur.lastrowid if "id" in self.row._fields else None
+            self._after_insert(conn, [row])
+            return row_id
+
+    def add_many(self, rows, batch_size=10_000) -> int:
+        """
+        Bulk insert with executemany, one transaction per batch. Rows either all have
+        ids (kept, so generated data can refer to them) or all have id None.
+        """
+        total, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                total += self._add_batch(batch)
+                batch = []
+        if batch:
+            total += self._add_batch(batch)
+        return total
+
+    def _add_batch(self, batch):
+        with_id = "id" not in self.row._fields or batch[0].id is not None
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn)
+            cur.executemany(self._insert if with_id else self._insert_auto,
+                            [self._values(r, with_id) for r in batch])
+            self._after_insert(conn, batch)
+        return len(batch)
+
+    def _after_insert(self, conn, rows):
+        """Hook run in the inserting transaction."""
+
+    def get(self, id):
+        rows = self._query("WHERE id = ?", (id,))
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn)
+            cur.execute(f"SELECT COUNT(*) FROM {self.table}")
+            return cur.fetchone()[0]
+
+    def max_id(self) -> int:
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn)
+            cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.table}")
+            return cur.fetchone()[0]
+
+
+class SpecializationRepository(Repository):
+    table, row = "specializations", Specialization
+
+
+class DoctorRepository(Repository):
+    table, row = "doctors", Doctor
+
+    def by_specialization(self, specialization_id) -> list:
+        return self._query("WHERE specialization_id = ? ORDER BY last_name, first_name", (specialization_id,))
+
+
+class PatientRepository(Repository):
+    table, row = "patients", Patient
+
+    def by_email(self, email) -> Optional[Patient]:
+        rows = self._query("WHERE email = ?", (email,))
+        return rows[0] if rows else None
+
+
+class AppointmentRepository(Repository):
+    table, row = "appointments", Appointment
+
+    def __init__(self, pool: ConnectionPool):
+        super().__init__(pool)
+        self._versioned = False
+        self._bump_version = self._sql("UPDATE doctors SET schedule_version = schedule_version + 1 WHERE id = ?")
+
+    def _after_insert(self, conn, rows):
+        # Once clinic_booking.sql has run, every insert bumps its doctors' schedule_version,
+        # so a BookingService that loaded the schedule earlier re-reads it before booking
+        cur = self.backend.cursor(conn)
+        if not self._versioned:      # checked until the columns appear; Clinic.run_script() resets it
+            self._versioned = "schedule_version" in self.backend.column_names(cur, "doctors")
+        if self._versioned:
+            cur.executemany(self._bump_version, [(d,) for d in sorted({r.doctor_id for r in rows})])
+
+    def for_doctor(self, doctor_id, start, end) -> list:
+        """A doctor's appointments with start <= appointment_date < end, by time."""
+        return self._query("WHERE doctor_id = ? AND appointment_date >= ? AND appointment_date < ? "
+                           "ORDER BY appointment_date", (doctor_id, start, end))
+
+    def for_patient(self, patient_id) -> list:
+        return self._query("WHERE patient_id = ? ORDER BY appointment_date", (patient_id,))
+
+
+class PrescriptionRepository(Repository):
+    table, row = "prescriptions", Prescription
+
+    def for_appointment(self, appointment_id) -> list:
+        return self._query("WHERE appointment_id = ?", (appointment_id,))
+
+
+class MedicationRepository(Repository):
+    table, row = "medications", Medication
+
+
+class PrescriptionMedicationRepository(Repository):
+    table, row = "prescription_medications", PrescriptionMedication
+
+    def get(self, id):
+        raise TypeError("prescription_medications has a composite key; use medications_for()")
+
+    def max_id(self):
+        raise TypeError("prescription_medications has no id column")
+
+    def medications_for(self, prescription_id) -> list:
+        with self.pool.connection() as conn:
+            cur = self.backend.cursor(conn, prepared=True)
+            cur.execute(self._sql("SELECT m.id, m.name, m.dosage FROM prescription_medications pm "
+                                  "JOIN medications m ON m.id = pm.medication_id "
+                                  "WHERE pm.prescription_id = ? ORDER BY m.name"), (prescription_id,))
+            rows = cur.fetchall()
+        return [Medication(*r) for r in rows]
+
+
+class Clinic:
+    """One repository per table, sharing a pool."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self.specializations = SpecializationRepository(pool)
+        self.doctors = DoctorRepository(pool)
+        self.patients = PatientRepository(pool)
+        self.appointments = AppointmentRepository(pool)
+        self.prescriptions = PrescriptionRepository(pool)
+        self.medications = MedicationRepository(pool)
+        self.prescription_medications = PrescriptionMedicationRepository(pool)
+
+    @classmethod
+    def sqlite(cls, path="clinic.sqlite", pool_size=4):
+        return cls(ConnectionPool(SQLiteBackend(path), pool_size))
+
+    def run_script(self, path):
+        """Runs a SQL file (the schema or data scripts) in the backend's dialect, as one transaction."""
+        backend = self.pool.backend
+        with self.pool.connection() as conn:
+            cur = backend.cursor(conn)
+            for statement in split_statements(Path(path).read_text()):
+                statement = backend.translate_ddl(statement)
+                if statement:
+                    cur.execute(statement)
+        # A script may drop or add the booking columns (create_schema drops them): look again
+        self.appointments._versioned = False
+
+    def has_schema(self) -> bool:
+        with self.pool.connection() as conn:
+            return "appointments" in self.pool.backend.table_names(self.pool.backend.cursor(conn))
+
+    def create_schema(self):
+        """Drops and creates every table, from clinic_db_schema.sql."""
+        self.run_script(SCHEMA_SQL)
+
+    def create_indexes(self):
+        """Adds the appointment lookup indexes, from clinic_indexes.sql."""
+        self.run_script(INDEXES_SQL)
+
+    def has_booking_columns(self) -> bool:
+        with self.pool.connection() as conn:
+            return "duration_minutes" in self.pool.backend.column_names(self.pool.backend.cursor(conn), "appointments")
+
+    def add_booking_columns(self):
+        """Adds appointments.duration_minutes and doctors.schedule_version, from clinic_booking.sql."""
+        self.run_script(BOOKING_SQL)
+
+    def load_mock_data(self):
+        self.run_script(MOCK_DATA_SQL)
+
+    def close(self):
+        self.pool.close()
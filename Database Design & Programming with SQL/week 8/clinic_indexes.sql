@@ -0,0 +1,23 @@
+-- Clinic Booking System: indexes for the appointment lookups (migration 1)
+-- Run after clinic_db_schema.sql:
+--   mysql -u youruser -p clinicB_db < clinic_indexes.sql
+-- (clinic_dal.Clinic.create_indexes() runs the same file on SQLite.)
+
+-- Doctor's schedule for a day: equality on doctor_id, range on appointment_date,
+-- rows come back already in time order
+CREATE INDEX idx_appointments_doctor_date ON appointments (doctor_id, appointment_date);
+
+-- Patient history: every appointment of one patient, in time order
+CREATE INDEX idx_appointments_patient_date ON appointments (patient_id, appointment_date);
+
+-- Busiest doctors in a period: a date range, counted per doctor (covering, no table reads)
+CREATE INDEX idx_appointments_date_doctor ON appointments (appointment_date, doctor_id);
+
+-- Prescriptions of an appointment (patient history joins through it)
+CREATE INDEX idx_prescriptions_appointment ON prescriptions (appointment_id);
+
+-- Undo (MySQL: DROP INDEX <name> ON <table>; SQLite: DROP INDEX <name>):
+--   idx_appointments_doctor_date, idx_appointments_patient_date,
+--   idx_appointments_date_doctor, idx_prescriptions_appointment
+-- MySQL already indexes foreign key columns on its own; once these composite
+-- indexes exist it can drop its single-column doctor_id/patient_id/appointment_id ones.
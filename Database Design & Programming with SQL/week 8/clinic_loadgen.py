@@ -0,0 +1,139 @@
+"""
+Load generator: mock clinic data at any scale, bulk loaded through clinic_dal
+
+grow() adds patients and their appointments to whatever is already in the
+database. Reference data (specializations, medications, doctors) is created on
+the first call. Every generated row carries an explicit id, continuing from the
+table's current maximum. That lets appointments, prescriptions and
+prescription_medications refer to rows of the same batch without reading ids
+back. Rows are generated with NumPy in batches, so memory stays flat at any size.
+
+Per patient, on average:
+    appointments_per_patient appointments  (08:00-17:45 on 15-minute slots, 2020-2025)
+    60% of appointments get a prescription, with 1-3 distinct medications
+
+    python clinic_loadgen.py --db clinic.sqlite --patients 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from clinic_dal import (Appointment, Clinic, Doctor, Medication, Patient, Prescription,
+                        PrescriptionMedication, Specialization)
+
+SPECIALIZATIONS = ["General Practitioner", "Dermatology", "Cardiology", "Neurology", "Pediatrics",
+                   "Orthopedics", "Ophthalmology", "Psychiatry", "Gynecology", "Oncology"]
+FIRST_NAMES = ["John", "Jane", "Emily", "Alice", "Bob", "Carla", "David", "Grace", "Ifeoma", "Chidi",
+               "Amara", "Tunde", "Fatima", "Kwame", "Zainab", "Peter", "Mary", "Samuel", "Ngozi", "Yusuf"]
+LAST_NAMES = ["Doe", "Smith", "Clark", "Morgan", "Jones", "Okafor", "Adeyemi", "Mensah", "Bello", "Eze",
+              "Brown", "Taylor", "Okonkwo", "Abubakar", "Johnson", "Williams", "Nwosu", "Garcia", "Lee", "Khan"]
+REASONS = ["General Checkup", "Skin Rash", "Heart Palpitations", "Headache", "Follow-up", "Fever",
+           "Back Pain", "Vaccination", "Blood Test Review", "Eye Exam"]
+MEDICATIONS = [("Vitamin D3", "1000 IU"), ("Hydrocortisone Cream", "2%"), ("Aspirin", "81mg"),
+               ("Paracetamol", "500mg"), ("Ibuprofen", "400mg"), ("Amoxicillin", "500mg"),
+               ("Metformin", "850mg"), ("Lisinopril", "10mg"), ("Atorvastatin", "20mg"), ("Cetirizine", "10mg")]
+NOTES = ["Prescribed vitamins and recommended rest.", "Applied topical cream for rash.",
+         "Referred to cardiologist for ECG.", "Review in two weeks.", "Take with food."]
+
+FIRST_DAY = np.datetime64("2020-01-01")
+DAYS = 6 * 365
+SLOTS_PER_DAY = 40                    # 08:00 to 17:45, every 15 minutes
+
+
+def _dates(rng, n):
+    days = FIRST_DAY + rng.integers(0, DAYS, n).astype("timedelta64[D]")
+    minutes = (8 * 60 + 15 * rng.integers(0, SLOTS_PER_DAY, n)).astype("timedelta64[m]")
+    return [s.replace("T", " ") for s in np.datetime_as_string(days + minutes, unit="s").tolist()]
+
+
+def ensure_reference_data(clinic, doctors=500, seed=0):
+    """Specializations, medications and doctors, if the tables are still empty."""
+    if clinic.specializations.count() == 0:
+        clinic.specializations.add_many(Specialization(i + 1, name) for i, name in enumerate(SPECIALIZATIONS))
+    if clinic.medications.count() == 0:
+        clinic.medications.add_many(Medication(i + 1, name, dosage) for i, (name, dosage) in enumerate(MEDICATIONS))
+    if clinic.doctors.count() == 0:
+        rng = np.random.default_rng(seed)
+        first = rng.integers(0, len(FIRST_NAMES), doctors).tolist()
+        last = rng.integers(0, len(LAST_NAMES), doctors).tolist()
+        spec = rng.integers(1, len(SPECIALIZATIONS) + 1, doctors).tolist()
+        clinic.doctors.add_many(
+            Doctor(i + 1, FIRST_NAMES[f], LAST_NAMES[l], f"{FIRST_NAMES[f]}.{LAST_NAMES[l]}.{i + 1}@clinic.com".lower(), s)
+            for i, (f, l, s) in enumerate(zip(first, last, spec)))
+
+
+def grow(clinic, patients, appointments_per_patient=3, seed=None, batch_size=50_000) -> dict:
+    """Adds patients and their appointments/prescriptions; returns rows added per table."""
+    ensure_reference_data(clinic)
+    n_doctors, n_medications = clinic.doctors.max_id(), clinic.medications.max_id()
+    next_patient = clinic.patients.max_id() + 1
+    next_appointment = clinic.appointments.max_id() + 1
+    next_prescription = clinic.prescriptions.max_id() + 1
+    rng = np.random.default_rng(next_patient if seed is None else seed)
+    added = dict.fromkeys(["patients", "appointments", "prescriptions", "prescription_medications"], 0)
+
+    for start in range(0, patients, batch_size):
+        n = min(batch_size, patients - start)
+        ids = np.arange(next_patient, next_patient + n)
+        first = rng.integers(0, len(FIRST_NAMES), n).tolist()
+        last = rng.integers(0, len(LAST_NAMES), n).tolist()
+        dob = np.datetime_as_string(np.datetime64("1940-01-01") + rng.integers(0, 30_000, n).astype("timedelta64[D]"))
+        added["patients"] += clinic.patients.add_many(
+            (Patient(i, FIRST_NAMES[f], LAST_NAMES[l], d, f"+1555{i:08d}", f"{FIRST_NAMES[f]}.{LAST_NAMES[l]}.{i}@example.com".lower())
+             for i, f, l, d in zip(ids.tolist(), first, last, dob.tolist())), batch_size)
+
+        m = rng.poisson(appointments_per_patient, n)
+        a_ids = np.arange(next_appointment, next_appointment + m.sum())
+        patient = np.repeat(ids, m).tolist()
+        doctor = rng.integers(1, n_doctors + 1, len(a_ids)).tolist()
+        reason = rng.integers(0, len(REASONS), len(a_ids)).tolist()
+        added["appointments"] += clinic.appointments.add_many(
+            (Appointment(a, d, p, t, REASONS[r])
+             for a, d, p, t, r in zip(a_ids.tolist(), doctor, patient, _dates(rng, len(a_ids)), reason)), batch_size)
+
+        with_rx = a_ids[rng.random(len(a_ids)) < 0.6]
+        rx_ids = np.arange(next_prescription, next_prescription + len(with_rx))
+        notes = rng.integers(0, len(NOTES), len(rx_ids)).tolist()
+        added["prescriptions"] += clinic.prescriptions.add_many(
+            (Prescription(r, a, NOTES[k]) for r, a, k in zip(rx_ids.tolist(), with_rx.tolist(), notes)), batch_size)
+
+        # 1-3 distinct medications: consecutive ids from a random start, wrapping around
+        k = rng.integers(1, 4, len(rx_ids))
+        first_med = rng.integers(0, n_medications, len(rx_ids))
+        rx = np.repeat(rx_ids, k)
+        offset = np.arange(len(rx)) - np.repeat(np.cumsum(k) - k, k)
+        med = (np.repeat(first_med, k) + offset) % n_medications + 1
+        added["prescription_medications"] += clinic.prescription_medications.add_many(
+            (PrescriptionMedication(r, d) for r, d in zip(rx.tolist(), med.tolist())), batch_size)
+
+        next_patient += n
+        next_appointment += len(a_ids)
+        next_prescription += len(rx_ids)
+    return added
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk-load generated clinic data into SQLite")
+    ap.add_argument("--db", default="clinic.sqlite")
+    ap.add_argument("--patients", type=int, default=100_000)
+    ap.add_argument("--appointments-per-patient", type=float, default=3)
+    ap.add_argument("--fresh", action="store_true", help="drop and recreate the tables first")
+    args = ap.parse_args()
+
+    clinic = Clinic.sqlite(args.db)
+    if args.fresh or not clinic.has_schema():
+        clinic.create_schema()
+    t0 = time.perf_counter()
+    added = grow(clinic, args.patients, args.appointments_per_patient)
+    secs = time.perf_counter() - t0
+    total = sum(added.values())
+    for table, rows in added.items():
+        print(f"{table:<26}{rows:>12,}")
+    print(f"{total:,} rows in {secs:.1f} s ({total / secs:,.0f} rows/s)")
+    clinic.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Canonical clinic queries, with the indexes that serve them (clinic_indexes.sql)
+
+- daily_schedule(doctor, day):      a doctor's appointments on one day, with the
+                                    patients. Uses idx_appointments_doctor_date.
+- patient_history(patient):         every appointment of a patient, with its
+                                    doctor, prescriptions and medications. Uses
+                                    idx_appointments_patient_date and
+                                    idx_prescriptions_appointment.
+- busiest_doctors(start, end, top): the doctors with the most appointments in a
+                                    period, per specialization. Uses
+                                    idx_appointments_date_doctor.
+
+Without the indexes, each query scans appointments. Patient history also reads
+all of prescriptions: SQLite builds a temporary index over it on every call.
+explain() returns the plan the backend chooses, so the difference can be checked
+on a real database.
+"""
+
+from datetime import timedelta
+from typing import NamedTuple, Optional
+
+from clinic_dal import sql_value
+
+QUERIES = {
+    "daily_schedule": """
+        SELECT a.id, a.appointment_date, a.reason, p.id, p.first_name, p.last_name, p.phone
+        FROM appointments a
+        JOIN patients p ON p.id = a.patient_id
+        WHERE a.doctor_id = ? AND a.appointment_date >= ? AND a.appointment_date < ?
+        ORDER BY a.appointment_date""",
+    "patient_history": """
+        SELECT a.id, a.appointment_date, a.reason, d.first_name, d.last_name, s.name,
+               rx.id, rx.notes, m.name, m.dosage
+        FROM appointments a
+        JOIN doctors d ON d.id = a.doctor_id
+        LEFT JOIN specializations s ON s.id = d.specialization_id
+        LEFT JOIN prescriptions rx ON rx.appointment_id = a.id
+        LEFT JOIN prescription_medications pm ON pm.prescription_id = rx.id
+        LEFT JOIN medications m ON m.id = pm.medication_id
+        WHERE a.patient_id = ?
+        ORDER BY a.appointment_date, a.id, rx.id, m.name""",
+    "busiest_doctors": """
+        SELECT specialization, doctor_id, first_name, last_name, appointments FROM (
+            SELECT s.name AS specialization, d.id AS doctor_id, d.first_name, d.last_name,
+                   c.appointments,
+                   ROW_NUMBER() OVER (PARTITION BY s.id ORDER BY c.appointments DESC, d.id) AS doctor_rank
+            FROM (SELECT doctor_id, COUNT(*) AS appointments
+                  FROM appointments
+                  WHERE appointment_date >= ? AND appointment_date < ?
+                  GROUP BY doctor_id) c
+            JOIN doctors d ON d.id = c.doctor_id
+            JOIN specializations s ON s.id = d.specialization_id
+        ) ranked
+        WHERE doctor_rank <= ?
+        ORDER BY specialization, doctor_rank""",
+}
+
+
+class ScheduleEntry(NamedTuple):
+    appointment_id: int
+    appointment_date: str
+    reason: Optional[str]
+    patient_id: int
+    first_name: str
+    last_name: str
+    phone: Optional[str]
+
+
+class HistoryEntry(NamedTuple):
+    appointment_id: int
+    appointment_date: str
+    reason: Optional[str]
+    doctor_first_name: str
+    doctor_last_name: str
+    specialization: Optional[str]
+    prescription_id: Optional[int]
+    notes: Optional[str]
+    medication: Optional[str]
+    dosage: Optional[str]
+
+
+class BusyDoctor(NamedTuple):
+    specialization: str
+    doctor_id: int
+    first_name: str
+    last_name: str
+    appointments: int
+
+
+def run(clinic, name, params):
+    backend = clinic.pool.backend
+    with clinic.pool.connection() as conn:
+        cur = backend.cursor(conn, prepared=True)
+        cur.execute(backend.sql(QUERIES[name]), [sql_value(p) for p in params])
+        return cur.fetchall()
+
+
+def explain(clinic, name, params) -> list:
+    """The backend's plan for a query, one line per step."""
+    backend = clinic.pool.backend
+    # A fresh connection: sqlite3 keeps EXPLAIN statements in its per-connection cache,
+    # and a cached one keeps reporting the plan from before an index was added or dropped
+    conn = backend.connect()
+    try:
+        cur = backend.cursor(conn)
+        cur.execute(backend.sql(backend.explain + QUERIES[name]), [sql_value(p) for p in params])
+        return backend.plan_lines(cur.fetchall())
+    finally:
+        conn.close()
+
+
+def schedule_params(doctor_id, day):
+    return doctor_id, sql_value(day), sql_value(day + timedelta(days=1))
+
+
+def daily_schedule(clinic, doctor_id, day) -> list:
+    """day: a datetime.date."""
+    return [ScheduleEntry(*r) for r in run(clinic, "daily_schedule", schedule_params(doctor_id, day))]
+
+
+def patient_history(clinic, patient_id) -> list:
+    """One row per appointment x prescription x medication (None where there is none)."""
+    return [HistoryEntry(*r) for r in run(clinic, "patient_history", (patient_id,))]
+
+
+def busiest_doctors(clinic, start, end, top=3) -> list:
+    """The top doctors by appointments with start <= date < end, per specialization."""
+    return [BusyDoctor(*r) for r in run(clinic, "busiest_doctors", (start, end, top))]
@@ -0,0 +1,85 @@
+"""
+1M-row arithmetic: a Python loop over calc() vs calc_engine over NumPy columns.
+
+Random integer columns a and b (b is zero in about 1% of rows):
+- a / b:                   calc(a[i], b[i], '/') per row vs evaluate("a / b")
+- (a + b) * (a - b) / b:   three calc() calls per row vs one evaluate()
+The loop has to check each result for calc's "Division by Zero" string. The engine
+returns NaN plus the div_by_zero mask. The script checks that both agree, then
+prints the timings and the parse cost with and without the expression cache.
+
+Usage:
+    python bench_calc.py [--rows 1000000] [--seed 0]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import calc_engine
+from intro_to_python import calc
+
+
+def loop_divide(a, b):
+    out, zero = [], []
+    for x, y in zip(a, b):
+        r = calc(x, y, '/')
+        bad = isinstance(r, str)
+        out.append(float("nan") if bad else r)
+        zero.append(bad)
+    return np.array(out), np.array(zero)
+
+
+def loop_expression(a, b):
+    out, zero = [], []
+    for x, y in zip(a, b):
+        r = calc(calc(x, y, '+'), calc(x, y, '-'), '*')
+        r = calc(r, y, '/')
+        bad = isinstance(r, str)
+        out.append(float("nan") if bad else r)
+        zero.append(bad)
+    return np.array(out), np.array(zero)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    a = rng.integers(-1000, 1000, args.rows)
+    b = np.where(rng.random(args.rows) < 0.01, 0, rng.integers(-1000, 1000, args.rows))
+    a_list, b_list = a.tolist(), b.tolist()   # the loop gets plain ints, like input() gives
+
+    cases = [
+        ("a / b", loop_divide),
+        ("(a + b) * (a - b) / b", loop_expression),
+    ]
+    print(f"{args.rows:,} rows, {int((b == 0).sum()):,} zero divisors\n")
+    print(f"{'expression':<24}{'calc loop s':>12}{'engine s':>10}{'speedup':>9}")
+    for text, loop in cases:
+        t_loop, (expected, expected_zero) = timed(loop, a_list, b_list)
+        calc_engine.compile_expression.cache_clear()
+        t_engine, result = timed(calc_engine.evaluate, text, a=a, b=b)
+        assert np.array_equal(result.div_by_zero, expected_zero)
+        assert np.allclose(result.values, expected, equal_nan=True)
+        print(f"{text:<24}{t_loop:>12.2f}{t_engine:>10.3f}{t_loop / t_engine:>8.0f}x")
+
+    text = "(a + b) * (a - b) / b"
+    n = 10_000
+    calc_engine.compile_expression.cache_clear()
+    t_cold, _ = timed(lambda: [calc_engine.Expression(text) for _ in range(n)])
+    t_cached, _ = timed(lambda: [calc_engine.compile_expression(text) for _ in range(n)])
+    print(f"\nparse {text!r}: {t_cold / n * 1e6:.1f} µs, cached lookup: {t_cached / n * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Calculator engine: arithmetic expressions over whole columns
+- Parses an expression ("(a + b) * 2 / c") once into a small syntax tree,
+  with the usual precedence (* and / before + and -), parentheses and unary minus.
+- Compiled expressions are cached, so evaluating the same text again skips parsing.
+- Evaluates the tree with NumPy: each operator runs once over the whole column,
+  not once per row.
+- Division by zero does not produce a message string. The result's values are NaN
+  at those rows, and a boolean mask (div_by_zero) marks them.
+
+    >>> r = evaluate("(a + b) / c", a=[1, 2, 3], b=[1, 1, 1], c=[2, 0, 4])
+    >>> r.values, r.div_by_zero
+    (array([ 1., nan,  1.]), array([False,  True, False]))
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# --- Syntax tree ---
+class Num(NamedTuple):
+    value: float
+
+
+class Var(NamedTuple):
+    name: str
+
+
+class Neg(NamedTuple):
+    operand: tuple
+
+
+class BinOp(NamedTuple):
+    op: str
+    left: tuple
+    right: tuple
+
+
+class Result(NamedTuple):
+    values: np.ndarray
+    div_by_zero: np.ndarray
+
+
+# --- Parsing ---
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(.))")
+
+
+def tokenize(text):
+    tokens = []
+    for number, name, op in _TOKEN.findall(text):
+        if number:
+            tokens.append(("num", float(number) if any(c in number for c in ".eE") else int(number)))
+        elif name:
+            tokens.append(("name", name))
+        elif op in "+-*/()":
+            tokens.append(("op", op))
+        elif op.strip():
+            raise ExpressionError(f"Unexpected character {op!r} in {text!r}")
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent over:
+        expr   := term (('+' | '-') term)*
+        term   := factor (('*' | '/') factor)*
+        factor := ('-' | '+') factor | NUMBER | NAME | '(' expr ')'
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("Empty expression")
+        node = self.expr()
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r} in {self.text!r}")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            node = BinOp(self.take()[1], node, self.term())
+        return node
+
+    def term(self):
+        node = self.factor()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            node = BinOp(self.take()[1], node, self.factor())
+        return node
+
+    def factor(self):
+        kind, value = self.take()
+        if kind == "op" and value in "+-":
+            operand = self.factor()
+            return Neg(operand) if value == "-" else operand
+        if kind == "num":
+            return Num(value)
+        if kind == "name":
+            return Var(value)
+        if (kind, value) == ("op", "("):
+            node = self.expr()
+            if self.take() != ("op", ")"):
+                raise ExpressionError(f"Missing ')' in {self.text!r}")
+            return node
+        raise ExpressionError(f"Expected a number, name or '(' in {self.text!r}")
+
+
+def parse(text):
+    return _Parser(text).parse()
+
+
+# --- Evaluation ---
+def _variables(node, found):
+    if isinstance(node, Var):
+        found.setdefault(node.name)
+    elif isinstance(node, Neg):
+        _variables(node.operand, found)
+    elif isinstance(node, BinOp):
+        _variables(node.left, found)
+        _variables(node.right, found)
+    return found
+
+
+def _eval(node, env, mask):
+    """Returns the node's value; ORs rows with a zero divisor into mask[0]."""
+    if isinstance(node, Num):
+        return node.value
+    if isinstance(node, Var):
+        return env[node.name]
+    if isinstance(node, Neg):
+        return np.negative(_eval(node.operand, env, mask))
+    left = _eval(node.left, env, mask)
+    right = _eval(node.right, env, mask)
+    if node.op == "+":
+        return np.add(left, right)
+    if node.op == "-":
+        return np.subtract(left, right)
+    if node.op == "*":
+        return np.multiply(left, right)
+    zero = np.equal(right, 0)
+    if np.any(zero):
+        mask[0] = zero if mask[0] is None else mask[0] | zero
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.divide(left, np.where(zero, np.nan, right))
+    return np.true_divide(left, right)
+
+
+class Expression:
+    def __init__(self, text):
+        self.text = text
+        self.tree = parse(text)
+        self.variables = tuple(_variables(self.tree, {}))
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    def __call__(self, env=None, **columns) -> Result:
+        """
+        Evaluates over columns given as keywords or as a mapping (a dict, a pandas
+        DataFrame, ...). Scalars broadcast against arrays.
+        """
+        if env is not None:
+            columns = {**{k: env[k] for k in self.variables if k in env}, **columns}
+        missing = [v for v in self.variables if v not in columns]
+        if missing:
+            raise ExpressionError(f"No value for {', '.join(missing)} in {self.text!r}")
+        env = {k: np.asarray(columns[k]) for k in self.variables}
+        mask = [None]
+        values = np.asarray(_eval(self.tree, env, mask))
+        zero = mask[0]
+        if zero is None:
+            zero = np.zeros(values.shape, dtype=bool)
+        else:
+            zero = np.broadcast_to(zero, values.shape)
+            if values.dtype.kind != "f":
+                values = values.astype(np.float64)
+            values = np.where(zero, np.nan, values)   # rows with a zero divisor anywhere in the tree
+        return Result(values, zero)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text) -> Expression:
+    return Expression(text)
+
+
+def evaluate(text, env=None, **columns) -> Result:
+    return compile_expression(text)(env, **columns)
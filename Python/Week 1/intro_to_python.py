@@ -2,10 +2,30 @@
 - Reads two(2) numbers and an operator
 - performs arithematic operation on the numbers using the operator
 - Output the result to the console.
+
+calc() also takes whole columns (lists or NumPy arrays) for either number; those go
+through calc_engine and come back as a Result with the values and a
+division-by-zero mask. Longer expressions: calc_engine.evaluate("(a + b) / c", ...).
 """
 
+import calc_engine
+
+
+_SCALARS = {int, float}
+
+
+def _is_column(x):
+    return isinstance(x, (list, tuple)) or getattr(x, "ndim", 0) > 0
+
+
 def calc(fNum, sNum, opertr):
-    
+
+    # plain numbers skip the column check: calc() is also called once per row in loops
+    if (type(fNum) not in _SCALARS or type(sNum) not in _SCALARS) and (_is_column(fNum) or _is_column(sNum)):
+        if opertr not in ('+', '-', '*', '/'):
+            raise calc_engine.ExpressionError(f"No Basic Valid operator given: {opertr!r}")
+        return calc_engine.evaluate(f"a {opertr} b", a=fNum, b=sNum)
+
     if opertr == '+':
         return fNum + sNum
     elif opertr == '-':
@@ -21,10 +41,11 @@ def calc(fNum, sNum, opertr):
         return "No Basic Valid operator given"
 
 
-fNum = int(input("Enter the first number: "))
-sNum = int(input("Enter the second number: "))
-opertr = str(input("Enter the operator: "))
+if __name__ == "__main__":
+    fNum = int(input("Enter the first number: "))
+    sNum = int(input("Enter the second number: "))
+    opertr = str(input("Enter the operator: "))
 
-res = calc(fNum, sNum, opertr)
+    res = calc(fNum, sNum, opertr)
 
-print(f"{fNum} {opertr} {sNum} = {res}")
+    print(f"{fNum} {opertr} {sNum} = {res}")
@@ -0,0 +1,90 @@
+"""
+Render time: drawing every point vs plot_agg, with the Agg backend.
+
+For each --points count, each figure is built and saved as a PNG (dpi 100) into
+memory, timed end to end:
+- scatter:  sns.scatterplot with 3 hues (basic_data_analysis.py) vs plot_agg.scatter
+- hist:     plt.hist, 15 bins vs plot_agg.hist with cached edges
+- lines:    10 series of points / 10 samples each, plt.plot (covid_global_tracker.py)
+            vs plot_agg.line with min-max and with LTTB decimation
+
+Usage:
+    python bench_plot_agg.py [--points 100000 1000000] [--seed 0]
+"""
+
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+import plot_agg
+
+
+def render(draw):
+    """Seconds to draw and save one figure, and the PNG size in KB."""
+    t0 = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    draw(ax)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100)
+    plt.close(fig)
+    return time.perf_counter() - t0, buf.tell() / 1024
+
+
+def cases(n, rng):
+    species = pd.Categorical(rng.choice(["setosa", "versicolor", "virginica"], n))
+    centers = {"setosa": (5.0, 1.5), "versicolor": (5.9, 4.3), "virginica": (6.6, 5.5)}
+    cx = np.array([centers[s][0] for s in species.categories])[species.codes]
+    cy = np.array([centers[s][1] for s in species.categories])[species.codes]
+    df = pd.DataFrame({"x": cx + rng.normal(0, 0.4, n), "y": cy + rng.normal(0, 0.4, n), "species": species})
+    dates = pd.date_range("2000-01-01", periods=n // 10, freq="h").to_numpy()
+    series = [np.cumsum(rng.normal(0, 1, n // 10)) for _ in range(10)]
+
+    def lines(plot):
+        def draw(ax):
+            for i, y in enumerate(series):
+                plot(ax, y, label=f"series {i}")
+            ax.legend()
+        return draw
+
+    return [
+        ("scatter", "sns.scatterplot",
+         lambda ax: sns.scatterplot(data=df, x="x", y="y", hue="species", palette="deep", ax=ax)),
+        ("scatter", "plot_agg.scatter",
+         lambda ax: plot_agg.scatter(ax, df["x"], df["y"], hue=df["species"], palette=sns.color_palette("deep"))),
+        ("hist", "plt.hist",
+         lambda ax: ax.hist(df["y"], bins=15, color="coral", edgecolor="black")),
+        ("hist", "plot_agg.hist",
+         lambda ax: plot_agg.hist(ax, df["y"], bins=15, key="y", color="coral", edgecolor="black")),
+        ("lines", "plt.plot", lines(lambda ax, y, **kw: ax.plot(dates, y, **kw))),
+        ("lines", "plot_agg.line minmax", lines(lambda ax, y, **kw: plot_agg.line(ax, dates, y, **kw))),
+        ("lines", "plot_agg.line lttb", lines(lambda ax, y, **kw: plot_agg.line(ax, dates, y, method="lttb", **kw))),
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    render(lambda ax: ax.plot([0, 1]))   # warm up fonts and the backend
+    print(f"{'points':>10}  {'plot':<8}{'method':<22}{'seconds':>9}{'PNG KB':>8}")
+    for n in args.points:
+        rng = np.random.default_rng(args.seed)
+        plot_agg.clear_edges()
+        for plot, method, draw in cases(n, rng):
+            secs, kb = render(draw)
+            print(f"{n:>10,}  {plot:<8}{method:<22}{secs:>9.2f}{kb:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Plot helpers that aggregate before drawing
+
+Matplotlib draws each point it is given. A million-point scatter is a million
+markers, and a long line is a path with a vertex per sample. Both take seconds to
+render and make large files. These helpers first reduce the data to roughly what
+the figure can show, then draw that:
+- scatter()  at most MAX_POINTS points are drawn as markers. Above that, the data
+             is binned into a 2-D histogram and drawn as one density image, one
+             colored layer per hue.
+- hist()     np.histogram into uniform bins, drawn as a single stairs artist. The
+             bin edges of a named column are cached, so every histogram of that
+             column lines up (and uses NumPy's fast uniform-bin path).
+- line()     series longer than max_points are decimated with min-max (the
+             default: keeps every spike) or LTTB (keeps the visual shape)
+             before plotting.
+- show()     plt.show(), or with PLOT_HEADLESS=1 (Agg backend, no display) saves
+             the figure to PLOT_DIR (default plots/) as a PNG named after its title.
+
+The scripts in Python/week 7 and week 8 import this module:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))
+    import plot_agg
+"""
+
+import os
+import re
+from pathlib import Path
+
+import matplotlib
+
+HEADLESS = os.environ.get("PLOT_HEADLESS", "0") == "1"
+if HEADLESS:
+    matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm, to_rgb
+from matplotlib.patches import Patch
+
+PLOT_DIR = Path(os.environ.get("PLOT_DIR", "plots"))
+MAX_POINTS = 50_000
+DENSITY_BINS = 300
+
+_edges = {}
+
+
+# --- Reductions ---
+def bin_edges(values, bins=30, key=None):
+    """
+    (bins, (lo, hi)) for np.histogram. The result for a key (a column name, say) is
+    computed once and reused, so later calls skip the min/max pass.
+    """
+    if key is not None and (key, bins) in _edges:
+        return _edges[key, bins]
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    lo, hi = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = bins, (lo, hi)
+    if key is not None:
+        _edges[key, bins] = edges
+    return edges
+
+
+def clear_edges():
+    _edges.clear()
+
+
+def minmax_decimate(x, y, n_out):
+    """Indices of the min and max of y in n_out // 2 equal buckets, in order."""
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    starts = np.linspace(0, n, buckets + 1).astype(np.intp)[:-1]
+    # argmin/argmax per bucket: reduceat gives the extreme value, a compare finds its index
+    lo = np.minimum.reduceat(y, starts)
+    hi = np.maximum.reduceat(y, starts)
+    bucket = np.repeat(np.arange(buckets), np.diff(np.r_[starts, n]))
+    first_lo = _first_true(y == lo[bucket], bucket)
+    first_hi = _first_true(y == hi[bucket], bucket)
+    return np.unique(np.r_[0, first_lo, first_hi, n - 1])
+
+
+def _first_true(hit, bucket):
+    idx = np.flatnonzero(hit)
+    _, first = np.unique(bucket[idx], return_index=True)   # bucket is sorted: first hit per bucket
+    return idx[first]
+
+
+def lttb_decimate(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013): indices of n_out points.
+    Each bucket keeps the point that makes the largest triangle with the point kept
+    from the previous bucket and the mean of the next bucket.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt = slice(stop, edges[i + 2]) if i + 2 < len(edges) else slice(n - 1, n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+# --- Drawing ---
+def hist(ax, values, bins=30, key=None, **kwargs):
+    """Histogram of values as one stairs artist; key caches the bin edges."""
+    values = np.asarray(values, dtype=np.float64)
+    n, value_range = bin_edges(values, bins, key)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=n, range=value_range)
+    kwargs.setdefault("fill", True)
+    return ax.stairs(counts, edges, **kwargs)
+
+
+def scatter(ax, x, y, hue=None, palette=None, max_points=MAX_POINTS, bins=DENSITY_BINS, **kwargs):
+    """
+    Scatter of x against y, colored by hue. Up to max_points points are drawn as
+    markers; beyond that, one density image per hue value.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if hue is None:
+        groups = [(None, np.ones(len(x), dtype=bool))]
+    else:
+        order = _unique(hue)
+        hue = np.asarray(hue)
+        groups = [(g, hue == g) for g in order]
+    colors = palette or plt.rcParams["axes.prop_cycle"].by_key()["color"]
+
+    if len(x) <= max_points:
+        kwargs.setdefault("s", 12)
+        for (group, mask), color in zip(groups, _cycle(colors)):
+            ax.scatter(x[mask], y[mask], color=color, label=group, **kwargs)
+        if hue is not None:
+            ax.legend()
+        return ax
+
+    ok = np.isfinite(x) & np.isfinite(y)
+    x_range, y_range = bin_edges(x[ok], bins)[1], bin_edges(y[ok], bins)[1]
+    extent = (*x_range, *y_range)
+    if hue is None:
+        counts, _, _ = np.histogram2d(x[ok], y[ok], bins=bins, range=[x_range, y_range])
+        image = ax.imshow(np.ma.masked_equal(counts.T, 0), origin="lower", extent=extent,
+                          aspect="auto", norm=LogNorm(), cmap=kwargs.get("cmap", "viridis"))
+        ax.figure.colorbar(image, ax=ax, label="points per bin")
+        return ax
+    handles = []
+    for (group, mask), color in zip(groups, _cycle(colors)):
+        counts, _, _ = np.histogram2d(x[ok & mask], y[ok & mask], bins=bins, range=[x_range, y_range])
+        rgba = np.zeros((*counts.T.shape, 4))
+        rgba[..., :3] = to_rgb(color)
+        rgba[..., 3] = np.log1p(counts.T) / max(np.log1p(counts.max()), 1e-12)
+        ax.imshow(rgba, origin="lower", extent=extent, aspect="auto", interpolation="nearest")
+        handles.append(Patch(color=color, label=str(group)))
+    ax.legend(handles=handles)
+    return ax
+
+
+def line(ax, x, y, max_points=2_000, method="minmax", **kwargs):
+    """Plots y against x, decimated to about max_points samples (NaNs dropped first)."""
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    ok = ~np.isnan(y)
+    x, y = x[ok], y[ok]
+    if len(y) > max_points:
+        xs = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+        pick = (lttb_decimate if method == "lttb" else minmax_decimate)(xs, y, max_points)
+        x, y = x[pick], y[pick]
+    return ax.plot(x, y, **kwargs)
+
+
+def show(fig=None, name=None):
+    """plt.show(), or in headless mode: save to PLOT_DIR/<name or title>.png and close."""
+    fig = fig or plt.gcf()
+    if not HEADLESS:
+        plt.show()
+        return None
+    if name is None:
+        title = fig._suptitle.get_text() if fig._suptitle else \
+            next((ax.get_title() for ax in fig.axes if ax.get_title()), "figure")
+        name = re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_") or "figure"
+    PLOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = PLOT_DIR / f"{name}.png"
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def _unique(values):
+    """Distinct values in order of appearance (categorical order for pandas categoricals)."""
+    categories = getattr(getattr(values, "dtype", None), "categories", None)
+    if categories is not None:
+        return list(categories)
+    values = np.asarray(values)
+    _, first = np.unique(values, return_index=True)
+    return list(values[np.sort(first)])
+
+
+def _cycle(colors):
+    while True:
+        yield from colors
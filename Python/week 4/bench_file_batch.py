@@ -0,0 +1,64 @@
+"""
+Batch-mode wall time: sequential vs thread pool vs process pool, and a re-run.
+
+Writes --files log files of --kb KB each, then runs file_handling.run_batch
+into a fresh output directory for every (pipeline, pool, workers) combination,
+plus a re-run over an up-to-date directory, where the manifest makes every file a skip.
+
+Usage:
+    python bench_file_batch.py [--files 2000] [--kb 64] [--workers 4]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import file_handling as fh
+from bench_file_handling import write_log
+
+PIPELINES = {"copy": [], "--grep-v DEBUG --sub": [("grep_v", ["DEBUG"]), ("sub", [r"\d{4}-\d\d-\d\d", "DATE"])]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--kb", type=int, default=64)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_batch_"))
+    src = tmp / "in"
+    src.mkdir()
+    sample = tmp / "sample.log"
+    write_log(sample, 1)
+    text = sample.read_text()[:args.kb * 1000]
+    for i in range(args.files):
+        (src / f"app-{i:05d}.log").write_text(text)
+    total_mb = args.files * len(text) / 1e6
+    print(f"{args.files} files, {total_mb:.0f} MB, {os.cpu_count()} CPUs\n")
+
+    print(f"{'pipeline':<22}{'pool':<9}{'workers':>8}{'seconds':>9}{'MB/s':>8}")
+    for name, specs in PIPELINES.items():
+        for pool, workers in [("thread", 1), ("thread", args.workers), ("process", args.workers)]:
+            out = tmp / "out"
+            t0 = time.perf_counter()
+            rows = fh.run_batch([str(src)], str(out), specs, workers=workers, pool=pool)
+            secs = time.perf_counter() - t0
+            assert all(r["status"] == "written" for r in rows)
+            print(f"{name:<22}{pool:<9}{workers:>8}{secs:>9.2f}{total_mb / secs:>8.0f}")
+            if pool != "process":   # keep the last output for the re-run
+                shutil.rmtree(out)
+        t0 = time.perf_counter()
+        rows = fh.run_batch([str(src)], str(out), specs, workers=args.workers, pool="auto")
+        secs = time.perf_counter() - t0
+        assert all(r["status"] == "skipped" for r in rows)
+        print(f"{name:<22}{'re-run':<9}{args.workers:>8}{secs:>9.2f}{'':>8}")
+        shutil.rmtree(out)
+    shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput and peak memory: whole-file read/write (the old script) vs file_handling.
+
+Writes a synthetic log file of --mb megabytes, then runs each mode in a fresh
+process and reports MB/s (input size / wall time) and peak RSS above the
+interpreter baseline:
+- read() + write:   f.read() the whole file, write it to the output (the old script)
+- copy:             transform_file with no transforms (mmap fast path)
+- --upper:          fixed-size buffers through a case change
+- --grep --sub:     whole-line batches through a filter and a regex substitution
+
+Usage:
+    python bench_file_handling.py [--mb 512] [--dir /tmp]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+MODES = ["read() + write", "copy", "--upper", "--grep --sub"]
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def write_log(path, mb):
+    levels = ["INFO", "DEBUG", "WARN", "ERROR"]
+    line = "2024-05-{day:02d} 12:{m:02d}:{s:02d} {level:<5} worker-{w} request /api/items/{i} took {ms} ms\n"
+    block = "".join(line.format(day=i % 28 + 1, m=i % 60, s=(i * 7) % 60, level=levels[i % 4],
+                                w=i % 8, i=i, ms=i % 997) for i in range(10_000))
+    with open(path, "w") as f:
+        for _ in range(max(1, mb * 1_000_000 // len(block))):
+            f.write(block)
+
+
+def run(mode, src, dest, out):
+    import file_handling as fh
+
+    base = peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode == "read() + write":
+        with open(src, "r") as f:
+            content = f.read()
+        with open(dest, "w") as f:
+            f.write(content)
+    elif mode == "copy":
+        fh.transform_file(src, dest)
+    elif mode == "--upper":
+        fh.transform_file(src, dest, [fh.upper()])
+    else:
+        fh.transform_file(src, dest, [fh.grep("ERROR"), fh.sub(r"\d{4}-\d\d-\d\d", "DATE")])
+    out.put((mode, time.perf_counter() - t0, peak_rss_mb() - base, os.path.getsize(dest)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=int, default=512)
+    ap.add_argument("--dir", default=tempfile.gettempdir())
+    args = ap.parse_args()
+
+    src = Path(args.dir) / f"bench_log_{args.mb}mb.txt"
+    dest = Path(args.dir) / "bench_log_out.txt"
+    if not src.exists():
+        print(f"Writing {src} ...")
+        write_log(src, args.mb)
+    size_mb = src.stat().st_size / 1e6
+    print(f"Input: {size_mb:.0f} MB")
+
+    ctx = mp.get_context("spawn")
+    rows = []
+    for mode in MODES:
+        q = ctx.Queue()
+        p = ctx.Process(target=run, args=(mode, src, dest, q))
+        p.start()
+        rows.append(q.get())
+        p.join()
+        dest.unlink()
+
+    print(f"\n{'mode':<16}{'seconds':>9}{'MB/s':>8}{'peak RSS MB':>13}{'output MB':>11}")
+    for mode, secs, rss, out_size in rows:
+        print(f"{mode:<16}{secs:>9.2f}{size_mb / secs:>8.0f}{rss:>13.0f}{out_size / 1e6:>11.0f}")
+    src.unlink()
+
+
+if __name__ == "__main__":
+    main()
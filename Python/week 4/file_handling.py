@@ -1,16 +1,395 @@
 """A program that reads a file and writes to a
 new file the modified content
+
+    python file_handling.py notes.txt                 # copies it to output.txt
+    python file_handling.py app.log -o out.txt --grep ERROR --sub "\\d{4}-\\d\\d-\\d\\d" DATE --upper
+    python file_handling.py logs/ "archive/**/*.log" -d cleaned/ --grep-v DEBUG --report report.csv
+
+The input is never loaded whole, so memory stays constant on multi-GB files:
+- plain copy (no transforms): the input is mmapped and written out in windows
+- transforms that work on any slice of text (--upper, --lower): fixed-size buffers
+- line transforms (--sub, --grep, --grep-v): batches of whole lines
+Transforms run in the order given on the command line. The output is written to a
+temporary file next to the destination and renamed over it only when complete, so
+a failed run never leaves a half-written output.txt.
+
+Batch mode (-d/--out-dir) takes files, directories and globs, and spreads the
+files over a pool: threads for plain copies, which wait on I/O, and processes when
+there are transforms, which are CPU-bound in Python. cleaned/.file_handling.json
+records each source's size, mtime (and, with --hash, content hash) and the
+pipeline, so a re-run only redoes files that changed. A failing file is reported
+and the run continues; --report writes per-file status, size and MB/s as CSV.
 """
 
-file_name = str(input("Enter file name..? "))
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+BUFFER_SIZE = 1 << 20        # characters per read in buffer mode, line-batch size hint
+MMAP_WINDOW = 16 << 20       # bytes written per slice of the mapped input
+ENCODING = "utf-8"
+ERRORS = "surrogateescape"   # undecodable bytes pass through unchanged
+
+
+# --- Transforms ---
+# A transform maps a list of strings to a list of strings. Those marked
+# chunk_safe give the same result on any split of the text, so they can run on
+# raw buffers; the rest need whole lines.
+def transform(chunk_safe=False):
+    def mark(fn):
+        fn.chunk_safe = chunk_safe
+        return fn
+    return mark
+
+
+def upper():
+    return transform(chunk_safe=True)(lambda parts: [p.upper() for p in parts])
+
+
+def lower():
+    return transform(chunk_safe=True)(lambda parts: [p.lower() for p in parts])
+
+
+def sub(pattern, repl):
+    regex = re.compile(pattern)
+    return transform()(lambda lines: [regex.sub(repl, line) for line in lines])
+
+
+def grep(pattern, invert=False):
+    if re.escape(pattern) == pattern:
+        # plain text: a substring test is cheaper than a regex search
+        search = lambda line: pattern in line
+    else:
+        search = re.compile(pattern).search
+    if invert:
+        return transform()(lambda lines: [line for line in lines if not search(line)])
+    return transform()(lambda lines: [line for line in lines if search(line)])
+
+
+def grep_v(pattern):
+    return grep(pattern, invert=True)
+
+
+# name -> factory; pipelines are passed around as [(name, args), ...] so they can
+# be sent to worker processes (the transforms themselves are closures)
+TRANSFORMS = {"upper": upper, "lower": lower, "sub": sub, "grep": grep, "grep_v": grep_v}
+
+
+def build(specs):
+    return [TRANSFORMS[name](*args) for name, args in specs]
+
+
+# --- Writing ---
+def _atomic_output(dest, mode):
+    """Temporary file in dest's directory; returns (file object, temp path)."""
+    folder = os.path.dirname(os.path.abspath(dest))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix="-" + os.path.basename(dest))
+    # mkstemp creates 0600; give the output the permissions open(dest, 'w') would have
+    try:
+        perms = os.stat(dest).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        perms = 0o666 & ~umask
+    os.fchmod(fd, perms)
+    if "b" in mode:
+        return os.fdopen(fd, mode), tmp
+    return os.fdopen(fd, mode, encoding=ENCODING, errors=ERRORS, newline=""), tmp
+
+
+def _copy_mmap(src, out):
+    with open(src, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(mm), MMAP_WINDOW):
+                    out.write(view[start:start + MMAP_WINDOW])
+                    if hasattr(mm, "madvise"):
+                        # unmap the written window, so resident memory stays at one window
+                        mm.madvise(mmap.MADV_DONTNEED, start, min(MMAP_WINDOW, len(mm) - start))
+            finally:
+                view.release()
+            return len(mm)
+
+
+def _stream(src, out, transforms):
+    chunked = all(t.chunk_safe for t in transforms)
+    written = 0
+    with open(src, "r", encoding=ENCODING, errors=ERRORS, newline="") as f:
+        while True:
+            parts = [f.read(BUFFER_SIZE)] if chunked else f.readlines(BUFFER_SIZE)
+            if not parts or not parts[0]:
+                break
+            for t in transforms:
+                parts = t(parts)
+            text = "".join(parts)   # one encode + write per batch, not one per line
+            out.write(text)
+            written += len(text)
+    return written
+
+
+def transform_file(src, dest, transforms=()):
+    """
+    Streams src through transforms into dest, atomically. Returns the size written
+    (bytes for a plain copy, characters otherwise).
+    """
+    transforms = list(transforms)
+    out, tmp = _atomic_output(dest, "wb" if not transforms else "w")
+    try:
+        with out:
+            if transforms:
+                written = _stream(src, out, transforms)
+            else:
+                written = _copy_mmap(src, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return written
+
+
+# --- Batch mode ---
+MANIFEST = ".file_handling.json"
+
+
+def expand_inputs(patterns):
+    """
+    (source, relative output path) for every file matched by the given files,
+    directories (walked recursively) and globs ('logs/**/*.log'). Raises
+    ValueError if two different sources would be written to the same path.
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for folder, _, names in os.walk(pattern):
+                for name in names:
+                    path = os.path.join(folder, name)
+                    found.setdefault(os.path.abspath(path), os.path.relpath(path, pattern))
+        elif glob.has_magic(pattern):
+            root = pattern
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path):
+                    found.setdefault(os.path.abspath(path), os.path.relpath(path, root or "."))
+        else:
+            found.setdefault(os.path.abspath(pattern), os.path.basename(pattern))
+    sources = {}
+    for src, rel in found.items():
+        sources.setdefault(os.path.normcase(os.path.normpath(rel)), []).append(src)
+    clashes = {rel: srcs for rel, srcs in sources.items() if len(srcs) > 1}
+    if clashes:
+        raise ValueError("several inputs map to the same output: " + "; ".join(
+            f"{rel} <- {', '.join(sorted(srcs))}" for rel, srcs in sorted(clashes.items())))
+    return sorted(found.items())
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _unchanged(entry, src, dest, pipeline, use_hash):
+    """Returns (unchanged?, signature). The hash is only computed when size or mtime moved."""
+    st = os.stat(src)
+    sig = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "pipeline": pipeline}
+    if not entry or entry.get("pipeline") != pipeline or not os.path.exists(dest):
+        return False, sig
+    if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        sig["hash"] = entry.get("hash")
+        return True, sig
+    if use_hash and entry["size"] == st.st_size and entry.get("hash"):
+        sig["hash"] = file_hash(src)
+        return sig["hash"] == entry["hash"], sig
+    return False, sig
+
+
+def _process_one(src, dest, specs, use_hash):
+    """Runs in a worker. Never raises: errors are reported, not fatal."""
+    t0 = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        size = os.path.getsize(src)
+        transform_file(src, dest, build(specs))
+        digest = file_hash(src) if use_hash else None
+        return {"status": "written", "bytes": size, "seconds": time.perf_counter() - t0, "hash": digest}
+    except Exception as e:
+        return {"status": "error", "bytes": 0, "seconds": time.perf_counter() - t0,
+                "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(patterns, out_dir, specs=(), workers=None, pool="auto", use_hash=False):
+    """
+    Transforms every matched file into out_dir, mirroring the relative paths.
+    Files whose size and mtime (or, with use_hash, content) and pipeline are
+    unchanged since the last run are skipped. pool="auto" uses threads for plain
+    copies (I/O-bound) and processes when there are transforms (CPU-bound).
+    Returns one report row per file.
+    """
+    inputs = expand_inputs(patterns)   # before touching out_dir: clashing inputs raise
+    specs = [(name, list(args)) for name, args in specs]
+    pipeline = json.dumps(specs)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = _load_manifest(manifest_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    rows, todo = [], []
+    out_root = os.path.join(os.path.abspath(out_dir), "")
+    for src, rel in inputs:
+        if src.startswith(out_root):
+            continue   # earlier outputs, when out_dir is inside an input directory
+        dest = os.path.join(out_dir, rel)
+        try:
+            unchanged, sig = _unchanged(manifest.get(src), src, dest, pipeline, use_hash)
+        except OSError as e:
+            rows.append({"source": src, "output": dest, "status": "error", "bytes": 0, "seconds": 0.0,
+                         "error": f"{type(e).__name__}: {e}"})
+            continue
+        if unchanged:
+            manifest[src].update(sig)   # same content, newer mtime: no need to hash it again
+            rows.append({"source": src, "output": dest, "status": "skipped", "bytes": 0, "seconds": 0.0})
+        else:
+            todo.append((src, dest, sig))
+
+    if pool == "auto":
+        pool = "process" if specs else "thread"
+    executor = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+    with executor(max_workers=workers or os.cpu_count()) as ex:
+        futures = [ex.submit(_process_one, src, dest, specs, use_hash) for src, dest, _ in todo]
+        for (src, dest, sig), future in zip(todo, futures):
+            result = future.result()
+            rows.append({"source": src, "output": dest, **result})
+            if result["status"] == "written":
+                manifest[src] = {**sig, "hash": result.pop("hash")}
+            else:
+                manifest.pop(src, None)
+            rows[-1].pop("hash", None)
+
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return rows
+
+
+def write_report(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, ["source", "output", "status", "bytes", "seconds", "mb_per_s", "error"])
+        writer.writeheader()
+        for row in rows:
+            mbps = row["bytes"] / 1e6 / row["seconds"] if row["seconds"] else ""
+            writer.writerow({**row, "mb_per_s": mbps and round(mbps, 1), "error": row.get("error", "")})
+
+
+# --- Command line ---
+class _AddTransform(argparse.Action):
+    """Collects (name, args) transform specs in command-line order."""
+    def __call__(self, parser, namespace, values, option_string=None):
+        pipeline = getattr(namespace, self.dest) or []
+        try:
+            build([(self.const, values)])   # validates the patterns now
+        except re.error as e:
+            parser.error(f"invalid pattern {values[0]!r}: {e}")
+        pipeline.append((self.const, list(values)))
+        setattr(namespace, self.dest, pipeline)
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Copy files, optionally transforming them line by line.",
+        epilog="One file: written to --output. Several files, directories or globs: "
+               "written under --out-dir with the same relative paths.")
+    ap.add_argument("inputs", nargs="+", metavar="input", help="file, directory or quoted glob")
+    ap.add_argument("-o", "--output", default="output.txt", help="output file for a single input")
+    ap.add_argument("-d", "--out-dir", help="output directory (batch mode)")
+    ap.add_argument("--upper", dest="transforms", action=_AddTransform, nargs=0, const="upper")
+    ap.add_argument("--lower", dest="transforms", action=_AddTransform, nargs=0, const="lower")
+    ap.add_argument("--sub", dest="transforms", action=_AddTransform, nargs=2, const="sub",
+                    metavar=("PATTERN", "REPL"), help="regex substitution on every line")
+    ap.add_argument("--grep", dest="transforms", action=_AddTransform, nargs=1, const="grep",
+                    metavar="PATTERN", help="keep only lines matching PATTERN")
+    ap.add_argument("--grep-v", dest="transforms", action=_AddTransform, nargs=1, const="grep_v",
+                    metavar="PATTERN", help="drop lines matching PATTERN")
+    ap.add_argument("-j", "--workers", type=int, help="batch workers (default: CPU count)")
+    ap.add_argument("--pool", choices=["auto", "thread", "process"], default="auto",
+                    help="auto: threads for plain copies, processes when transforming")
+    ap.add_argument("--hash", action="store_true",
+                    help="when size or mtime changed, compare content hashes before redoing a file")
+    ap.add_argument("--report", help="per-file CSV report (batch mode)")
+    args = ap.parse_args(argv)
+    args.transforms = args.transforms or []
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    single = args.out_dir is None
+    if single and (len(args.inputs) > 1 or os.path.isdir(args.inputs[0]) or glob.has_magic(args.inputs[0])):
+        print("Several inputs: give an output directory with --out-dir")
+        return 2
+
+    if single:
+        file_name = args.inputs[0]
+        if not os.path.exists(file_name):
+            print(f"File: {file_name} not found. Cross Check file name")
+            return 1
+        try:
+            transform_file(file_name, args.output, build(args.transforms))
+        except FileNotFoundError as e:   # the input was checked above: the output side is missing
+            print(f"Could not write {args.output}: {e}")
+            return 1
+        except (IsADirectoryError, PermissionError) as e:
+            print(f"Could not process {file_name}: {e}")
+            return 1
+        print(f"Wrote {args.output}")
+        return 0
+
+    t0 = time.perf_counter()
+    try:
+        rows = run_batch(args.inputs, args.out_dir, args.transforms, args.workers, args.pool, args.hash)
+    except ValueError as e:
+        print(f"Cannot run the batch: {e}")
+        return 2
+    wall = time.perf_counter() - t0
+    if args.report:
+        write_report(rows, args.report)
+    counts = {s: sum(r["status"] == s for r in rows) for s in ["written", "skipped", "error"]}
+    written_mb = sum(r["bytes"] for r in rows) / 1e6
+    print(f"{counts['written']} written, {counts['skipped']} unchanged, {counts['error']} failed "
+          f"in {wall:.2f}s ({written_mb:.1f} MB, {written_mb / wall if wall else 0:.0f} MB/s)")
+    for r in rows:
+        if r["status"] == "error":
+            print(f"  ✗ {r['source']}: {r['error']}")
+    if not rows:
+        print("No input files matched.")
+    return 1 if counts["error"] else 0
 
-try:
-    with open(file_name, 'r') as f:
-        content = f.read()
-except FileNotFoundError:
-    print(f"File: {file_name} not found. Cross Check file name")
-except:
-    print("An error occured.")
 
-with open("output.txt", 'w') as f:
-    f.write(content)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,34 +6,45 @@ Use constructors to initialize each object with unique values.
 Add an inheritance layer to explore polymorphism or encapsulation.
 """
 
+# __slots__ on every class of a hierarchy keeps instances free of a per-object
+# __dict__ (about a third less memory each); subclasses that add no attributes declare
+# empty slots, otherwise they would bring the __dict__ back.
 class Smartphone:
+    __slots__ = ("__name", "__model", "__color")
+
     def __init__(self, name, model, color):
         self.__name = name
         self.__model = model
         self.__color = color
 
 class Apple(Smartphone):
-    
+    __slots__ = ()
+
     def ring(self):
         print("Ding ding ding")
 
 class Samsung(Smartphone):
+    __slots__ = ()
+
     def ring(self):
         print("Dong dong dong")
 
 class Xiaomi(Smartphone):
-    pass
+    __slots__ = ()
 
 class Redmi(Xiaomi):
+    __slots__ = ()
+
     def ring(self):
         print("Dang dang dang")
 
 
-iphone_X = Apple("Iphone X", "AIXXYFYTY655", "Gold Silver")
-galaxy_fold = Samsung("Galaxy Fold", "SFDNIKHFFD6165", "Sky Blue")
-redmi_note13 = Redmi("Redmi Note 13", "25GDDTHBVCF", "Ocean Sunset")
+if __name__ == "__main__":
+    iphone_X = Apple("Iphone X", "AIXXYFYTY655", "Gold Silver")
+    galaxy_fold = Samsung("Galaxy Fold", "SFDNIKHFFD6165", "Sky Blue")
+    redmi_note13 = Redmi("Redmi Note 13", "25GDDTHBVCF", "Ocean Sunset")
 
-redmi_note13.ring()
+    redmi_note13.ring()
 
 
 """Activity 2: Polymorphism Challenge! 🎭
@@ -41,32 +52,48 @@ redmi_note13.ring()
 Create a program that includes animals or vehicles with the same action (like move()). However, make each class define move() differently (for example, Car.move() prints "Driving" 🚗, while Plane.move() prints "Flying" ✈️).
 """
 
+# move_by() prints movement(); fleet.Fleet calls movement() once per (type, track)
+# pair for millions of vehicles, so movement() may only depend on the class and track.
 class Vehicle:
+    __slots__ = ("name", "model", "color", "track")
+
     def __init__(self, name, model, color, track):
         self.name = name
         self.model = model
         self.color = color
         self.track = track
 
-class Car(Vehicle):
     def move_by(self):
-        print(f"I move by {self.track}")
+        print(self.movement())
+
+class Car(Vehicle):
+    __slots__ = ()
+
+    def movement(self):
+        return f"I move by {self.track}"
 
 class Aeroplane(Vehicle):
-    def move_by(self):
-        print(f"I move by {self.track}")
+    __slots__ = ()
+
+    def movement(self):
+        return f"I move by {self.track}"
 
 class Train(Vehicle):
-    def move_by(self):
-        print(f"I move by {self.track}")
+    __slots__ = ()
+
+    def movement(self):
+        return f"I move by {self.track}"
 
 class Ship(Vehicle):
-    def move_by(self):
-        print(f"I move by {self.track}")
+    __slots__ = ()
+
+    def movement(self):
+        return f"I move by {self.track}"
 
-lexus = Car("Lexus", "Toyota", "Blue", "Road")
-air_ways = Aeroplane("Air_ways", "Air Peace", "Gradient White", "Air")
-train = Train("Railway AirWays", "Bullet Train", "Ash", "Railway")
-boat = Ship("Boat Ways", "Marine Blue", "Off White", "Water")
+if __name__ == "__main__":
+    lexus = Car("Lexus", "Toyota", "Blue", "Road")
+    air_ways = Aeroplane("Air_ways", "Air Peace", "Gradient White", "Air")
+    train = Train("Railway AirWays", "Bullet Train", "Ash", "Railway")
+    boat = Ship("Boat Ways", "Marine Blue", "Off White", "Water")
 
-air_ways.move_by()
+    air_ways.move_by()
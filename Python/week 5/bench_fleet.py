@@ -0,0 +1,130 @@
+"""
+Memory per vehicle and bulk-operation speed: dict-backed classes vs __slots__ vs Fleet.
+
+Builds --n vehicles (unique names; 20 models, 12 colors, one track per type) as
+- dict:   the original OOP.py classes (attributes in a per-object __dict__)
+- slots:  the current OOP.py classes (__slots__)
+- fleet:  fleet.Fleet (code arrays + string pools)
+and reports build time, the memory tracemalloc attributes to the container (the
+input strings exist beforehand and are not counted), and two bulk operations:
+- count Road:  how many vehicles move by road
+- move_by:     every vehicle's move_by() line, printed to /dev/null (Fleet: its
+               move_by() messages joined and written in one call)
+
+Usage:
+    python bench_fleet.py [--n 1000000]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+import OOP
+from fleet import Fleet
+
+
+# --- The original, dict-backed classes ---
+class DictVehicle:
+    def __init__(self, name, model, color, track):
+        self.name = name
+        self.model = model
+        self.color = color
+        self.track = track
+
+class DictCar(DictVehicle):
+    def move_by(self):
+        print(f"I move by {self.track}")
+
+class DictAeroplane(DictVehicle):
+    def move_by(self):
+        print(f"I move by {self.track}")
+
+class DictTrain(DictVehicle):
+    def move_by(self):
+        print(f"I move by {self.track}")
+
+class DictShip(DictVehicle):
+    def move_by(self):
+        print(f"I move by {self.track}")
+
+
+KINDS = {
+    "dict": [DictCar, DictAeroplane, DictTrain, DictShip],
+    "slots": [OOP.Car, OOP.Aeroplane, OOP.Train, OOP.Ship],
+}
+TRACKS = ["Road", "Air", "Railway", "Water"]
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(4, n, p=[0.7, 0.05, 0.1, 0.15])
+    models = [f"Model {i}" for i in range(20)]
+    colors = ["Blue", "Red", "Ash", "Gold", "White", "Black", "Green", "Grey", "Silver", "Sky Blue",
+              "Off White", "Ocean"]
+    return (kinds.tolist(), [f"Vehicle {i}" for i in range(n)],
+            [models[i] for i in rng.integers(0, 20, n)], [colors[i] for i in rng.integers(0, 12, n)])
+
+
+def build_objects(classes, kinds, names, models, colors):
+    return [classes[k](name, model, color, TRACKS[k]) for k, name, model, color in zip(kinds, names, models, colors)]
+
+
+def build_fleet(kinds, names, models, colors):
+    fleet = Fleet(capacity=len(kinds))
+    kinds_arr = np.asarray(kinds)
+    for k, cls in enumerate(KINDS["slots"]):
+        idx = np.flatnonzero(kinds_arr == k).tolist()
+        fleet.extend(cls, [names[i] for i in idx], [models[i] for i in idx], [colors[i] for i in idx], TRACKS[k])
+    return fleet
+
+
+def measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    secs = time.perf_counter() - t0
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, secs, size
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=1_000_000)
+    args = ap.parse_args()
+    kinds, names, models, colors = make_inputs(args.n)
+
+    rows = []
+    with open(os.devnull, "w") as devnull:
+        for label in ["dict", "slots"]:
+            objs, build_s, size = measure(lambda: build_objects(KINDS[label], kinds, names, models, colors))
+            count_s, road = timed(lambda: sum(v.track == "Road" for v in objs))
+            with contextlib.redirect_stdout(devnull):
+                move_s, _ = timed(lambda: [v.move_by() for v in objs])
+            rows.append((label, build_s, size, count_s, move_s, road))
+            del objs
+
+        fleet, build_s, size = measure(lambda: build_fleet(kinds, names, models, colors))
+        count_s, road = timed(lambda: fleet.count(track="Road"))
+        move_s, _ = timed(lambda: devnull.write("\n".join(fleet.move_by()) + "\n"))
+        rows.append(("fleet", build_s, size, count_s, move_s, road))
+
+    assert len({r[-1] for r in rows}) == 1, "containers disagree"
+    print(f"{args.n:,} vehicles\n")
+    print(f"{'container':<10}{'build s':>9}{'bytes/vehicle':>15}{'count Road s':>14}{'move_by s':>11}")
+    for label, build_s, size, count_s, move_s, _ in rows:
+        print(f"{label:<10}{build_s:>9.2f}{size / args.n:>15.0f}{count_s:>14.4f}{move_s:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
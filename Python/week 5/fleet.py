@@ -0,0 +1,192 @@
+"""Fleet: millions of vehicles as a struct of arrays
+
+A Fleet does not keep one Vehicle object per vehicle. It keeps one NumPy array
+per attribute:
+    kind    uint8   index into VEHICLE_TYPES (Car, Aeroplane, Train, Ship)
+    name    object  the name strings (names are mostly unique, so pooling them saves nothing)
+    model   int32   code into the model pool
+    color   int32   code into the color pool
+    track   int32   code into the track pool
+Each distinct model, color and track string is stored once in a StringPool. "Blue"
+shared by a million cars is one string and a million 4-byte codes.
+
+move_by() dispatches by type in vectorized form. It calls each class's movement()
+once per (type, track) pair that occurs, on a stand-in vehicle, and indexes the
+resulting messages with the pair codes. Rows that need real objects can be
+materialized with fleet[i] or iteration.
+
+    fleet = Fleet()
+    fleet.extend(Car, names, "Toyota", colors, "Road")   # scalars broadcast
+    fleet.add(Ship("Boat Ways", "Marine Blue", "Off White", "Water"))
+    messages = fleet.move_by()                           # one per vehicle
+    fleet.count(track="Road")
+"""
+
+import numpy as np
+
+from OOP import Aeroplane, Car, Ship, Train, Vehicle
+
+VEHICLE_TYPES = (Car, Aeroplane, Train, Ship)
+_KIND = {cls: code for code, cls in enumerate(VEHICLE_TYPES)}
+_FIELDS = ("name", "model", "color", "track")
+_POOLED = {"model": np.int32, "color": np.int32, "track": np.int32}
+
+
+class StringPool:
+    """Interned strings and their integer codes."""
+    __slots__ = ("strings", "_codes")
+
+    def __init__(self):
+        self.strings = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def codes(self, values) -> np.ndarray:
+        get = self._codes.get
+        out = [get(v) for v in values]
+        if None in out:   # new strings; the slower path only runs for those
+            out = [self.code(v) if c is None else c for v, c in zip(values, out)]
+        return np.array(out, dtype=np.int64)
+
+    def lookup(self, codes) -> np.ndarray:
+        return np.array(self.strings, dtype=object)[codes]
+
+
+class Fleet:
+    __slots__ = ("_size", "_kind", "_names", "_columns", "pools")
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._kind = np.zeros(capacity, dtype=np.uint8)
+        self._names = np.empty(capacity, dtype=object)
+        self._columns = {f: np.zeros(capacity, dtype=t) for f, t in _POOLED.items()}
+        self.pools = {f: StringPool() for f in _POOLED}
+
+    @classmethod
+    def from_vehicles(cls, vehicles):
+        fleet = cls()
+        by_kind = {}
+        for v in vehicles:
+            by_kind.setdefault(type(v), []).append(v)
+        for kind, group in by_kind.items():
+            fleet.extend(kind, *([getattr(v, f) for v in group] for f in _FIELDS))
+        return fleet
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the arrays (capacity included) and all strings they refer to."""
+        arrays = self._kind.nbytes + self._names.nbytes + sum(a.nbytes for a in self._columns.values())
+        names = sum(s.__sizeof__() for s in self._names[:self._size])
+        pooled = sum(s.__sizeof__() for pool in self.pools.values() for s in pool.strings)
+        return arrays + names + pooled
+
+    # --- Adding vehicles ---
+    def _reserve(self, n):
+        need = self._size + n
+        if need <= len(self._kind):
+            return
+        capacity = max(need, 2 * len(self._kind))
+        self._kind = np.resize(self._kind, capacity)
+        self._names = np.resize(self._names, capacity)
+        self._columns = {f: np.resize(a, capacity) for f, a in self._columns.items()}
+
+    def extend(self, kind, names, models, colors, tracks):
+        """
+        Appends vehicles of one class. Any of the attribute arguments may be a single
+        string, shared by all of them; the lists must have the same length.
+        """
+        if kind not in _KIND:
+            raise TypeError(f"Fleet holds {', '.join(c.__name__ for c in VEHICLE_TYPES)}, not {kind!r}")
+        values = dict(zip(_FIELDS, (names, models, colors, tracks)))
+        lengths = {len(v) for v in values.values() if not isinstance(v, str)}
+        if len(lengths) > 1:
+            raise ValueError(f"Attribute lists of different lengths: {sorted(lengths)}")
+        n = lengths.pop() if lengths else 1
+        self._reserve(n)
+        start, stop = self._size, self._size + n
+        self._kind[start:stop] = _KIND[kind]
+        self._names[start:stop] = names
+        codes = {}
+        for field, value in values.items():
+            if field == "name":
+                continue
+            pool = self.pools[field]
+            codes[field] = pool.code(value) if isinstance(value, str) else pool.codes(value)
+            # Codes past the dtype would wrap around and decode to another string
+            if len(pool) - 1 > np.iinfo(_POOLED[field]).max:
+                raise OverflowError(f"More distinct {field} values than {np.dtype(_POOLED[field])} codes can hold")
+        for field, code in codes.items():
+            self._columns[field][start:stop] = code
+        self._size = stop
+
+    def add(self, vehicle: Vehicle):
+        self.extend(type(vehicle), vehicle.name, vehicle.model, vehicle.color, vehicle.track)
+
+    # --- Reading ---
+    def codes(self, field) -> np.ndarray:
+        """Code array of 'kind', 'model', 'color' or 'track' (a view)."""
+        return self._kind[:self._size] if field == "kind" else self._columns[field][:self._size]
+
+    def values(self, field) -> np.ndarray:
+        """Strings (or classes, for 'kind') of an attribute, one per vehicle."""
+        if field == "kind":
+            return np.array(VEHICLE_TYPES, dtype=object)[self.codes("kind")]
+        if field == "name":
+            return self._names[:self._size]
+        return self.pools[field].lookup(self.codes(field))
+
+    def __getitem__(self, i) -> Vehicle:
+        if not -self._size <= i < self._size:
+            raise IndexError(i)
+        i %= self._size
+        cls = VEHICLE_TYPES[self._kind[i]]
+        return cls(self._names[i], *(self.pools[f].strings[self._columns[f][i]] for f in _POOLED))
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def mask(self, kind=None, **attributes) -> np.ndarray:
+        """Boolean mask of the vehicles matching a class and/or attribute strings."""
+        mask = np.ones(self._size, dtype=bool)
+        if kind is not None:
+            mask &= self.codes("kind") == _KIND[kind]
+        for field, value in attributes.items():
+            if field == "name":
+                mask &= self._names[:self._size] == value
+                continue
+            code = self.pools[field]._codes.get(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= self.codes(field) == code
+        return mask
+
+    def count(self, kind=None, **attributes) -> int:
+        return int(self.mask(kind, **attributes).sum())
+
+    # --- Vectorized dispatch ---
+    def move_by(self) -> np.ndarray:
+        """Each vehicle's movement() message, computed once per (type, track) pair."""
+        n_tracks = max(len(self.pools["track"]), 1)
+        pair = self.codes("kind").astype(np.intp) * n_tracks + self.codes("track")
+        # The pair space is small (types x tracks): a lookup table, no sort
+        table = np.empty(len(VEHICLE_TYPES) * n_tracks, dtype=object)
+        seen = np.zeros(len(table), dtype=bool)
+        seen[pair] = True
+        tracks = self.pools["track"].strings
+        for p in np.flatnonzero(seen).tolist():
+            kind, track = divmod(p, n_tracks)
+            table[p] = VEHICLE_TYPES[kind](None, None, None, tracks[track]).movement()
+        return table[pair]
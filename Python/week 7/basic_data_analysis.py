@@ -1,11 +1,20 @@
 # Analyzing Data with Pandas and Visualizing Results with Matplotlib
 # Dataset: Iris dataset from sklearn
 
+import sys
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.datasets import load_iris
 
+from profiling import profile_frame
+
+# Shared plot helpers: aggregate large data before drawing; PLOT_HEADLESS=1 saves PNGs instead
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))
+import plot_agg
+
 # Optional: Display plots inline if using a notebook
 # %matplotlib inline
 
@@ -32,8 +41,12 @@ print(df.head())
 print("\n🔹 Data types:")
 print(df.dtypes)
 
+# One pass collects the missing values, statistics and group means below;
+# python profiling.py data.csv --group-by species does the same for large CSVs
+profile = profile_frame(df, group_by='species')
+
 print("\n🔹 Missing values in each column:")
-print(df.isnull().sum())
+print(profile.null_counts())
 
 # Since Iris has no missing values, we just ensure it's clean
 
@@ -43,11 +56,11 @@ print(df.isnull().sum())
 
 # Descriptive statistics
 print("\n🔹 Basic statistics of the dataset:")
-print(df.describe())
+print(profile.describe())
 
 # Group by species and calculate mean
 print("\n🔹 Mean values grouped by species:")
-grouped = df.groupby('species').mean()
+grouped = profile.group_means()
 print(grouped)
 
 # Identify interesting patterns
@@ -71,7 +84,7 @@ plt.xlabel('Species')
 plt.ylabel('Petal Length (cm)')
 plt.grid(True)
 plt.tight_layout()
-plt.show()
+plot_agg.show()
 
 # 2. Bar chart: Average sepal width per species
 plt.figure()
@@ -80,25 +93,27 @@ plt.title('Average Sepal Width by Species')
 plt.xlabel('Species')
 plt.ylabel('Sepal Width (cm)')
 plt.tight_layout()
-plt.show()
+plot_agg.show()
 
 # 3. Histogram: Distribution of petal length
 plt.figure()
-plt.hist(df['petal length (cm)'], bins=15, color='coral', edgecolor='black')
+plot_agg.hist(plt.gca(), df['petal length (cm)'], bins=15, key='petal length (cm)', color='coral', edgecolor='black')
 plt.title('Distribution of Petal Length')
 plt.xlabel('Petal Length (cm)')
 plt.ylabel('Frequency')
 plt.tight_layout()
-plt.show()
+plot_agg.show()
 
 # 4. Scatter plot: Sepal Length vs. Petal Length
 plt.figure()
-sns.scatterplot(data=df, x='sepal length (cm)', y='petal length (cm)', hue='species', palette='deep')
+# Points up to plot_agg.MAX_POINTS, a per-species density image beyond that
+plot_agg.scatter(plt.gca(), df['sepal length (cm)'], df['petal length (cm)'], hue=df['species'],
+                 palette=sns.color_palette('deep'))
 plt.title('Sepal Length vs. Petal Length by Species')
 plt.xlabel('Sepal Length (cm)')
 plt.ylabel('Petal Length (cm)')
 plt.tight_layout()
-plt.show()
+plot_agg.show()
 
 # -------------------------------
 # Final Notes
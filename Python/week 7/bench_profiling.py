@@ -0,0 +1,156 @@
+"""
+Iris parity, then scaling: pandas' three passes vs profiling.profile_csv.
+
+Parity: profile_frame on Iris (whole, in 7-row chunks, and as two merged halves)
+must give exactly df.describe(), df.isnull().sum() and
+df.groupby('species').mean().
+
+Scaling: for each --rows, a synthetic CSV (4 float columns with ~2% missing
+values, a 20-group key) is profiled in a fresh process, either by
+    pandas:   read_csv, then describe(), isnull().sum(), groupby().mean()
+    profile:  profile_csv in --chunksize chunks (and --workers processes)
+The table reports wall time, peak RSS above the interpreter baseline, and the
+largest quantile error in the profile as a rank difference (fraction of rows).
+The run fails (non-zero exit) if the profile's count, mean, std, min or max
+differ from pandas' beyond float rounding, or its quantile rank error is above
+--max-rank-error.
+
+Usage:
+    python bench_profiling.py [--rows 1000000 4000000 16000000] [--chunksize 1000000] [--workers 1]
+"""
+
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["a", "b", "c", "d"]
+EXACT_STATS = ["count", "mean", "std", "min", "max"]
+
+
+def _status_mb(field) -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024   # KiB
+
+
+def reset_peak_rss():
+    # ru_maxrss survives fork + exec, so a spawned child would start at the parent's
+    # peak (the parent writes the CSVs). Reset the high-water mark instead.
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def peak_rss_mb() -> float:
+    return _status_mb("VmHWM")
+
+
+def iris_parity():
+    from sklearn.datasets import load_iris
+
+    from profiling import profile_frame
+
+    iris = load_iris()
+    df = pd.DataFrame(iris.data, columns=iris.feature_names)
+    df['species'] = pd.Categorical.from_codes(iris.target, iris.target_names)
+    halves = profile_frame(df.iloc[:70], "species").merge(profile_frame(df.iloc[70:], "species"))
+    for label, profile in [("whole", profile_frame(df, "species")),
+                           ("7-row chunks", profile_frame(df, "species", chunksize=7)),
+                           ("merged halves", halves)]:
+        pd.testing.assert_frame_equal(profile.describe(), df.describe())
+        pd.testing.assert_series_equal(profile.null_counts(), df.isnull().sum())
+        pd.testing.assert_frame_equal(profile.group_means(), df.groupby('species', observed=False).mean())
+        print(f"Iris parity ({label}): ok")
+
+
+def write_csv(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    block = 1_000_000
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        df = pd.DataFrame({
+            "group": rng.integers(0, 20, n).astype(str),
+            "a": rng.normal(0, 1, n),
+            "b": rng.exponential(3, n),
+            "c": rng.uniform(-50, 50, n),
+            "d": rng.integers(0, 1000, n).astype(float),
+        })
+        for col in COLUMNS:
+            df.loc[rng.random(n) < 0.02, col] = np.nan
+        df.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False, float_format="%.6g")
+
+
+def run(mode, path, chunksize, workers, out):
+    reset_peak_rss()
+    base = _status_mb("VmRSS")
+    t0 = time.perf_counter()
+    if mode == "pandas":
+        df = pd.read_csv(path)
+        stats = df.describe()
+        df.isnull().sum()
+        df.groupby("group").mean()
+        error = 0.0
+    else:
+        from profiling import profile_csv
+
+        stats = profile_csv(path, "group", chunksize=chunksize, workers=workers).describe()
+        error = None
+    secs, rss = time.perf_counter() - t0, peak_rss_mb() - base
+    if error is None:   # outside the timing: rank error of the sketch quantiles
+        df = pd.read_csv(path, usecols=COLUMNS)
+        error = 0.0
+        for col in COLUMNS:
+            values = np.sort(df[col].dropna().to_numpy())
+            for q in ("25%", "50%", "75%"):
+                rank = np.searchsorted(values, stats.loc[q, col]) / len(values)
+                error = max(error, abs(rank - float(q[:-1]) / 100))
+    out.put((mode, secs, rss, error, stats.loc[EXACT_STATS, COLUMNS]))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 4_000_000, 16_000_000])
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--dir", default=tempfile.gettempdir())
+    ap.add_argument("--max-rank-error", type=float, default=0.01)
+    args = ap.parse_args()
+
+    iris_parity()
+    ctx = mp.get_context("spawn")
+    results, failures = [], []
+    for rows in args.rows:
+        path = Path(args.dir) / f"bench_profile_{rows}.csv"
+        print(f"Writing {path} ...")
+        write_csv(path, rows)
+        stats = {}
+        for mode in ("pandas", "profile"):
+            q = ctx.Queue()
+            p = ctx.Process(target=run, args=(mode, path, args.chunksize, args.workers, q))
+            p.start()
+            mode, secs, rss, error, stats[mode] = q.get()
+            p.join()
+            results.append((rows, mode, secs, rss, error))
+            if error > args.max_rank_error:
+                failures.append(f"{rows:,} rows: quantile rank error {error:.5f} > {args.max_rank_error}")
+        path.unlink()
+        try:
+            pd.testing.assert_frame_equal(stats["profile"], stats["pandas"], rtol=1e-9)
+        except AssertionError as e:
+            failures.append(f"{rows:,} rows: profile stats differ from describe():\n{e}")
+
+    print(f"\n{'rows':>12}  {'mode':<8}{'seconds':>9}{'peak RSS MB':>13}{'quantile rank err':>19}")
+    for rows, mode, secs, rss, error in results:
+        print(f"{rows:>12,}  {mode:<8}{secs:>9.2f}{rss:>13.0f}{error:>19.5f}")
+    if failures:
+        raise SystemExit("FAIL: " + "\nFAIL: ".join(failures))
+    print("OK: profile matches pandas within tolerance")
+
+
+if __name__ == "__main__":
+    main()
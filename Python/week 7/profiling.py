@@ -0,0 +1,336 @@
+"""
+One-pass profiling: describe(), isnull().sum() and groupby(...).mean() over chunks
+
+basic_data_analysis.py used to run three separate passes over a DataFrame that
+was fully loaded into memory. Profile collects all three in one pass over
+chunks of any size. Its state is a few arrays per numeric column, so memory
+does not grow with the number of rows:
+- count, null count, min and max;
+- mean and variance, merged chunk by chunk with the parallel form of Welford's
+  update (Chan et al.);
+- a QuantileSketch per column for 25%/50%/75%;
+- per-group sums and non-null counts for the group means.
+
+Profiles are mergeable. Profile.merge() combines partial results from
+different chunks, files or processes, and profile_csv(workers=N) uses it to
+split one CSV into byte ranges.
+
+The output matches pandas. describe(), null_counts() and group_means() return
+the same frames as df.describe(), df.isnull().sum() and
+df.groupby(key).mean(). Quantiles are exact until a column has more than
+QuantileSketch.k values per level. After that they are approximate.
+
+    profile = profile_frame(df, group_by="species")
+    profile.describe()
+
+    python profiling.py big.csv --group-by species --workers 4
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DESCRIBE_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+# --- Quantiles ---
+class QuantileSketch:
+    """
+    KLL-style compactor sketch. Level h holds values of weight 2**h. When a level
+    has more than k values, it is sorted and every other value (from a random
+    offset) moves up one level. The rank error stays around log2(n / k) / k.
+    Sketches merge level by level. Before the first compaction, level 0 holds
+    every value and quantiles are exact, interpolated the same way pandas does.
+    """
+    __slots__ = ("k", "levels", "_rng")
+
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return sum(len(level) << h for h, level in enumerate(self.levels))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values[~np.isnan(values)]])
+        self._compact()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compact()
+        return self
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                odd = len(level) % 2
+                keep, pairs = level[:odd], level[odd:]
+                promoted = pairs[self._rng.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype=np.float64)
+        if len(self.levels) == 1:
+            if not len(self.levels[0]):
+                return np.full(qs.shape, np.nan)
+            return np.quantile(self.levels[0], qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 1 << h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        # Rank q * (n - 1) lands in the item whose weight covers it
+        pos = np.searchsorted(cumulative, qs * (cumulative[-1] - 1), side="right")
+        return values[np.minimum(pos, len(values) - 1)]
+
+
+# --- Profile ---
+class Profile:
+    def __init__(self, columns=None, group_by=None, k=4096):
+        self.columns = None if columns is None else list(columns)   # numeric, decided by the first chunk
+        self.group_by = group_by
+        self.k = k
+        self.rows = 0
+        self.nulls = pd.Series(dtype=np.int64)
+        self.groups = []               # group labels, in order of appearance
+        self.group_order = None        # a categorical key's categories, if any
+        self._group_ids = {}
+
+    def _init_columns(self, chunk):
+        if self.columns is None:
+            numeric = chunk.select_dtypes("number").columns
+            self.columns = [c for c in numeric if c != self.group_by]
+        c = len(self.columns)
+        self.count = np.zeros(c, dtype=np.int64)
+        self.mean = np.zeros(c)
+        self.m2 = np.zeros(c)
+        self.min = np.full(c, np.inf)
+        self.max = np.full(c, -np.inf)
+        self.sketches = [QuantileSketch(self.k, seed=i) for i in range(c)]
+        self.group_sum = np.zeros((0, c))
+        self.group_count = np.zeros((0, c), dtype=np.int64)
+
+    def _values(self, chunk) -> np.ndarray:
+        cols = [chunk[c] if pd.api.types.is_numeric_dtype(chunk[c]) else pd.to_numeric(chunk[c], errors="coerce")
+                for c in self.columns]
+        return np.column_stack([np.asarray(c, dtype=np.float64) for c in cols]) if cols \
+            else np.empty((len(chunk), 0))
+
+    # --- Updates ---
+    def update(self, chunk: pd.DataFrame):
+        if not hasattr(self, "count"):
+            self._init_columns(chunk)
+        self.rows += len(chunk)
+        self._add_nulls(chunk.isnull().sum())
+        x = self._values(chunk)
+        ok = ~np.isnan(x)
+        n = ok.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(ok, x, 0).sum(axis=0) / n
+            m2 = np.where(ok, (x - mean) ** 2, 0).sum(axis=0)
+        self._combine(n, np.nan_to_num(mean), m2,
+                      np.where(ok, x, np.inf).min(axis=0, initial=np.inf),
+                      np.where(ok, x, -np.inf).max(axis=0, initial=-np.inf))
+        for sketch, column in zip(self.sketches, x.T):
+            sketch.update(column)
+        if self.group_by is not None:
+            self._update_groups(chunk[self.group_by], x, ok)
+        return self
+
+    def _add_nulls(self, counts):
+        index = self.nulls.index.union(counts.index, sort=False)   # keeps the column order
+        self.nulls = (self.nulls.reindex(index, fill_value=0) + counts.reindex(index, fill_value=0)).astype(np.int64)
+
+    def _combine(self, n, mean, m2, lo, hi):
+        """Chan et al.: merges (n, mean, M2) of two partitions without revisiting the rows."""
+        total = self.count + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            share = np.where(total > 0, n / total, 0)
+            self.mean = self.mean + delta * share
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * share
+        self.count = total
+        self.min = np.minimum(self.min, lo)
+        self.max = np.maximum(self.max, hi)
+
+    def _group_rows(self, labels):
+        ids = np.empty(len(labels), dtype=np.intp)
+        for i, label in enumerate(labels):
+            if label not in self._group_ids:
+                self._group_ids[label] = len(self.groups)
+                self.groups.append(label)
+            ids[i] = self._group_ids[label]
+        grow = len(self.groups) - len(self.group_sum)
+        if grow:
+            self.group_sum = np.vstack([self.group_sum, np.zeros((grow, len(self.columns)))])
+            self.group_count = np.vstack([self.group_count, np.zeros((grow, len(self.columns)), np.int64)])
+        return ids
+
+    def _update_groups(self, key, x, ok):
+        if isinstance(key.dtype, pd.CategoricalDtype) and self.group_order is None:
+            self.group_order = list(key.cat.categories)
+        codes, labels = pd.factorize(key)   # NaN keys get -1 and are dropped, like groupby
+        has_key = codes >= 0
+        rows = self._group_rows(list(labels))[codes[has_key]]
+        for j in range(len(self.columns)):
+            valid = ok[has_key, j]
+            g = len(self.groups)
+            self.group_sum[:, j] += np.bincount(rows[valid], x[has_key, j][valid], minlength=g)
+            self.group_count[:, j] += np.bincount(rows[valid], minlength=g)
+
+    def merge(self, other: "Profile"):
+        """Folds in a Profile of other rows with the same columns and group key."""
+        if not hasattr(other, "count"):
+            return self
+        if not hasattr(self, "count"):
+            self.columns = other.columns
+            self._init_columns(None)
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge profiles of different columns: {self.columns} vs {other.columns}")
+        self.rows += other.rows
+        self._add_nulls(other.nulls)
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        for mine, theirs in zip(self.sketches, other.sketches):
+            mine.merge(theirs)
+        if other.groups:
+            self.group_order = self.group_order or other.group_order
+            rows = self._group_rows(other.groups)
+            np.add.at(self.group_sum, rows, other.group_sum)
+            np.add.at(self.group_count, rows, other.group_count)
+        return self
+
+    # --- Results, in pandas' format ---
+    def describe(self) -> pd.DataFrame:
+        if not hasattr(self, "count"):
+            raise ValueError("Profile has no rows yet")
+        stats = {"count": self.count.astype(np.float64)}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats["mean"] = np.where(self.count > 0, self.mean, np.nan)
+            stats["std"] = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+        stats["min"] = np.where(self.count > 0, self.min, np.nan)
+        percentiles = np.array([s.quantiles(DESCRIBE_PERCENTILES) for s in self.sketches])
+        for q, values in zip(DESCRIBE_PERCENTILES, percentiles.reshape(-1, len(DESCRIBE_PERCENTILES)).T):
+            stats[f"{q * 100:g}%"] = values
+        stats["max"] = np.where(self.count > 0, self.max, np.nan)
+        return pd.DataFrame(stats, index=self.columns).T
+
+    def null_counts(self) -> pd.Series:
+        return self.nulls.astype(np.int64)
+
+    def group_means(self) -> pd.DataFrame:
+        if self.group_by is None:
+            raise ValueError("Profile was built without group_by")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = pd.DataFrame(self.group_sum / self.group_count, index=self.groups, columns=self.columns)
+        if self.group_order is not None:
+            index = pd.CategoricalIndex(self.group_order, categories=self.group_order, name=self.group_by)
+            return means.reindex(self.group_order).set_axis(index)
+        return means.sort_index().rename_axis(self.group_by)
+
+
+def profile_frame(df, group_by=None, chunksize=1_000_000, k=4096) -> Profile:
+    """Profiles an in-memory DataFrame in row chunks."""
+    profile = Profile(group_by=group_by, k=k)
+    for start in range(0, max(len(df), 1), chunksize):
+        profile.update(df.iloc[start:start + chunksize])
+    return profile
+
+
+# --- CSV files ---
+class _ByteRange:
+    """File object that reads from start to end only, starting at a line boundary."""
+
+    def __init__(self, path, start, end):
+        self.f = open(path, "rb")
+        if start:
+            # Back one byte: if start is a line start, readline() only eats the previous newline
+            self.f.seek(start - 1)
+            self.f.readline()   # a line that straddles start belongs to the previous range
+        self.remaining = end - self.f.tell()
+
+    def read(self, n=-1):
+        if self.remaining <= 0:
+            return b""
+        data = self.f.read(self.remaining if n is None or n < 0 else min(n, self.remaining))
+        self.remaining -= len(data)
+        if self.remaining <= 0 and data and not data.endswith(b"\n"):
+            data += self.f.readline()   # finish the last line
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def _profile_range(path, start, end, names, columns, group_by, chunksize, k, read_csv_kwargs):
+    source = _ByteRange(path, start, end)
+    try:
+        profile = Profile(columns, group_by, k)
+        if source.remaining > 0:
+            for chunk in pd.read_csv(source, header=None, names=names, chunksize=chunksize, **read_csv_kwargs):
+                profile.update(chunk)
+        return profile
+    finally:
+        source.close()
+
+
+def profile_csv(path, group_by=None, chunksize=1_000_000, workers=1, k=4096, **read_csv_kwargs) -> Profile:
+    """
+    Streams a CSV through a Profile. With workers > 1, the data is split into byte
+    ranges at line boundaries, profiled in separate processes and merged.
+    """
+    head = pd.read_csv(path, nrows=10_000, **read_csv_kwargs)
+    columns = [c for c in head.select_dtypes("number").columns if c != group_by]
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+    size = os.path.getsize(path)
+    parts = max(1, workers * 4) if workers > 1 else 1
+    bounds = np.linspace(data_start, size, parts + 1).astype(np.int64).tolist()
+    jobs = [(path, s, e, list(head.columns), columns, group_by, chunksize, k, read_csv_kwargs)
+            for s, e in zip(bounds[:-1], bounds[1:])]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            partials = list(pool.map(_profile_range, *zip(*jobs)))
+    else:
+        partials = [_profile_range(*job) for job in jobs]
+    profile = Profile(columns, group_by, k)
+    for partial in partials:
+        profile.merge(partial)
+    return profile
+
+
+def main():
+    ap = argparse.ArgumentParser(description="One-pass describe / null counts / group means of a CSV")
+    ap.add_argument("csv")
+    ap.add_argument("--group-by")
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    profile = profile_csv(args.csv, args.group_by, args.chunksize, args.workers)
+    print(f"🔹 {profile.rows:,} rows\n")
+    print("🔹 Missing values in each column:")
+    print(profile.null_counts())
+    print("\n🔹 Basic statistics of the dataset:")
+    print(profile.describe())
+    if args.group_by:
+        print(f"\n🔹 Mean values grouped by {args.group_by}:")
+        print(profile.group_means())
+
+
+if __name__ == "__main__":
+    main()
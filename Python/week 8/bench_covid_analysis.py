@@ -0,0 +1,105 @@
+"""
+Per-country series extraction: boolean mask per country and metric vs CountryPanel.
+
+Loads a synthetic compact.csv (owid_sample.py) for --countries countries with
+covid_loader, then times getting every country's series for the tracker's plot
+metrics plus the derived ones:
+- mask:   df[df['country'] == c][metric] for each country and metric (the original
+          script's loops), death rate through a column + groupby mean, 7-day new
+          cases per million through groupby().rolling()
+- panel:  CountryPanel(df) (one sort), then panel.get(metric)[c] for the same series
+Both produce the same values; the script checks that before printing the timings.
+
+Usage:
+    python bench_covid_analysis.py [--days 1700] [--countries 4,50,255] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import covid_loader
+from covid_analysis import CountryPanel
+
+METRICS = ["total_cases", "total_deaths", "new_cases", "total_vaccinations"]
+
+
+def with_mask(df, countries):
+    out = {}
+    for metric in METRICS:
+        for c in countries:
+            country_data = df[df["country"] == c]
+            out[metric, c] = country_data[metric].to_numpy()
+    rate = df["total_deaths"] / df["total_cases"].where(df["total_cases"] > 0)
+    out["death_rate"] = rate.groupby(df["country"], observed=True).mean()
+    per_million = df["new_cases"] / df["population"] * 1e6
+    rolled = per_million.groupby(df["country"], observed=True).rolling(7, min_periods=1).mean()
+    for c in countries:
+        out["new_cases_7d_per_million", c] = rolled.loc[c].to_numpy()
+    return out
+
+
+def with_panel(df, countries):
+    panel = CountryPanel(df)
+    out = {}
+    for metric in METRICS:
+        data = panel.get(metric)
+        for c in countries:
+            out[metric, c] = data[c].to_numpy()
+    out["death_rate"] = panel.get("death_rate").mean()
+    rolled = panel.get("new_cases_7d_per_million")
+    for c in countries:
+        out["new_cases_7d_per_million", c] = rolled[c].to_numpy()
+    return out
+
+
+def check(a, b):
+    # The sample has one row per country and day, so the matrices have no holes
+    for key, expected in a.items():
+        if key == "death_rate":
+            got = b[key][expected.index]
+            assert np.allclose(got, expected, rtol=1e-5, equal_nan=True), key
+        else:
+            assert np.allclose(b[key], expected, rtol=1e-4, equal_nan=True), key
+
+
+def timed(fn, df, countries, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(df, countries)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=1700)
+    ap.add_argument("--countries", default="4,50,255")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    from owid_sample import generate
+
+    source = Path(tempfile.gettempdir()) / f"owid_compact_{args.days}d.csv"
+    if not source.exists():
+        print(f"Writing {source} ...")
+        generate(days=args.days).to_csv(source, index=False)
+    df_all = covid_loader.load_csv(source)
+    names = list(df_all["country"].cat.categories)
+
+    print(f"{'countries':>10}{'rows':>10}{'mask s':>10}{'panel s':>10}{'speedup':>9}")
+    for n in [int(x) for x in args.countries.split(",")]:
+        countries = names[:n]
+        df = covid_loader.apply_dtypes(df_all[df_all["country"].isin(countries)].reset_index(drop=True))
+        t_mask, a = timed(with_mask, df, countries, args.repeat)
+        t_panel, b = timed(with_panel, df, countries, args.repeat)
+        check(a, b)
+        print(f"{n:>10}{len(df):>10,}{t_mask:>10.3f}{t_panel:>10.3f}{t_mask / t_panel:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
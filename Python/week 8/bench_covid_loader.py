@@ -0,0 +1,76 @@
+"""
+Parse time and peak RSS: pd.read_csv(source) + filter vs covid_loader.load_csv.
+
+Runs each loader in a fresh process on a synthetic compact.csv (owid_sample.py,
+255 countries x --days days, 61 columns):
+- read_csv + isin:     the original script (every column, default dtypes)
+- load_csv, 4:         usecols + dtypes + chunked country filter, tracker's 4 countries
+- load_csv, all:       same, every country (memory then scales with the selection)
+
+Usage:
+    python bench_covid_loader.py [--days 1700] [--chunksize 100000] [--keep]
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+COUNTRIES = ['Kenya', 'United States', 'India', 'Nigeria']
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def run(mode, source, chunksize, out):
+    import pandas as pd
+    import covid_loader
+
+    base = peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode == "read_csv + isin":
+        df = pd.read_csv(source)
+        df = df[df['country'].isin(COUNTRIES)]
+    elif mode == "load_csv, 4":
+        df = covid_loader.load_csv(source, COUNTRIES, chunksize=chunksize)
+    else:
+        df = covid_loader.load_csv(source, None, chunksize=chunksize)
+    secs = time.perf_counter() - t0
+    out.put((mode, len(df), secs, peak_rss_mb() - base, df.memory_usage(deep=True).sum() / 1e6))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=1700)
+    ap.add_argument("--chunksize", type=int, default=100_000)
+    ap.add_argument("--keep", action="store_true", help="keep the synthetic CSV")
+    args = ap.parse_args()
+
+    source = Path(tempfile.gettempdir()) / f"owid_compact_{args.days}d.csv"
+    if not source.exists():
+        from owid_sample import generate
+        print(f"Writing {source} ...")
+        generate(days=args.days).to_csv(source, index=False)
+    print(f"Source: {source.stat().st_size / 1e6:.0f} MB")
+
+    ctx = mp.get_context("spawn")
+    rows = []
+    for mode in ["read_csv + isin", "load_csv, 4", "load_csv, all"]:
+        q = ctx.Queue()
+        p = ctx.Process(target=run, args=(mode, source, args.chunksize, q))
+        p.start()
+        rows.append(q.get())
+        p.join()
+
+    print(f"\n{'loader':<18}{'rows':>10}{'seconds':>10}{'peak RSS MB':>14}{'frame MB':>10}")
+    for mode, n, secs, rss, frame_mb in rows:
+        print(f"{mode:<18}{n:>10,}{secs:>10.2f}{rss:>14.0f}{frame_mb:>10.1f}")
+    if not args.keep:
+        source.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Wall-clock time of the all-countries headless report (covid_report.build_report).
+
+Loads a synthetic compact.csv (owid_sample.py, 255 countries x --days days) once,
+then builds the full report (one comparison chart per metric, one figure per
+country, two choropleth HTML files) into a temporary directory for each
+--workers value. workers=1 renders in-process; more uses the process pool.
+
+Usage:
+    python bench_covid_report.py [--days 1700] [--workers 1,2,4] [--keep]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import covid_loader
+import covid_report
+from covid_analysis import columns_for
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=1700)
+    ap.add_argument("--workers", default=f"1,{os.cpu_count()}")
+    ap.add_argument("--keep", action="store_true", help="keep the synthetic CSV and the last report")
+    args = ap.parse_args()
+
+    from owid_sample import generate
+
+    source = Path(tempfile.gettempdir()) / f"owid_compact_{args.days}d.csv"
+    if not source.exists():
+        print(f"Writing {source} ...")
+        generate(days=args.days).to_csv(source, index=False)
+
+    metrics = covid_report.DEFAULT_METRICS
+    t0 = time.perf_counter()
+    df = covid_loader.load_csv(source, None, ["code", *columns_for(metrics), *covid_report.MAP_METRICS])
+    print(f"Loaded {len(df):,} rows in {time.perf_counter() - t0:.1f}s ({os.cpu_count()} CPUs)")
+
+    print(f"\n{'workers':>8}{'files':>7}{'prepare s':>11}{'render s':>10}{'maps s':>8}{'total s':>9}")
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        out = Path(tempfile.mkdtemp(prefix="covid_report_"))
+        t0 = time.perf_counter()
+        s = covid_report.build_report(df, None, metrics, out, workers=workers)
+        total = time.perf_counter() - t0
+        print(f"{workers:>8}{s['files']:>7}{s['prepare']:>11.2f}{s['render']:>10.1f}{s['maps']:>8.1f}{total:>9.1f}")
+        if args.keep:
+            print(f"  -> {out}")
+        else:
+            shutil.rmtree(out)
+    if not args.keep:
+        source.unlink()
+
+
+if __name__ == "__main__":
+    main()
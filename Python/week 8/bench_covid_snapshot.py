@@ -0,0 +1,91 @@
+"""
+Latest-per-country lookups: sort + groupby.tail(1) vs the LatestSnapshot index.
+
+Loads a synthetic compact.csv (owid_sample.py, 255 countries x --days days) and
+holds back the last 7 days, then times (best of --repeat):
+- sort + tail(1):     df.sort_values('date').groupby('country').tail(1), the old choropleth step
+- snapshot build:     LatestSnapshot.from_frame(df), once per store (covid_store.sync does it)
+- +7 days update:     folding the held-back week into the snapshot
+- latest table:       snapshot.table()
+- as-of table:        snapshot.table(as_of=<mid-history date>)
+- load + table:       what the tracker does on a re-run (read latest.parquet, then table())
+Before printing, the script checks that the latest table matches the last non-null value per country.
+
+Usage:
+    python bench_covid_snapshot.py [--days 1700] [--repeat 5]
+"""
+
+import argparse
+import copy
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import covid_loader
+from covid_snapshot import SNAPSHOT_METRICS, LatestSnapshot
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=1700)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    from owid_sample import generate
+
+    source = Path(tempfile.gettempdir()) / f"owid_compact_{args.days}d.csv"
+    if not source.exists():
+        print(f"Writing {source} ...")
+        generate(days=args.days).to_csv(source, index=False)
+    df = covid_loader.load_csv(source, None, ["code", *SNAPSHOT_METRICS])
+    cutoff = df["date"].max() - pd.Timedelta(days=7)
+    old, week = df[df["date"] <= cutoff], df[df["date"] > cutoff]
+    as_of = df["date"].min() + (df["date"].max() - df["date"].min()) / 2
+
+    rows = []
+    t, _ = best(lambda: df.sort_values("date").groupby("country", observed=True).tail(1), args.repeat)
+    rows.append(("sort + tail(1)", t))
+    t, base = best(lambda: LatestSnapshot.from_frame(old), args.repeat)
+    rows.append(("snapshot build", t))
+
+    def add_week():
+        snap = copy.deepcopy(base)
+        t0 = time.perf_counter()
+        snap.update(week)
+        return time.perf_counter() - t0, snap
+    t, snap = min((add_week() for _ in range(args.repeat)), key=lambda r: r[0])
+    rows.append(("+7 days update", t))
+    t, latest = best(snap.table, args.repeat)
+    rows.append(("latest table", t))
+    t, _ = best(lambda: snap.table(as_of), args.repeat)
+    rows.append(("as-of table", t))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "latest.parquet"
+        snap.save(path)
+        t, _ = best(lambda: LatestSnapshot.load(path).table(), args.repeat)
+        rows.append(("load + table", t))
+        size_mb = path.stat().st_size / 1e6
+
+    expected = df.groupby("country", observed=True)[SNAPSHOT_METRICS].last()   # last non-null
+    assert np.allclose(latest.loc[expected.index, SNAPSHOT_METRICS], expected, equal_nan=True)
+
+    print(f"{len(df):,} rows, {len(snap)} countries, snapshot file {size_mb:.1f} MB\n")
+    print(f"{'step':<18}{'ms':>10}")
+    for step, secs in rows:
+        print(f"{step:<18}{secs * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
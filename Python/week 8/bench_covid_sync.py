@@ -0,0 +1,92 @@
+"""
+Re-run cost of the tracker's data loading: full download-and-parse vs covid_store.
+
+Uses a synthetic compact.csv (owid_sample.py; 255 countries x --days days, the
+real file's 61 columns) as a local stand-in for the OWID URL, and times each
+step in a fresh process, reporting wall time and peak RSS above the interpreter
+baseline:
+- full parse:  pd.read_csv(source) + isin(countries)   (the original script)
+- first sync:  covid_store.sync into an empty store + read(countries, columns)
+- re-run:      source unchanged -> sync skips, read only
+- +7 days:     source grew by a week -> sync appends 7 rows per country + read
+
+Usage:
+    python bench_covid_sync.py [--days 1700] [--keep]
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+COUNTRIES = ['Kenya', 'United States', 'India', 'Nigeria']
+COLUMNS = ['code', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths', 'total_vaccinations']
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def run(step, source, store, out):
+    import pandas as pd
+    import covid_store
+
+    base = peak_rss_mb()
+    t0 = time.perf_counter()
+    if step == "full parse":
+        df = pd.read_csv(source)
+        df = df[df['country'].isin(COUNTRIES)]
+    else:
+        covid_store.sync(source, store)
+        df = covid_store.read(COUNTRIES, COLUMNS, store)
+    out.put((step, len(df), time.perf_counter() - t0, peak_rss_mb() - base))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=1700)
+    ap.add_argument("--keep", action="store_true", help="keep the synthetic CSVs")
+    args = ap.parse_args()
+
+    from owid_sample import generate
+
+    tmp = Path(tempfile.gettempdir())
+    old_csv, new_csv = tmp / f"owid_compact_{args.days}d.csv", tmp / f"owid_compact_{args.days + 7}d.csv"
+    for path, days in [(old_csv, args.days), (new_csv, args.days + 7)]:
+        if not path.exists():
+            print(f"Writing {path} ...")
+            generate(days=days).to_csv(path, index=False)
+    source = tmp / "owid_compact_source.csv"
+    shutil.copyfile(old_csv, source)
+    store = Path(tempfile.mkdtemp(prefix="owid_store_"))
+    print(f"Source: {source.stat().st_size / 1e6:.0f} MB")
+
+    ctx = mp.get_context("spawn")
+    rows = []
+    for step in ["full parse", "first sync", "re-run", "+7 days"]:
+        if step == "+7 days":
+            shutil.copyfile(new_csv, source)
+        q = ctx.Queue()
+        p = ctx.Process(target=run, args=(step, source, store, q))
+        p.start()
+        rows.append(q.get())
+        p.join()
+
+    store_mb = sum(f.stat().st_size for f in store.rglob("*") if f.is_file()) / 1e6
+    print(f"\n{'step':<12}{'rows':>10}{'seconds':>10}{'peak RSS MB':>14}")
+    for step, n, secs, rss in rows:
+        print(f"{step:<12}{n:>10,}{secs:>10.2f}{rss:>14.0f}")
+    print(f"\nStore size: {store_mb:.0f} MB (Parquet, {len(list(store.iterdir())) - 1} countries)")
+
+    shutil.rmtree(store)
+    source.unlink()
+    if not args.keep:
+        old_csv.unlink()
+        new_csv.unlink()
+
+
+if __name__ == "__main__":
+    main()
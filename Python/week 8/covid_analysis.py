@@ -0,0 +1,126 @@
+"""
+Single-pass per-country analysis of the OWID data.
+
+CountryPanel(df) sorts the rows by (country, date) once and records where each
+country's block starts and ends. After that:
+- view(country)  is a positional slice of the sorted frame. It makes no copy and
+                 does no scan, where df[df['country'] == c] compares every row for
+                 every country and every metric.
+- pivot(metric)  is a date x country matrix on a daily index. It is filled with one
+                 scatter per metric and cached, so 250 countries cost about as much
+                 as 4.
+- get(name)      returns a raw metric or a derived series, all computed on the
+                 matrices in vectorized form:
+                     death_rate               total_deaths / total_cases
+                     <metric>_7d              7-day rolling mean (new_cases_7d, ...)
+                     <metric>_per_million     per 1M population (needs `population`)
+                 Suffixes combine, e.g. new_cases_7d_per_million.
+- top(name, n)   returns the n countries with the largest latest value. Aggregates
+                 (World, continents, income groups) have no ISO-3 code and are skipped.
+
+Views share memory with the panel's frame, so treat them as read-only.
+"""
+
+import numpy as np
+import pandas as pd
+
+ROLLING_SUFFIX = "_7d"
+PER_CAPITA_SUFFIX = "_per_million"
+PER_CAPITA = 1_000_000
+
+
+def columns_for(names) -> list:
+    """Frame columns that the given get() names are computed from."""
+    columns = []
+    for name in names:
+        base = name
+        if base.endswith(PER_CAPITA_SUFFIX):
+            base = base[:-len(PER_CAPITA_SUFFIX)]
+            columns.append("population")
+        if base.endswith(ROLLING_SUFFIX):
+            base = base[:-len(ROLLING_SUFFIX)]
+        columns += ["total_deaths", "total_cases"] if base == "death_rate" else [base]
+    return list(dict.fromkeys(columns))
+
+
+class CountryPanel:
+    def __init__(self, df: pd.DataFrame):
+        country = df["country"]
+        if not isinstance(country.dtype, pd.CategoricalDtype):
+            country = country.astype("category")
+        country = country.cat.remove_unused_categories()
+        df = df.assign(country=country).sort_values(["country", "date"], kind="stable", ignore_index=True)
+        self.df = df
+
+        codes = df["country"].cat.codes.to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], int)
+        stops = np.r_[starts[1:], len(codes)]
+        self.countries = list(df["country"].cat.categories[codes[starts]])
+        self._bounds = dict(zip(self.countries, zip(starts.tolist(), stops.tolist())))
+
+        # Position of every row in the daily date x country matrix
+        dates = df["date"].to_numpy()
+        first = dates.min() if len(dates) else np.datetime64("2020-01-01")
+        last = dates.max() if len(dates) else first
+        self.dates = pd.date_range(first, last, freq="D")
+        self._row = ((dates - first) // np.timedelta64(1, "D")).astype(np.intp)
+        self._col = np.repeat(np.arange(len(self.countries)), stops - starts)
+
+        first_rows = df.iloc[starts]
+        self.codes = pd.Series(first_rows["code"].to_numpy() if "code" in df else None,
+                               index=self.countries, dtype=object)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.countries)
+
+    def view(self, country) -> pd.DataFrame:
+        """Rows of one country, sorted by date."""
+        start, stop = self._bounds[country]
+        return self.df.iloc[start:stop]
+
+    def pivot(self, metric) -> pd.DataFrame:
+        """Date x country matrix of a column of the frame (NaN where a day has no row)."""
+        key = ("pivot", metric)
+        if key not in self._cache:
+            values = self.df[metric].to_numpy()
+            dtype = values.dtype if values.dtype.kind == "f" else np.float64
+            out = np.full((len(self.dates), len(self.countries)), np.nan, dtype=dtype)
+            out[self._row, self._col] = values
+            self._cache[key] = pd.DataFrame(out, index=self.dates, columns=self.countries)
+        return self._cache[key]
+
+    def population(self) -> pd.Series:
+        """Latest reported population per country."""
+        if "population" not in self.df:
+            raise KeyError("Per-capita metrics need the 'population' column; add it to the loaded columns.")
+        return self.pivot("population").ffill().iloc[-1]
+
+    def get(self, name) -> pd.DataFrame:
+        """Raw or derived metric as a date x country matrix (see the module docstring)."""
+        if name in self._cache:
+            return self._cache[name]
+        if name == "death_rate":
+            deaths = self.pivot("total_deaths").to_numpy(dtype=np.float64)
+            cases = self.pivot("total_cases").to_numpy(dtype=np.float64)
+            rate = np.divide(deaths, cases, out=np.full_like(deaths, np.nan), where=cases > 0)
+            result = pd.DataFrame(rate, index=self.dates, columns=self.countries)
+        elif name.endswith(PER_CAPITA_SUFFIX):
+            result = self.get(name[:-len(PER_CAPITA_SUFFIX)]) / self.population() * PER_CAPITA
+        elif name.endswith(ROLLING_SUFFIX):
+            # Mean of the reported days in each 7-day window; all columns in one call
+            result = self.get(name[:-len(ROLLING_SUFFIX)]).rolling(7, min_periods=1).mean()
+        else:
+            result = self.pivot(name)
+        self._cache[name] = result
+        return result
+
+    def latest(self, name) -> pd.Series:
+        """Last non-null value of a metric per country."""
+        return self.get(name).ffill().iloc[-1]
+
+    def top(self, name, n=10, countries_only=True) -> list:
+        latest = self.latest(name)
+        if countries_only:
+            latest = latest[self.codes.str.len().eq(3).to_numpy()]
+        return latest.nlargest(n).index.tolist()
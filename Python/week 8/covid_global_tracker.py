@@ -3,12 +3,25 @@
     Project Goal: Analyze COVID-19 data globally using Pandas, Matplotlib, and Seaborn
 """
 
+import os
+import sys
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.io as pio
 
+import covid_loader
+import covid_store
+from covid_analysis import CountryPanel
+from covid_snapshot import LatestSnapshot
+
+# Shared plot helpers: long series are decimated before drawing; PLOT_HEADLESS=1 saves PNGs
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "shared"))
+import plot_agg
+
 # Optional: Set styles
 sns.set_theme(style='darkgrid')
 
@@ -16,15 +29,45 @@ sns.set_theme(style='darkgrid')
 # 1️⃣ Data Collection & Loading
 # -----------------------------
 
-try:
-    # Load COVID-19 data from Our World in Data
-    url = "https://catalog.ourworldindata.org/garden/covid/latest/compact/compact.csv"
-    df = pd.read_csv(url)
-    # df = pd.read_csv('compact.csv')
-    print("✅ Dataset loaded successfully.")
-except:
-    print("❌ Link not found. Ensure the url is not changed")
-    exit()
+# Countries and columns used by the analysis below.
+# OWID_COUNTRIES="Kenya,Ghana" picks other countries; OWID_COUNTRIES=all loads every
+# country and plots the PLOT_TOP with the most cases.
+countries = ['Kenya', 'United States', 'India', 'Nigeria']
+if os.environ.get("OWID_COUNTRIES"):
+    selected = os.environ["OWID_COUNTRIES"]
+    countries = None if selected == "all" else [c.strip() for c in selected.split(",")]
+PLOT_TOP = 10
+columns = ['code', 'population', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths', 'total_vaccinations']
+
+# Our World in Data's compact.csv is synced into a local per-country Parquet store
+# (data/owid/, see covid_store.py); re-runs only fetch dates newer than the last sync.
+# Set OWID_SOURCE to a downloaded compact.csv to work offline, and OWID_STORE=0 to
+# read the CSV directly (only the columns and countries above, see covid_loader.py).
+source = os.environ.get("OWID_SOURCE", covid_store.DEFAULT_SOURCE)
+if os.environ.get("OWID_STORE", "1") == "0":
+    try:
+        df = covid_loader.load_csv(source, countries, columns)
+        snapshot = LatestSnapshot.from_frame(df)
+    except Exception as e:
+        print(f"❌ Could not load {source}: {e}. Ensure the url is not changed")
+        exit()
+else:
+    try:
+        summary = covid_store.sync(source)
+        if summary["changed"]:
+            print(f"✅ Synced {summary['rows_appended']:,} new rows from {source}")
+        else:
+            print("✅ Local data is up to date.")
+    except Exception as e:
+        if not covid_store.has_store():
+            print(f"❌ Could not load {source}: {e}. Ensure the url is not changed")
+            exit()
+        print(f"⚠️ Sync failed ({e}); using the local copy from the last sync.")
+    df = covid_store.read(countries, columns)
+    snapshot = covid_store.snapshot()   # every country in the store, kept current by sync
+# The maps show the countries that were loaded, whichever path loaded them
+map_countries = countries
+print("✅ Dataset loaded successfully.")
 
 # -----------------------------
 # 2️⃣ Data Exploration
@@ -43,10 +86,6 @@ print(df.isnull().sum().sort_values(ascending=False).head(10))
 # 3️⃣ Data Cleaning
 # -----------------------------
 
-# Keep only relevant countries
-countries = ['Kenya', 'United States', 'India', 'Nigeria']
-df = df[df['country'].isin(countries)]
-
 # Drop rows with missing critical data
 df = df.dropna(subset=['date', 'total_cases'])
 
@@ -61,64 +100,48 @@ df[numeric_cols] = df[numeric_cols].fillna(0)
 # 4️⃣ Exploratory Data Analysis (EDA)
 # -----------------------------
 
+# Sort and group once; every plot below reads date x country matrices from the panel
+panel = CountryPanel(df)
+if countries is None:
+    countries = panel.top('total_cases', PLOT_TOP)
+countries = [c for c in countries if c in panel.countries]
+
+
+def plot_countries(metric, title, ylabel):
+    data = panel.get(metric)
+    plt.figure(figsize=(10,6))
+    for country in countries:
+        plot_agg.line(plt.gca(), data.index, data[country], label=country)
+
+    plt.title(title)
+    plt.xlabel('Date')
+    plt.ylabel(ylabel)
+    plt.legend()
+    plt.tight_layout()
+    plot_agg.show()
+
+
 # Total Cases Over Time
-plt.figure(figsize=(10,6))
-for country in countries:
-    country_data = df[df['country'] == country]
-    plt.plot(country_data['date'], country_data['total_cases'], label=country)
-
-plt.title('Total COVID-19 Cases Over Time')
-plt.xlabel('Date')
-plt.ylabel('Total Cases')
-plt.legend()
-plt.tight_layout()
-plt.show()
+plot_countries('total_cases', 'Total COVID-19 Cases Over Time', 'Total Cases')
 
 # Total Deaths Over Time
-plt.figure(figsize=(10,6))
-for country in countries:
-    country_data = df[df['country'] == country]
-    plt.plot(country_data['date'], country_data['total_deaths'], label=country)
-
-plt.title('Total COVID-19 Deaths Over Time')
-plt.xlabel('Date')
-plt.ylabel('Total Deaths')
-plt.legend()
-plt.tight_layout()
-plt.show()
+plot_countries('total_deaths', 'Total COVID-19 Deaths Over Time', 'Total Deaths')
 
 # Daily New Cases Comparison
-plt.figure(figsize=(10,6))
-for country in countries:
-    country_data = df[df['country'] == country]
-    plt.plot(country_data['date'], country_data['new_cases'], label=country)
+plot_countries('new_cases', 'Daily New COVID-19 Cases', 'New Cases')
 
-plt.title('Daily New COVID-19 Cases')
-plt.xlabel('Date')
-plt.ylabel('New Cases')
-plt.legend()
-plt.tight_layout()
-plt.show()
+# New cases per million people, 7-day average (comparable across country sizes)
+plot_countries('new_cases_7d_per_million', 'Daily New COVID-19 Cases per Million (7-day average)',
+               'New Cases per Million')
 
-# Calculate death rate
-df['death_rate'] = df['total_deaths'] / df['total_cases']
-death_rate_df = df.groupby('country')['death_rate'].mean().reset_index()
+# Calculate death rate (per country and date, then averaged over time)
+death_rate_df = panel.get('death_rate').mean().rename_axis('country').reset_index(name='death_rate')
 
 # -----------------------------
 # 5️⃣ Vaccination Progress
 # -----------------------------
 
-plt.figure(figsize=(10,6))
-for country in countries:
-    country_data = df[df['country'] == country]
-    plt.plot(country_data['date'], country_data['total_vaccinations'], label=country)
-
-plt.title('Total Vaccinations Over Time')
-plt.xlabel('Date')
-plt.ylabel('Total Vaccinations')
-plt.legend()
-plt.tight_layout()
-plt.show()
+plot_countries('total_vaccinations', 'Total Vaccinations Over Time', 'Total Vaccinations')
 
 # -----------------------------
 # 6️⃣ Key Insights
@@ -147,8 +170,12 @@ print("• Death rate varies slightly, likely due to healthcare systems and data
 # If you're using Jupyter Notebook and the maps don’t show, uncomment this line below:
 # pio.renderers.default = 'notebook'  # or 'iframe' or 'browser' if needed
 
-# Filter latest data per country (latest date for each country)
-latest_df = df.sort_values('date').groupby('country').tail(1)
+# Latest non-null value per country and metric, from the snapshot index (no re-sort of the
+# history); snapshot.table(as_of='2021-06-30') gives the map for a past date instead
+latest_df = snapshot.table()
+if map_countries is not None:
+    latest_df = latest_df[latest_df.index.isin(map_countries)]
+latest_df = latest_df.reset_index()
 
 # Ensure code is present (needed for plotly)
 choropleth_data = latest_df[['country', 'code', 'total_cases', 'total_vaccinations', 'date']].dropna(subset=['code'])
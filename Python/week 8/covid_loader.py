@@ -0,0 +1,77 @@
+"""
+Column-pruned, typed reader for OWID's compact.csv.
+
+load_csv(source, countries, columns) declares everything at read time instead
+of parsing the whole file as int64/float64/object and filtering afterwards:
+- usecols: only the requested columns are tokenized into memory
+- dtypes:  metrics as float32 (counts above ~16.7M are stored to float32
+           precision, i.e. within 0.0001%); country/code become categories once
+           the rows are filtered. Only non-default dtypes are passed to the
+           parser: with this pandas, any dtype entry for the text columns (even
+           object or category) makes the whole read 40-50% slower.
+- dates:   parsed with an explicit format, per chunk after the country filter
+           (read_csv's parse_dates combined with a dtype map is ~2x slower here)
+- country filter pushed into a chunked read: each chunk is filtered as soon as
+  it is parsed, so peak memory is one chunk plus the selected countries' rows,
+  not the whole world file.
+
+apply_dtypes(df) gives frames from other paths (e.g. covid_store.read) the same types.
+"""
+
+import pandas as pd
+
+TRACKER_COLUMNS = ["country", "code", "date", "population", "total_cases", "total_deaths",
+                   "new_cases", "new_deaths", "total_vaccinations"]
+CATEGORY_COLUMNS = ["country", "code", "continent"]
+DATE_FORMAT = "%Y-%m-%d"
+CHUNKSIZE = 100_000
+
+
+def read_dtypes(columns, metric_dtype="float32"):
+    return {c: ("category" if c in CATEGORY_COLUMNS else metric_dtype)
+            for c in columns if c != "date"}
+
+
+def apply_dtypes(df: pd.DataFrame, metric_dtype="float32") -> pd.DataFrame:
+    for c, dtype in read_dtypes(df.columns, metric_dtype).items():
+        if dtype == "category":
+            # also drops categories of rows that were filtered out
+            df[c] = df[c].astype("category").cat.remove_unused_categories()
+        elif df[c].dtype != dtype:
+            df[c] = df[c].astype(dtype)
+    if "date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+    return df
+
+
+def load_csv(source, countries=None, columns=TRACKER_COLUMNS, chunksize=CHUNKSIZE,
+             metric_dtype="float32") -> pd.DataFrame:
+    """
+    Rows of source (a path or URL) for the given countries (all when None).
+    columns=None keeps every column; country and date are always included.
+    """
+    usecols = None
+    if columns is not None:
+        columns = usecols = list(dict.fromkeys(["country", "date", *columns]))
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    # float64 is the parser's default, so it needs no entry either
+    dtypes = {c: t for c, t in read_dtypes(columns, metric_dtype).items()
+              if t != "category" and t != "float64"}
+    reader = pd.read_csv(
+        source,
+        usecols=usecols,
+        dtype=dtypes or None,
+        chunksize=chunksize,
+    )
+    wanted = None if countries is None else set(countries)
+    parts = []
+    for chunk in reader:
+        if wanted is not None:
+            chunk = chunk[chunk["country"].isin(wanted)]
+        chunk["date"] = pd.to_datetime(chunk["date"], format=DATE_FORMAT)
+        parts.append(chunk)
+    if not parts:
+        raise ValueError(f"No data rows in {source}")
+    # Each chunk has its own category set; re-categorize once on the (small) result
+    return apply_dtypes(pd.concat(parts, ignore_index=True), metric_dtype)
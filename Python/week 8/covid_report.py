@@ -0,0 +1,257 @@
+"""
+Headless COVID-19 report: every chart written to files, nothing shown.
+
+    python covid_report.py --countries "Kenya,India" --metrics total_cases,new_cases_7d --out report
+    python covid_report.py --countries all --out report --workers 4
+
+Writes to --out:
+    compare_<metric>.png     one line chart per metric, comparing the selected countries
+                             (the --top countries with the most cases when there are more)
+    country_<name>.png       one figure per country, one panel per metric
+    map_<metric>.html        Plotly choropleths of the latest value per country, or the
+                             value as of --as-of (plotly.min.js is written once next to them)
+    index.html               links to all of the above
+
+The data is loaded, cleaned and de-duplicated once in the parent process. The
+panel's date x country matrices for the requested metrics are handed to each
+worker once, through the pool initializer. Each task then renders one figure with
+Matplotlib's Agg backend and sends back only the file name.
+
+Loading follows the tracker: the local store (covid_store) unless OWID_STORE=0,
+with the source taken from --source / $OWID_SOURCE. Metric names are those of
+CountryPanel.get: raw columns, death_rate, and the _7d / _per_million suffixes.
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import pandas as pd
+
+import covid_loader
+import covid_store
+from covid_analysis import CountryPanel, columns_for
+from covid_snapshot import LatestSnapshot
+
+DEFAULT_METRICS = ["total_cases", "total_deaths", "new_cases_7d", "new_cases_7d_per_million",
+                   "total_vaccinations"]
+MAP_METRICS = {"total_cases": "Reds", "total_vaccinations": "Blues"}
+DPI = 100
+
+
+# --- Data (parent process) ---
+def load(source, countries, metrics, use_store=True) -> pd.DataFrame:
+    columns = list(dict.fromkeys(["code", *columns_for(metrics), *MAP_METRICS]))
+    if not use_store:
+        return covid_loader.load_csv(source, countries, columns)
+    try:
+        covid_store.sync(source)
+    except Exception as e:
+        if not covid_store.has_store():
+            raise
+        print(f"⚠️ Sync failed ({e}); using the local copy from the last sync.")
+    return covid_store.read(countries, columns)
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    # Same rules as the tracker, plus one row per country and date
+    df = df.dropna(subset=["date", "total_cases"])
+    df = df.drop_duplicates(subset=["country", "date"], keep="last")
+    counts = [c for c in ["total_deaths", "new_cases", "new_deaths", "total_vaccinations"] if c in df]
+    return df.fillna({c: 0 for c in counts})
+
+
+def shared_data(panel: CountryPanel, countries, metrics) -> dict:
+    """What the workers need: plain arrays, restricted to the report's countries."""
+    cols = [panel.countries.index(c) for c in countries]
+    return {
+        "dates": panel.dates.to_numpy(),
+        "countries": list(countries),
+        "metrics": {m: panel.get(m).to_numpy()[:, cols] for m in metrics},
+    }
+
+
+# --- Rendering (workers) ---
+_data = None
+_out = None
+_figure = None
+
+
+def _init(data, out):
+    global _data, _out, _figure
+    _data, _out, _figure = data, Path(out), None
+
+
+def slug(name) -> str:
+    return re.sub(r"[^0-9A-Za-z]+", "_", name).strip("_").lower() or "x"
+
+
+def _label(metric) -> str:
+    return metric.replace("_7d", " (7-day avg)").replace("_", " ").capitalize()
+
+
+def _country_figure():
+    """
+    One figure per worker, reused for every country: only the line data, limits and
+    title change, so the axes, labels and fixed margins are set up once instead of
+    running tight_layout for each of the ~250 figures.
+    """
+    global _figure
+    if _figure is None:
+        metrics = _data["metrics"]
+        fig, axes = plt.subplots(len(metrics), 1, figsize=(8, 2.2 * len(metrics)), sharex=True, squeeze=False)
+        lines = []
+        for ax, metric in zip(axes[:, 0], metrics):
+            lines.append(ax.plot(_data["dates"], metrics[metric][:, 0])[0])
+            ax.set_ylabel(_label(metric), fontsize=8)
+        locator = mdates.AutoDateLocator()
+        axes[-1, 0].xaxis.set_major_locator(locator)
+        axes[-1, 0].xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        fig.subplots_adjust(left=0.12, right=0.97, top=0.95, bottom=0.06, hspace=0.12)
+        _figure = fig, axes[:, 0], lines
+    return _figure
+
+
+def _render(task):
+    kind, key = task
+    dates, names, metrics = _data["dates"], _data["countries"], _data["metrics"]
+    if kind == "compare":
+        metric, columns = key
+        fig, ax = plt.subplots(figsize=(10, 6))
+        for j in columns:
+            ax.plot(dates, metrics[metric][:, j], label=names[j])
+        ax.set_title(f"{_label(metric)} over time")
+        ax.set_xlabel("Date")
+        ax.set_ylabel(_label(metric))
+        ax.legend()
+        name = f"compare_{slug(metric)}.png"
+        fig.tight_layout()
+        fig.savefig(_out / name, dpi=DPI)
+        plt.close(fig)
+        return name
+
+    j = key
+    fig, axes, lines = _country_figure()
+    for ax, line, values in zip(axes, lines, metrics.values()):
+        line.set_ydata(values[:, j])
+        ax.relim()
+        ax.autoscale_view()
+    axes[0].set_title(names[j])
+    name = f"country_{slug(names[j])}.png"
+    fig.savefig(_out / name, dpi=DPI)
+    return name
+
+
+def render_all(tasks, data, out, workers):
+    if workers <= 1:
+        _init(data, out)
+        return [_render(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(data, str(out))) as pool:
+        return list(pool.map(_render, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+
+def write_maps(latest: pd.DataFrame, out: Path, as_of=None) -> list:
+    import plotly.express as px
+
+    latest = latest.reset_index().dropna(subset=["code"])
+    when = f"as of {pd.Timestamp(as_of):%Y-%m-%d}" if as_of else "Latest Available"
+    names = []
+    for metric, scale in MAP_METRICS.items():
+        if metric not in latest:
+            continue
+        fig = px.choropleth(latest, locations="code", color=metric, hover_name="country",
+                            color_continuous_scale=scale,
+                            title=f"🌍 {_label(metric)} by Country ({when})",
+                            labels={metric: _label(metric)})
+        fig.update_layout(margin={"r": 0, "t": 50, "l": 0, "b": 0})
+        name = f"map_{slug(metric)}.html"
+        # "directory" copies plotly.min.js next to the page once and shares it between maps
+        fig.write_html(out / name, include_plotlyjs="directory")
+        names.append(name)
+    return names
+
+
+def write_index(out: Path, files):
+    items = "\n".join(f'<li><a href="{html.escape(f)}">{html.escape(f)}</a></li>' for f in sorted(files))
+    (out / "index.html").write_text(f"<!doctype html>\n<title>COVID-19 report</title>\n<ul>\n{items}\n</ul>\n")
+
+
+def build_report(df, countries, metrics, out, workers=os.cpu_count(), top=10, snapshot=None, as_of=None) -> dict:
+    """
+    Renders the report for a loaded frame. The maps read snapshot (a LatestSnapshot),
+    built from df when not given, restricted to `countries` unless that is None (all).
+    Returns file counts and timings.
+    """
+    map_countries = countries   # the selection as given; `countries` is narrowed to the panel below
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    timings = {}
+
+    t0 = time.perf_counter()
+    panel = CountryPanel(clean(df))
+    if countries is None:
+        countries = panel.countries
+    missing = [c for c in countries if c not in panel.countries]
+    if missing:
+        print(f"⚠️ No data for: {missing}")
+    countries = [c for c in countries if c in panel.countries]
+    selected = set(countries)
+    compared = countries if len(countries) <= top else [
+        c for c in panel.top("total_cases", len(panel)) if c in selected][:top]
+    data = shared_data(panel, countries, metrics)
+    timings["prepare"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compare_cols = [countries.index(c) for c in compared]
+    tasks = [("compare", (m, compare_cols)) for m in metrics] + [("country", j) for j in range(len(countries))]
+    files = render_all(tasks, data, out, workers)
+    timings["render"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if snapshot is None:
+        snapshot = LatestSnapshot.from_frame(df, MAP_METRICS)
+    latest = snapshot.table(as_of)
+    if map_countries is not None:   # a store snapshot covers every synced country
+        latest = latest[latest.index.isin(map_countries)]
+    files += write_maps(latest, out, as_of)
+    write_index(out, files)
+    timings["maps"] = time.perf_counter() - t0
+    return {"countries": len(countries), "files": len(files), **timings}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write the COVID-19 tracker's charts to a directory.")
+    ap.add_argument("--countries", default="Kenya,United States,India,Nigeria",
+                    help='comma-separated country names, or "all"')
+    ap.add_argument("--metrics", default=",".join(DEFAULT_METRICS),
+                    help="comma-separated metrics (raw columns, death_rate, *_7d, *_per_million)")
+    ap.add_argument("--out", type=Path, default=Path("report"))
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="rendering processes (1 = in-process)")
+    ap.add_argument("--top", type=int, default=10, help="countries per comparison chart")
+    ap.add_argument("--as-of", help="date for the maps (default: latest available)")
+    ap.add_argument("--source", default=os.environ.get("OWID_SOURCE", covid_store.DEFAULT_SOURCE))
+    args = ap.parse_args()
+
+    countries = None if args.countries == "all" else [c.strip() for c in args.countries.split(",")]
+    metrics = [m.strip() for m in args.metrics.split(",")]
+    t0 = time.perf_counter()
+    use_store = os.environ.get("OWID_STORE", "1") != "0"
+    df = load(args.source, countries, metrics, use_store=use_store)
+    snapshot = covid_store.snapshot() if use_store else None
+    loaded = time.perf_counter() - t0
+    s = build_report(df, countries, metrics, args.out, workers=args.workers, top=args.top,
+                     snapshot=snapshot, as_of=args.as_of)
+    print(f"✅ Wrote {s['files']} files for {s['countries']} countries to {args.out}/ "
+          f"(load {loaded:.1f}s, prepare {s['prepare']:.1f}s, render {s['render']:.1f}s, maps {s['maps']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Latest-value-per-country index for the choropleths.
+
+LatestSnapshot keeps, for each tracked metric, every non-null observation as a
+sorted array of (country, day) keys with their values. It also keeps a small
+country x metric table of the most recent value and its date.
+- update(df)     folds new rows in. Only the new rows are sorted. The key arrays are
+                 merged with a stable sort that sees two already-sorted runs, and the
+                 latest table changes only for the countries in df.
+- table()        returns the latest table: each country's most recent non-null
+                 value per metric (forward-filled, so a missing value today keeps
+                 yesterday's), plus code and date. Nothing is re-sorted.
+- table(as_of)   returns the same for any past date, with one vectorized searchsorted
+                 over all countries per metric.
+- save/load      writes and reads a Parquet file. covid_store keeps one next to the
+                 manifest and updates it with the rows each sync appends.
+
+Compared to df.sort_values('date').groupby('country').tail(1), the latest
+value here skips rows where that metric is missing. The old approach took the
+last row, whose vaccination count is often empty, or 0 after the tracker's fillna.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_METRICS = ["total_cases", "total_deaths", "total_vaccinations"]
+_DAY_BITS = 32
+
+
+def _days(dates) -> np.ndarray:
+    return pd.to_datetime(dates).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+class LatestSnapshot:
+    def __init__(self, metrics=SNAPSHOT_METRICS):
+        self.metrics = list(metrics)
+        self.countries = []
+        self.codes = []
+        self._ids = {}
+        self._keys = {m: np.empty(0, np.int64) for m in self.metrics}
+        self._values = {m: np.empty(0, np.float64) for m in self.metrics}
+        self._latest = {m: np.empty(0, np.float64) for m in self.metrics}
+        self._latest_day = {m: np.empty(0, np.int64) for m in self.metrics}
+
+    @classmethod
+    def from_frame(cls, df, metrics=SNAPSHOT_METRICS):
+        snapshot = cls([m for m in metrics if m in df])
+        snapshot.update(df)
+        return snapshot
+
+    def __len__(self):
+        return len(self.countries)
+
+    # --- Updates ---
+    def _country_ids(self, country, code) -> np.ndarray:
+        country = country.astype("category")
+        names = country.cat.categories
+        codes = None if code is None else code.groupby(country, observed=True).last()
+        lookup = np.empty(len(names), np.int64)
+        for i, name in enumerate(names):
+            if name not in self._ids:
+                self._ids[name] = len(self.countries)
+                self.countries.append(name)
+                self.codes.append(None)
+            lookup[i] = self._ids[name]
+            if codes is not None and name in codes.index and pd.notna(codes[name]):
+                self.codes[lookup[i]] = codes[name]
+        grow = len(self.countries) - len(next(iter(self._latest.values()), []))
+        if grow > 0:
+            for m in self.metrics:
+                self._latest[m] = np.r_[self._latest[m], np.full(grow, np.nan)]
+                self._latest_day[m] = np.r_[self._latest_day[m], np.full(grow, np.iinfo(np.int64).min)]
+        return lookup[country.cat.codes.to_numpy()]
+
+    def update(self, df) -> int:
+        """Adds the non-null observations in df. A (country, date) seen before is overwritten."""
+        if df.empty:
+            return 0
+        ids = self._country_ids(df["country"], df["code"] if "code" in df else None)
+        days = _days(df["date"])
+        added = 0
+        for m in self.metrics:
+            if m not in df:
+                continue
+            values = df[m].to_numpy(dtype=np.float64)
+            ok = ~np.isnan(values)
+            if not ok.any():
+                continue
+            keys = (ids[ok] << _DAY_BITS) | days[ok]
+            order = np.argsort(keys, kind="stable")
+            keys, values = keys[order], values[ok][order]
+            added += len(keys)
+
+            # Latest table: last new observation per country, if not older than the stored one
+            last = np.r_[keys[1:] >> _DAY_BITS != keys[:-1] >> _DAY_BITS, True]
+            ids_last, days_last = keys[last] >> _DAY_BITS, keys[last] & ((1 << _DAY_BITS) - 1)
+            newer = days_last >= self._latest_day[m][ids_last]
+            self._latest[m][ids_last[newer]] = values[last][newer]
+            self._latest_day[m][ids_last[newer]] = days_last[newer]
+
+            # History: both runs are sorted, so the stable sort is a linear merge
+            keys = np.r_[self._keys[m], keys]
+            values = np.r_[self._values[m], values]
+            order = np.argsort(keys, kind="stable")
+            keys, values = keys[order], values[order]
+            keep = np.r_[keys[1:] != keys[:-1], True]   # duplicates: keep the newest write
+            self._keys[m], self._values[m] = keys[keep], values[keep]
+        return added
+
+    # --- Queries ---
+    def table(self, as_of=None) -> pd.DataFrame:
+        """
+        Country-indexed frame: code, the metrics and date (the newest date among them).
+        With as_of, only observations on or before that date count.
+        """
+        n = len(self.countries)
+        out = {"code": pd.Series(self.codes, index=self.countries, dtype=object)}
+        newest = np.full(n, np.iinfo(np.int64).min)
+        for m in self.metrics:
+            if as_of is None:
+                values, days = self._latest[m], self._latest_day[m]
+            else:
+                values, days = self._as_of(m, _days([as_of])[0], n)
+            out[m] = pd.Series(values, index=self.countries)
+            newest = np.maximum(newest, days)
+        table = pd.DataFrame(out)
+        table["date"] = pd.to_datetime(newest.astype("datetime64[D]"))   # int64 min is NaT
+        return table.rename_axis("country")
+
+    def _as_of(self, metric, day, n):
+        keys, values = self._keys[metric], self._values[metric]
+        ids = np.arange(n, dtype=np.int64)
+        pos = np.searchsorted(keys, (ids << _DAY_BITS) | day, side="right") - 1
+        found = pos >= 0
+        found[found] = keys[pos[found]] >> _DAY_BITS == ids[found]
+        out = np.full(n, np.nan)
+        out[found] = values[pos[found]]
+        days = np.full(n, np.iinfo(np.int64).min)
+        days[found] = keys[pos[found]] & ((1 << _DAY_BITS) - 1)
+        return out, days
+
+    # --- Persistence ---
+    def save(self, path):
+        """One Parquet file: the sorted keys and values of every metric, names in the metadata."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            "key": np.concatenate([self._keys[m] for m in self.metrics]),
+            "value": np.concatenate([self._values[m] for m in self.metrics]),
+        })
+        meta = {"metrics": self.metrics, "counts": [len(self._keys[m]) for m in self.metrics],
+                "countries": self.countries, "codes": self.codes}
+        table = table.replace_schema_metadata({"latest_snapshot": json.dumps(meta)})
+        path = Path(path)
+        tmp = path.with_suffix(".parquet.tmp")
+        # Sorted keys: delta encoding stores them in a few bits each
+        pq.write_table(table, tmp, compression="zstd", use_dictionary=False,
+                       column_encoding={"key": "DELTA_BINARY_PACKED"})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b"latest_snapshot"])
+        keys = table.column("key").to_numpy()
+        values = table.column("value").to_numpy()
+        snapshot = cls(meta["metrics"])
+        snapshot.countries, snapshot.codes = meta["countries"], meta["codes"]
+        snapshot._ids = {name: i for i, name in enumerate(snapshot.countries)}
+        n, start = len(snapshot.countries), 0
+        for m, count in zip(meta["metrics"], meta["counts"]):
+            k, v = keys[start:start + count], values[start:start + count]
+            start += count
+            snapshot._keys[m], snapshot._values[m] = k, v
+            # Already sorted by (country, day): the latest value is the last key of each country
+            latest, latest_day = np.full(n, np.nan), np.full(n, np.iinfo(np.int64).min)
+            if count:
+                last = np.r_[k[1:] >> _DAY_BITS != k[:-1] >> _DAY_BITS, True]
+                ids = k[last] >> _DAY_BITS
+                latest[ids], latest_day[ids] = v[last], k[last] & ((1 << _DAY_BITS) - 1)
+            snapshot._latest[m], snapshot._latest_day[m] = latest, latest_day
+        return snapshot
@@ -0,0 +1,246 @@
+"""
+Local, incremental copy of OWID's compact.csv, partitioned by country.
+
+    python covid_store.py [--source URL_OR_CSV] [--store data/owid] [--full]
+
+Layout:
+    data/owid/manifest.json               source signature + per-country last date
+    data/owid/<country>/<YYYYMMDD>.parquet one Parquet file per sync that brought new
+                                          dates, named after its last date
+
+sync(source):
+- If the source has not changed since the last sync (local file: size + mtime;
+  URL: ETag / Last-Modified through a conditional GET), nothing is downloaded or parsed.
+- Otherwise the CSV is parsed once and split by country with a single groupby.
+  For each country, only dates after its stored last_date are written, as a new
+  Parquet file. When a country has more than MAX_PARTS files they are compacted
+  into one.
+- OWID sometimes revises past values. Those revisions are not picked up, because
+  only new dates are appended. Use --full to rebuild the store from scratch.
+
+read(countries, columns) opens only those countries' files and reads only those columns.
+snapshot() returns the latest-value index (covid_snapshot.py) kept in data/owid/latest.parquet;
+each sync folds only its appended rows into it.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from covid_loader import apply_dtypes, load_csv
+from covid_snapshot import SNAPSHOT_METRICS, LatestSnapshot
+
+DEFAULT_SOURCE = "https://catalog.ourworldindata.org/garden/covid/latest/compact/compact.csv"
+STORE_DIR = Path("data") / "owid"
+MANIFEST = "manifest.json"
+SNAPSHOT = "latest.parquet"
+MAX_PARTS = 32
+
+
+# --- Manifest ---
+def load_manifest(store=STORE_DIR) -> dict:
+    path = Path(store) / MANIFEST
+    if not path.exists():
+        return {"source": None, "signature": None, "countries": {}}
+    return json.loads(path.read_text())
+
+
+def _save_manifest(store, manifest):
+    path = Path(store) / MANIFEST
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def has_store(store=STORE_DIR) -> bool:
+    return bool(load_manifest(store)["countries"])
+
+
+def _slug(country, taken):
+    base = re.sub(r"[^0-9A-Za-z]+", "_", country).strip("_") or "country"
+    slug, i = base, 1
+    while slug in taken:
+        i += 1
+        slug = f"{base}_{i}"
+    return slug
+
+
+# --- Fetching the source ---
+def _is_url(source) -> bool:
+    return str(source).startswith(("http://", "https://"))
+
+
+def _fetch(source, store, previous_signature):
+    """
+    Returns (csv_path, signature, is_temporary), or (None, signature, False) when
+    the source is unchanged since previous_signature.
+    """
+    if not _is_url(source):
+        st = os.stat(source)
+        signature = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if signature == previous_signature:
+            return None, signature, False
+        return Path(source), signature, False
+
+    req = urllib.request.Request(source, headers={"User-Agent": "covid-global-tracker"})
+    if previous_signature:
+        if previous_signature.get("etag"):
+            req.add_header("If-None-Match", previous_signature["etag"])
+        if previous_signature.get("last_modified"):
+            req.add_header("If-Modified-Since", previous_signature["last_modified"])
+    tmp = Path(store) / "download.csv.tmp"
+    try:
+        with urllib.request.urlopen(req, timeout=120) as resp, open(tmp, "wb") as f:
+            shutil.copyfileobj(resp, f, length=1 << 20)
+            signature = {"etag": resp.headers.get("ETag"),
+                         "last_modified": resp.headers.get("Last-Modified")}
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, previous_signature, False
+        raise
+    return tmp, signature, True
+
+
+def read_source(path) -> pd.DataFrame:
+    # Every column, typed at read time; metrics stay float64 in the store
+    df = load_csv(path, columns=None, metric_dtype="float64")
+    return df.dropna(subset=["country", "date"])
+
+
+# --- Sync ---
+def _write_part(folder: Path, part: pd.DataFrame):
+    folder.mkdir(parents=True, exist_ok=True)
+    name = part["date"].max().strftime("%Y%m%d") + ".parquet"
+    tmp = folder / (name + ".tmp")
+    part.to_parquet(tmp, index=False)
+    os.replace(tmp, folder / name)   # same last date -> same name, so a retried sync overwrites
+
+
+def _compact(folder: Path):
+    parts = sorted(folder.glob("*.parquet"))
+    if len(parts) <= MAX_PARTS:
+        return
+    merged = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+    _write_part(folder, merged)
+    for p in parts[:-1]:
+        p.unlink()
+
+
+def sync(source=DEFAULT_SOURCE, store=STORE_DIR, full=False) -> dict:
+    """Brings the store up to date with source. Returns a small summary dict."""
+    store = Path(store)
+    if full and store.exists():
+        shutil.rmtree(store)
+    store.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(store)
+    same_source = manifest["source"] == str(source)
+
+    t0 = time.perf_counter()
+    path, signature, temporary = _fetch(source, store, manifest["signature"] if same_source else None)
+    summary = {"source": str(source), "changed": path is not None, "countries_updated": 0, "rows_appended": 0}
+    if path is None:
+        summary["seconds"] = time.perf_counter() - t0
+        return summary
+
+    try:
+        df = read_source(path)
+    finally:
+        if temporary:
+            path.unlink(missing_ok=True)
+
+    countries = manifest["countries"]
+    # One vectorized filter against each row's country last_date, before grouping
+    cats = df["country"].cat.categories
+    last_by_code = pd.to_datetime(pd.Series(cats).map({c: e["last_date"] for c, e in countries.items()}))
+    last = last_by_code.to_numpy()[df["country"].cat.codes.to_numpy()]
+    df = df[np.isnat(last) | (df["date"].to_numpy() > last)]
+
+    taken = {c["dir"] for c in countries.values()}
+    for country, part in df.groupby("country", sort=False, observed=True):
+        entry = countries.get(country)
+        if entry is None:
+            entry = {"dir": _slug(country, taken), "last_date": None, "rows": 0}
+            taken.add(entry["dir"])
+        folder = store / entry["dir"]
+        _write_part(folder, part.sort_values("date"))
+        _compact(folder)
+        entry["last_date"] = part["date"].max().strftime("%Y-%m-%d")
+        entry["rows"] += len(part)
+        countries[country] = entry
+        summary["countries_updated"] += 1
+        summary["rows_appended"] += len(part)
+
+    manifest.update(source=str(source), signature=signature, synced_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    _save_manifest(store, manifest)
+
+    if (store / SNAPSHOT).exists():
+        latest = LatestSnapshot.load(store / SNAPSHOT)
+        latest.update(df)
+        latest.save(store / SNAPSHOT)
+    else:
+        snapshot(store)   # first sync, or a store from before the snapshot existed
+    summary["seconds"] = time.perf_counter() - t0
+    return summary
+
+
+# --- Reading ---
+def read(countries=None, columns=None, store=STORE_DIR) -> pd.DataFrame:
+    """
+    Rows for the given countries (all when None), only the given columns (+ country,
+    date), typed like covid_loader.load_csv (category names, float32 metrics).
+    """
+    store = Path(store)
+    known = load_manifest(store)["countries"]
+    if countries is None:
+        countries = sorted(known)
+    missing = [c for c in countries if c not in known]
+    if missing:
+        print(f"⚠️ Not in the local store: {missing}")
+    if columns is not None:
+        columns = list(dict.fromkeys(["country", "date", *columns]))
+
+    frames = [pd.read_parquet(p, columns=columns)
+              for c in countries if c in known
+              for p in sorted((store / known[c]["dir"]).glob("*.parquet"))]
+    if not frames:
+        return pd.DataFrame(columns=columns or ["country", "date"])
+    return apply_dtypes(pd.concat(frames, ignore_index=True))
+
+
+def snapshot(store=STORE_DIR) -> LatestSnapshot:
+    """Latest value per country for SNAPSHOT_METRICS; built from the store on first use."""
+    path = Path(store) / SNAPSHOT
+    if path.exists():
+        return LatestSnapshot.load(path)
+    latest = LatestSnapshot.from_frame(read(None, ["code", *SNAPSHOT_METRICS], store))
+    if len(latest):
+        latest.save(path)
+    return latest
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sync the local OWID COVID-19 store.")
+    ap.add_argument("--source", default=os.environ.get("OWID_SOURCE", DEFAULT_SOURCE),
+                    help="compact.csv URL or a local CSV path (default: $OWID_SOURCE or the OWID URL)")
+    ap.add_argument("--store", type=Path, default=STORE_DIR)
+    ap.add_argument("--full", action="store_true", help="rebuild the store from scratch")
+    args = ap.parse_args()
+    s = sync(args.source, args.store, full=args.full)
+    if not s["changed"]:
+        print(f"✅ Source unchanged; nothing to do ({s['seconds']:.2f}s).")
+    else:
+        print(f"✅ Appended {s['rows_appended']:,} rows for {s['countries_updated']} countries "
+              f"in {s['seconds']:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
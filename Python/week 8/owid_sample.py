@@ -0,0 +1,118 @@
+"""
+Synthetic stand-in for OWID's compact.csv, for offline runs and benchmarks.
+
+Same column layout as the real file (country, date, ~45 metric columns,
+code, continent, population and other static indicators), one row per
+country per day. Country names and ISO codes come from the gapminder table
+bundled with plotly, topped up with OWID-style aggregates ("World",
+"Africa", ... with OWID_* or empty codes) and numbered placeholders up to
+--countries.
+
+Usage:
+    python owid_sample.py compact_sample.csv [--countries 255] [--start 2020-01-01] [--days 1700]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+METRIC_COLUMNS = [
+    "total_cases", "new_cases", "new_cases_smoothed", "total_cases_per_million",
+    "new_cases_per_million", "new_cases_smoothed_per_million",
+    "total_deaths", "new_deaths", "new_deaths_smoothed", "total_deaths_per_million",
+    "new_deaths_per_million", "new_deaths_smoothed_per_million",
+    "excess_mortality", "excess_mortality_cumulative", "excess_mortality_cumulative_absolute",
+    "excess_mortality_cumulative_per_million", "hosp_patients", "hosp_patients_per_million",
+    "weekly_icu_admissions", "weekly_icu_admissions_per_million", "icu_patients",
+    "icu_patients_per_million", "weekly_hosp_admissions", "weekly_hosp_admissions_per_million",
+    "stringency_index", "reproduction_rate", "total_tests", "new_tests",
+    "total_tests_per_thousand", "new_tests_per_thousand", "new_tests_smoothed",
+    "new_tests_smoothed_per_thousand", "positive_rate", "tests_per_case",
+    "total_vaccinations", "people_vaccinated", "people_fully_vaccinated", "total_boosters",
+    "new_vaccinations", "new_vaccinations_smoothed", "total_vaccinations_per_hundred",
+    "people_vaccinated_per_hundred", "people_fully_vaccinated_per_hundred",
+    "total_boosters_per_hundred", "new_vaccinations_smoothed_per_million",
+    "new_people_vaccinated_smoothed", "new_people_vaccinated_smoothed_per_hundred",
+]
+STATIC_COLUMNS = [
+    "population_density", "median_age", "life_expectancy", "gdp_per_capita",
+    "extreme_poverty", "diabetes_prevalence", "handwashing_facilities",
+    "hospital_beds_per_thousand", "human_development_index",
+]
+AGGREGATES = {
+    "World": "OWID_WRL", "Africa": None, "Asia": None, "Europe": None,
+    "European Union (27)": None, "High-income countries": None, "Low-income countries": None,
+    "North America": None, "Oceania": None, "South America": None, "Kosovo": "OWID_KOS",
+}
+
+
+def country_table(n):
+    gap = px.data.gapminder()
+    gap = gap[gap["year"] == gap["year"].max()]
+    rows = [(r.country, r.iso_alpha, r.continent, r.pop) for r in gap.itertuples()]
+    # The tracker's default countries first, so small samples still contain them
+    tracked = ["Kenya", "United States", "India", "Nigeria"]
+    rows.sort(key=lambda r: tracked.index(r[0]) if r[0] in tracked else len(tracked))
+    rows += [(name, code, None, 1e9) for name, code in AGGREGATES.items()]
+    i = 0
+    while len(rows) < n:
+        i += 1
+        rows.append((f"Territory {i:03d}", f"T{i:02d}", "Oceania", 1e5))
+    return pd.DataFrame(rows[:max(n, 4)], columns=["country", "code", "continent", "population"])
+
+
+def generate(n_countries=255, start="2020-01-01", days=1700, seed=0) -> pd.DataFrame:
+    """Cumulative series rise smoothly per country; daily columns are their differences."""
+    rng = np.random.default_rng(seed)
+    countries = country_table(n_countries)
+    dates = pd.date_range(start, periods=days, freq="D")
+    n_c, n_d = len(countries), len(dates)
+
+    frame = {
+        "country": np.repeat(countries["country"].to_numpy(), n_d),
+        "date": np.tile(dates.strftime("%Y-%m-%d").to_numpy(), n_c),
+    }
+    t = np.tile(np.arange(n_d) / 1700, n_c)   # fixed horizon: longer samples extend, not rescale
+    pop = np.repeat(countries["population"].to_numpy(dtype=float), n_d)
+    scale = np.repeat(rng.uniform(0.01, 0.3, n_c), n_d)
+    cases = np.round(pop * scale * t ** 2)
+    deaths = np.round(cases * np.repeat(rng.uniform(0.002, 0.03, n_c), n_d))
+    vax = np.round(pop * 2 * np.clip(t - 0.25, 0, None))
+    for col in METRIC_COLUMNS:
+        frame[col] = rng.gamma(2.0, 50.0, n_c * n_d).round(3)
+    frame["total_cases"] = cases
+    frame["total_deaths"] = deaths
+    frame["total_vaccinations"] = np.where(vax > 0, vax, np.nan)
+    start_of_series = np.tile(np.arange(n_d) == 0, n_c)
+    frame["new_cases"] = np.where(start_of_series, 0, np.diff(cases, prepend=0))
+    frame["new_deaths"] = np.where(start_of_series, 0, np.diff(deaths, prepend=0))
+    # sparse reporting, like the real data
+    for col in METRIC_COLUMNS[12:]:
+        if col != "total_vaccinations":
+            frame[col][rng.random(n_c * n_d) < 0.7] = np.nan
+
+    df = pd.DataFrame(frame)
+    df["code"] = np.repeat(countries["code"].to_numpy(), n_d)
+    df["continent"] = np.repeat(countries["continent"].to_numpy(), n_d)
+    df["population"] = pop
+    for col in STATIC_COLUMNS:
+        df[col] = np.repeat(rng.uniform(1, 100, n_c).round(2), n_d)
+    return df
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("path")
+    ap.add_argument("--countries", type=int, default=255)
+    ap.add_argument("--start", default="2020-01-01")
+    ap.add_argument("--days", type=int, default=1700)
+    args = ap.parse_args()
+    df = generate(args.countries, args.start, args.days)
+    df.to_csv(args.path, index=False)
+    print(f"Wrote {len(df):,} rows x {df.shape[1]} columns to {args.path}")
+
+
+if __name__ == "__main__":
+    main()